@@ -0,0 +1,276 @@
+"""
+Agent Catalog Index for AgentForge
+Indexed view of the agents in the inferloop-agents repository
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field, asdict
+
+from framework_abstractions import tracing, user_dirs
+
+
+# Repository layouts holding agents as <layout>/<category>/<agent_name>.
+# Earlier layouts take precedence when an agent exists in more than one.
+CATALOG_LAYOUTS = [
+    ('archived', 'old-agents'),
+    ('agentic-frameworks', 'agents-catalog')
+]
+
+# Documentation files recognized in an agent directory
+DOC_FILES = ['README.md', 'architecture.md', 'IMPLEMENTATION_GUIDE.md']
+
+DEFAULT_INDEX_DIR = user_dirs.CACHE_ROOT
+
+
+@dataclass
+class CatalogEntry:
+    """Everything the build system needs to know about an agent, minus its code"""
+    category: str
+    name: str
+    path: str
+    source_files: List[str] = field(default_factory=list)
+    requirements: List[str] = field(default_factory=list)
+    config: Dict[str, Any] = field(default_factory=dict)
+    has_tests: bool = False
+    doc_files: List[str] = field(default_factory=list)
+    # Why requirements.txt or agent.yaml could not be read, if so
+    error: Optional[str] = None
+
+
+class AgentCatalog:
+    """
+    Index of the inferloop-agents repository.
+
+    The index is built with a single os.scandir walk, persisted to disk and
+    reused while the modification times of every directory (and parsed file)
+    it was built from are unchanged. Once loaded, lookups and listings are
+    answered from memory without touching the filesystem.
+    """
+
+    INDEX_VERSION = 1
+
+    def __init__(self, repo_path: str, index_path: Optional[str] = None):
+        self.repo_path = repo_path
+        self.index_path = index_path or os.path.join(
+            DEFAULT_INDEX_DIR,
+            f"catalog-{hashlib.sha1(repo_path.encode()).hexdigest()[:12]}.json"
+        )
+        self._lock = threading.RLock()
+        self._agents: Dict[Tuple[str, str], CatalogEntry] = {}
+        self._categories: Dict[str, List[str]] = {}
+        self._mtimes: Dict[str, Optional[int]] = {}
+        self._agent_paths: Dict[Tuple[str, str], List[str]] = {}
+        self._loaded = False
+
+    def load(self):
+        """Load the persisted index, rebuilding it if it is missing or stale"""
+        with self._lock:
+            if self._load_index() and not self.is_stale():
+                self._loaded = True
+                return
+            self.refresh()
+
+    def refresh(self):
+        """Rebuild the index from the repository and persist it"""
+        with self._lock, tracing.span('catalog.scan', repo_path=self.repo_path) as span:
+            agents, mtimes = self._scan()
+            self._set_entries(agents, mtimes)
+            self._save_index()
+            self._loaded = True
+            span.set_attribute('agents', len(agents))
+
+    def refresh_if_stale(self) -> bool:
+        """Rebuild the index if the repository changed. Returns True if rebuilt"""
+        with self._lock:
+            if self._loaded and not self.is_stale():
+                return False
+            self.refresh()
+            return True
+
+    def is_stale(self) -> bool:
+        """Check whether any directory or file the index was built from changed"""
+        return any(_mtime(path) != mtime for path, mtime in self._mtimes.items())
+
+    def get(self, category: str, agent_name: str) -> Optional[CatalogEntry]:
+        """
+        Look up an agent. The agent's own directories and parsed files are
+        rechecked on every lookup, so long-lived callers never get stale
+        requirements, config or source file names.
+        """
+        self._ensure_loaded()
+        key = (category, agent_name)
+        with self._lock:
+            if key in self._agents and self._agent_changed(key):
+                self._rescan_agent(key)
+            return self._agents.get(key)
+
+    def list_agents(self, category: Optional[str] = None) -> List[str]:
+        """List agents as 'category/agent_name', optionally for one category"""
+        self._ensure_loaded()
+        categories = [category] if category else sorted(self._categories)
+        return [f"{c}/{name}" for c in categories for name in self._categories.get(c, [])]
+
+    def list_categories(self) -> List[str]:
+        """List all agent categories"""
+        self._ensure_loaded()
+        return sorted(self._categories)
+
+    def agents_in_category(self, category: str) -> List[CatalogEntry]:
+        """Get every agent in a category"""
+        self._ensure_loaded()
+        return [self._agents[(category, name)] for name in self._categories.get(category, [])]
+
+    # Private helper methods
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def _scan(self) -> Tuple[List[CatalogEntry], Dict[str, Optional[int]]]:
+        """Walk the repository once and collect every agent"""
+        agents: Dict[Tuple[str, str], CatalogEntry] = {}
+
+        # Directories whose mtime changes when agents are added or removed.
+        # Missing layout roots are watched too, so creating one invalidates.
+        mtimes = {self.repo_path: _mtime(self.repo_path)}
+
+        for parts in CATALOG_LAYOUTS:
+            for depth in range(1, len(parts) + 1):
+                path = os.path.join(self.repo_path, *parts[:depth])
+                mtimes[path] = _mtime(path)
+
+            layout_root = os.path.join(self.repo_path, *parts)
+            for category_dir in _scandir_dirs(layout_root):
+                mtimes[category_dir.path] = category_dir.stat().st_mtime_ns
+
+                for agent_dir in _scandir_dirs(category_dir.path):
+                    key = (category_dir.name, agent_dir.name)
+                    entry = self._scan_agent(category_dir.name, agent_dir, mtimes)
+                    agents.setdefault(key, entry)
+
+        return list(agents.values()), mtimes
+
+    def _scan_agent(self, category: str, agent_dir: os.DirEntry,
+                    mtimes: Dict[str, Optional[int]]) -> CatalogEntry:
+        """Index one agent directory"""
+        entry = CatalogEntry(category=category, name=agent_dir.name, path=agent_dir.path)
+        mtimes[agent_dir.path] = agent_dir.stat().st_mtime_ns
+
+        with os.scandir(agent_dir.path) as children:
+            for child in children:
+                if child.name == 'src' and child.is_dir():
+                    mtimes[child.path] = child.stat().st_mtime_ns
+                    with os.scandir(child.path) as src_files:
+                        entry.source_files = sorted(
+                            f.name for f in src_files if f.name.endswith('.py') and f.is_file()
+                        )
+                elif child.name == 'tests' and child.is_dir():
+                    entry.has_tests = True
+                elif child.name == 'requirements.txt':
+                    mtimes[child.path] = child.stat().st_mtime_ns
+                    try:
+                        with open(child.path, 'r') as f:
+                            entry.requirements = f.read().strip().split('\n')
+                    except (OSError, UnicodeDecodeError) as e:
+                        entry.error = f"Could not read {child.name}: {e}"
+                elif child.name == 'agent.yaml':
+                    import yaml
+                    mtimes[child.path] = child.stat().st_mtime_ns
+                    # A broken agent only fails lookups of that agent
+                    try:
+                        with open(child.path, 'r') as f:
+                            entry.config = yaml.safe_load(f) or {}
+                    except (OSError, UnicodeDecodeError, yaml.YAMLError) as e:
+                        entry.error = f"Could not parse {child.name}: {e}"
+                elif child.name in DOC_FILES:
+                    entry.doc_files.append(child.name)
+
+        entry.doc_files.sort()
+        return entry
+
+    def _agent_changed(self, key: Tuple[str, str]) -> bool:
+        return any(_mtime(path) != self._mtimes.get(path) for path in self._agent_paths.get(key, ()))
+
+    def _rescan_agent(self, key: Tuple[str, str]):
+        """Re-index one agent whose directory or files changed"""
+        entry = self._agents[key]
+        agent_dir = next((d for d in _scandir_dirs(os.path.dirname(entry.path)) if d.name == entry.name), None)
+        if agent_dir is None:
+            # Removed (or moved to another layout): rebuild everything
+            self.refresh()
+            return
+
+        for path in self._agent_paths.pop(key, ()):
+            self._mtimes.pop(path, None)
+        agent_mtimes: Dict[str, Optional[int]] = {}
+        self._agents[key] = self._scan_agent(entry.category, agent_dir, agent_mtimes)
+        self._mtimes.update(agent_mtimes)
+        self._agent_paths[key] = list(agent_mtimes)
+        self._save_index()
+
+    def _set_entries(self, agents: List[CatalogEntry], mtimes: Dict[str, Optional[int]]):
+        self._agents = {(a.category, a.name): a for a in agents}
+        self._categories = {}
+        for category, name in sorted(self._agents):
+            self._categories.setdefault(category, []).append(name)
+        self._mtimes = mtimes
+
+        # Watched paths per agent: its directory, src/ and parsed files
+        by_path = {a.path: key for key, a in self._agents.items()}
+        self._agent_paths = {key: [] for key in self._agents}
+        for path in mtimes:
+            key = by_path.get(path) or by_path.get(os.path.dirname(path))
+            if key is not None:
+                self._agent_paths[key].append(path)
+
+    def _load_index(self) -> bool:
+        try:
+            user_dirs.private_dir(os.path.dirname(self.index_path))
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if index.get('version') != self.INDEX_VERSION or index.get('repo_path') != self.repo_path:
+            return False
+
+        self._set_entries([CatalogEntry(**a) for a in index['agents']], index['mtimes'])
+        return True
+
+    def _save_index(self):
+        index = {
+            'version': self.INDEX_VERSION,
+            'repo_path': self.repo_path,
+            'mtimes': self._mtimes,
+            'agents': [asdict(a) for a in self._agents.values()]
+        }
+
+        try:
+            user_dirs.private_dir(os.path.dirname(self.index_path))
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f, default=str)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            # The in-memory index still works; it just won't survive restarts
+            print(f"Warning: Could not persist agent catalog index: {e}")
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _scandir_dirs(path: str) -> List[os.DirEntry]:
+    """Subdirectories of path, sorted by name; empty if path does not exist"""
+    try:
+        with os.scandir(path) as entries:
+            return sorted((e for e in entries if e.is_dir()), key=lambda e: e.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
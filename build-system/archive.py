@@ -0,0 +1,175 @@
+"""
+Package Archives for AgentForge
+Streams package files straight into deterministic compressed archives
+"""
+
+import os
+import io
+import gzip
+import socket
+import shutil
+import tarfile
+import zipfile
+import importlib.util
+from typing import Dict, Any, List, Union, BinaryIO
+
+
+# Archive format -> file extension
+ARCHIVE_FORMATS = {
+    'tar.zst': '.tar.zst',
+    'tar.gz': '.tar.gz',
+    'zip': '.zip'
+}
+
+# Zip timestamps cannot predate 1980
+_ZIP_EPOCH = 315532800
+
+
+def default_archive_format() -> str:
+    """tar.zst where the optional zstandard package is installed, else tar.gz"""
+    return 'tar.zst' if importlib.util.find_spec('zstandard') else 'tar.gz'
+
+
+DEFAULT_ARCHIVE_FORMAT = default_archive_format()
+
+
+def write_archive(files: List[Any],
+                  dirs: List[str],
+                  output: Union[str, BinaryIO, socket.socket],
+                  archive_format: str = DEFAULT_ARCHIVE_FORMAT) -> Dict[str, Any]:
+    """
+    Stream package files into an archive without staging them on disk.
+
+    The archive is deterministic: entries are sorted by path, owners are
+    cleared and every timestamp is SOURCE_DATE_EPOCH (default 0, or 1980 for
+    zip), so identical packages produce byte-identical archives.
+
+    Args:
+        files: PackageFile objects (generated data or a source path each)
+        dirs: Directories to include even if empty
+        output: Path of the archive, a writable binary file object, or a
+            connected socket
+        archive_format: One of ARCHIVE_FORMATS (default: tar.zst if
+            zstandard is installed, else tar.gz)
+
+    Returns:
+        Number of 'files' archived and compressed 'bytes' written
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Archive format {archive_format} not supported. Available: {list(ARCHIVE_FORMATS)}")
+
+    if isinstance(output, str):
+        tmp_path = f"{output}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            stats = write_archive(files, dirs, f, archive_format)
+        os.replace(tmp_path, output)
+        return stats
+
+    if isinstance(output, socket.socket):
+        with output.makefile('wb') as f:
+            return write_archive(files, dirs, f, archive_format)
+
+    counter = _CountingWriter(output)
+    mtime = int(os.environ.get('SOURCE_DATE_EPOCH', 0))
+    entries = sorted(files, key=lambda f: f.path)
+    all_dirs = _all_dirs(dirs, [f.path for f in entries])
+
+    if archive_format == 'zip':
+        _write_zip(entries, all_dirs, counter, max(mtime, _ZIP_EPOCH))
+    elif archive_format == 'tar.gz':
+        with gzip.GzipFile(filename='', mode='wb', fileobj=counter, mtime=mtime) as compressed:
+            _write_tar(entries, all_dirs, compressed, mtime)
+    else:
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("tar.zst archives require the 'zstandard' package (pip install zstandard)")
+        compressor = zstandard.ZstdCompressor(level=10)
+        with compressor.stream_writer(counter, closefd=False) as compressed:
+            _write_tar(entries, all_dirs, compressed, mtime)
+
+    counter.flush()
+    return {'files': len(entries), 'bytes': counter.bytes_written}
+
+
+# Private helper functions
+
+def _write_tar(entries: List[Any], dirs: List[str], fileobj, mtime: int):
+    # 'w|' writes a pure stream, so fileobj never needs to be seekable
+    with tarfile.open(fileobj=fileobj, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+        for path in dirs:
+            info = _tar_info(path, mtime)
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o755
+            tar.addfile(info)
+
+        for entry in entries:
+            info = _tar_info(entry.path, mtime)
+            info.size = entry.size()
+            if entry.data is not None:
+                tar.addfile(info, io.BytesIO(entry.data))
+            else:
+                with open(entry.source_path, 'rb') as f:
+                    tar.addfile(info, f)
+
+
+def _tar_info(path: str, mtime: int) -> tarfile.TarInfo:
+    info = tarfile.TarInfo(path)
+    info.mtime = mtime
+    info.mode = 0o644
+    info.uid = info.gid = 0
+    info.uname = info.gname = ''
+    return info
+
+
+def _write_zip(entries: List[Any], dirs: List[str], fileobj, mtime: int):
+    import time
+    date_time = time.gmtime(mtime)[:6]
+
+    with zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for path in dirs:
+            info = zipfile.ZipInfo(f"{path}/", date_time=date_time)
+            info.external_attr = (0o40755 << 16) | 0x10
+            archive.writestr(info, b'')
+
+        for entry in entries:
+            info = zipfile.ZipInfo(entry.path, date_time=date_time)
+            info.external_attr = 0o100644 << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            if entry.data is not None:
+                archive.writestr(info, entry.data)
+            else:
+                with open(entry.source_path, 'rb') as src, \
+                        archive.open(info, 'w', force_zip64=entry.size() > 2 ** 31) as dest:
+                    shutil.copyfileobj(src, dest, 1024 * 1024)
+
+
+def _all_dirs(dirs: List[str], file_paths: List[str]) -> List[str]:
+    """Every directory in the package, parents first"""
+    result = set()
+    for path in list(dirs) + [os.path.dirname(p) for p in file_paths]:
+        path = os.path.normpath(path)
+        while path and path != '.':
+            result.add(path)
+            path = os.path.dirname(path)
+    return sorted(result)
+
+
+class _CountingWriter(io.RawIOBase):
+    """Non-seekable writer that counts the bytes passed to the real output"""
+
+    def __init__(self, output: BinaryIO):
+        self.output = output
+        self.bytes_written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.output.write(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def flush(self):
+        if not getattr(self.output, 'closed', False):
+            self.output.flush()
@@ -0,0 +1,338 @@
+"""
+Blob Store for AgentForge
+Content-addressed storage shared by agent packages
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import threading
+import contextlib
+from typing import Dict, Any, Optional, Iterable
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from framework_abstractions import user_dirs
+
+
+DEFAULT_BLOB_DIR = os.path.join(user_dirs.CACHE_ROOT, 'blobs')
+
+# ioctl request to clone a file's extents (reflink) on Linux
+_FICLONE = 0x40049409
+
+
+class BlobStore:
+    """
+    Content-addressed store that package files are linked from.
+
+    Files shared by many packages (tests, docs, Dockerfiles, framework
+    requirements) are stored once and materialized in each package with a
+    reflink (copy-on-write clone), so they share disk blocks. Package files
+    stay writable: editing one never changes the blob or any other package.
+
+    Without reflinks (ext4, for one) a linked file is a full copy, and the
+    store would only add a second copy of each file. shares_storage() tells
+    whether a package directory gets real sharing; the package writer
+    bypasses the store where it does not.
+
+    With read_only_packages=True, files are hardlinked to the blob instead
+    (no extra disk or inodes). A hardlinked file is the blob, so packages
+    must then be treated as read-only: files are mode 0444, and anything
+    editing a package must replace files rather than write through them,
+    as the package writer does.
+
+    Packages record which blobs they use, so gc() can delete blobs no
+    existing package refers to any more. Writers hold a shared lock while
+    storing and linking blobs (writing()), and gc() an exclusive one, so
+    gc never deletes a blob between put and link.
+    """
+
+    LINK_METHODS = ['reflink', 'copy_file_range', 'copy']
+    LOCK_FILE = 'store.lock'
+
+    def __init__(self,
+                 root: str = DEFAULT_BLOB_DIR,
+                 link_methods: Optional[list] = None,
+                 read_only_packages: bool = False):
+        self.root = root
+        self.read_only_packages = read_only_packages
+        self.link_methods = link_methods or (['hardlink'] + self.LINK_METHODS if read_only_packages
+                                             else self.LINK_METHODS)
+        if 'hardlink' in self.link_methods and not read_only_packages:
+            raise ValueError("Hardlinked package files share the blob's inode; "
+                             "pass read_only_packages=True to use 'hardlink'")
+        # Blobs end up in packages: only from a directory no one else can write to
+        user_dirs.private_dir(self.root)
+        os.makedirs(os.path.join(self.root, 'objects'), exist_ok=True)
+        os.makedirs(os.path.join(self.root, 'refs'), exist_ok=True)
+        self._shares: Dict[int, bool] = {}
+
+    def blob_path(self, digest: str) -> str:
+        """Path of the blob with the given SHA-256"""
+        return os.path.join(self.root, 'objects', digest[:2], digest[2:])
+
+    def has(self, digest: str) -> bool:
+        return os.path.exists(self.blob_path(digest))
+
+    def put_bytes(self, data: bytes, digest: Optional[str] = None) -> str:
+        """Store data and return its digest"""
+        digest = digest or hashlib.sha256(data).hexdigest()
+        if not self.has(digest):
+            tmp_path = self._tmp_path(digest)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            self._commit(tmp_path, digest)
+        return digest
+
+    def put_file(self, path: str, digest: Optional[str] = None) -> str:
+        """Store a copy of a file and return its digest"""
+        if digest is None:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            digest = digest.hexdigest()
+
+        if not self.has(digest):
+            tmp_path = self._tmp_path(digest)
+            # Never hardlink the source: it may be edited later
+            self._clone(path, tmp_path, [m for m in self.link_methods if m != 'hardlink'])
+            self._commit(tmp_path, digest)
+        return digest
+
+    def link(self, digest: str, target: str) -> str:
+        """
+        Materialize a blob at target (which must not exist yet).
+        Returns the method used. Call within writing() after put_*.
+        """
+        return self._clone(self.blob_path(digest), target, self.link_methods)
+
+    def shares_storage(self, directory: str) -> bool:
+        """
+        Whether files linked into directory share storage with their blobs
+        (hardlinks or reflinks work from the store to its filesystem).
+        Probed once per filesystem; warns the first time it is not so.
+        """
+        device = os.stat(directory).st_dev
+        if device not in self._shares:
+            self._shares[device] = self._probe(directory)
+            if not self._shares[device]:
+                print(f"Warning: Blob store {self.root} cannot reflink or hardlink into {directory}; "
+                      f"package files there are written without it")
+        return self._shares[device]
+
+    @contextlib.contextmanager
+    def writing(self):
+        """Shared lock for storing and linking blobs; gc() waits for it"""
+        with self._locked(fcntl.LOCK_SH if fcntl else None):
+            yield self
+
+    def add_reference(self, package_dir: str, digests: Iterable[str]):
+        """Record the blobs a package uses, replacing its previous record"""
+        ref = {'package_dir': os.path.abspath(package_dir), 'blobs': sorted(set(digests))}
+        ref_path = self._ref_path(package_dir)
+        with open(f"{ref_path}.tmp", 'w') as f:
+            json.dump(ref, f)
+        os.replace(f"{ref_path}.tmp", ref_path)
+
+    def remove_reference(self, package_dir: str):
+        try:
+            os.remove(self._ref_path(package_dir))
+        except FileNotFoundError:
+            pass
+
+    def gc(self, min_age: float = 300, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Delete blobs no existing package refers to.
+
+        Args:
+            min_age: Keep blobs younger than this many seconds, so blobs
+                stored by a build that has not registered its package yet
+                survive
+            dry_run: Only report what would be deleted
+        """
+        with self._locked(fcntl.LOCK_EX if fcntl else None):
+            return self._gc(min_age, dry_run)
+
+    def stats(self) -> Dict[str, Any]:
+        """Number and total size of stored blobs, and number of packages"""
+        blobs = size = 0
+        for root, _, files in os.walk(os.path.join(self.root, 'objects')):
+            for name in files:
+                blobs += 1
+                size += os.path.getsize(os.path.join(root, name))
+        return {
+            'blobs': blobs,
+            'bytes': size,
+            'packages': len(os.listdir(os.path.join(self.root, 'refs')))
+        }
+
+    # Private helper methods
+
+    def _gc(self, min_age: float, dry_run: bool) -> Dict[str, Any]:
+        referenced = set()
+        stale_refs = 0
+
+        refs_dir = os.path.join(self.root, 'refs')
+        for name in os.listdir(refs_dir):
+            ref_path = os.path.join(refs_dir, name)
+            try:
+                with open(ref_path, 'r') as f:
+                    ref = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            if not os.path.isdir(ref['package_dir']):
+                # Package was deleted (e.g. evicted from the build cache)
+                stale_refs += 1
+                if not dry_run:
+                    os.remove(ref_path)
+                continue
+
+            referenced.update(ref['blobs'])
+
+        removed = kept = freed = 0
+        now = time.time()
+        objects_dir = os.path.join(self.root, 'objects')
+
+        for prefix in os.listdir(objects_dir):
+            prefix_dir = os.path.join(objects_dir, prefix)
+            for name in os.listdir(prefix_dir):
+                path = os.path.join(prefix_dir, name)
+                stat = os.stat(path)
+
+                if prefix + name in referenced or name.endswith('.tmp') or now - stat.st_mtime < min_age:
+                    kept += 1
+                    continue
+
+                removed += 1
+                freed += stat.st_size
+                if not dry_run:
+                    os.remove(path)
+
+        return {
+            'removed': removed,
+            'kept': kept,
+            'freed_bytes': freed,
+            'stale_refs': stale_refs,
+            'dry_run': dry_run
+        }
+
+    @contextlib.contextmanager
+    def _locked(self, operation: Optional[int]):
+        """flock the store (where flock exists)"""
+        if operation is None:
+            yield
+            return
+        with open(os.path.join(self.root, self.LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _probe(self, directory: str) -> bool:
+        methods = [m for m in self.link_methods if m in ('hardlink', 'reflink')]
+        if not methods:
+            return False
+
+        source = os.path.join(self.root, f".probe.{os.getpid()}.{threading.get_ident()}")
+        target = os.path.join(directory, f".blob-probe.{os.getpid()}.{threading.get_ident()}")
+        try:
+            with open(source, 'wb') as f:
+                f.write(b'probe')
+            self._clone(source, target, methods)
+            return True
+        except OSError:
+            return False
+        finally:
+            for path in (source, target):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _tmp_path(self, digest: str) -> str:
+        os.makedirs(os.path.dirname(self.blob_path(digest)), exist_ok=True)
+        return f"{self.blob_path(digest)}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def _commit(self, tmp_path: str, digest: str):
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, self.blob_path(digest))
+
+    def _ref_path(self, package_dir: str) -> str:
+        name = hashlib.sha1(os.path.abspath(package_dir).encode()).hexdigest()
+        return os.path.join(self.root, 'refs', f"{name}.json")
+
+    def _clone(self, source: str, target: str, methods: list) -> str:
+        """Create target with source's content using the first method that works"""
+        for method in methods:
+            try:
+                if method == 'hardlink':
+                    os.link(source, target)
+                elif method == 'reflink':
+                    _reflink(source, target)
+                elif method == 'copy_file_range':
+                    _copy_file_range(source, target)
+                else:
+                    shutil.copyfile(source, target)
+                return method
+            except (OSError, AttributeError, ImportError):
+                # Not supported here (other filesystem, platform, Python)
+                try:
+                    os.remove(target)
+                except OSError:
+                    pass
+
+        raise OSError(f"Could not copy {source} to {target}")
+
+
+def _reflink(source: str, target: str):
+    import fcntl
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+
+
+def _copy_file_range(source: str, target: str):
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+            if copied == 0:
+                raise OSError(f"copy_file_range stopped early copying {source}")
+            remaining -= copied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage the AgentForge package blob store')
+    parser.add_argument('--root', default=DEFAULT_BLOB_DIR, help='Blob store directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    gc_parser = commands.add_parser('gc', help='Delete blobs no package refers to')
+    gc_parser.add_argument('--min-age', type=float, default=300,
+                           help='Keep blobs younger than this many seconds')
+    gc_parser.add_argument('--dry-run', action='store_true', help='Only report what would be deleted')
+
+    commands.add_parser('stats', help='Show blob store usage')
+
+    args = parser.parse_args(argv)
+    store = BlobStore(args.root)
+
+    if args.command == 'gc':
+        result = store.gc(min_age=args.min_age, dry_run=args.dry_run)
+    else:
+        result = store.stats()
+
+    json.dump(result, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,418 @@
+"""
+Build Cache for AgentForge
+Persistent, content-addressed cache of built agent packages
+"""
+
+import os
+import json
+import time
+import atexit
+import pickle
+import hashlib
+import weakref
+import threading
+import contextlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+
+from framework_abstractions import text_store, user_dirs
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+DEFAULT_CACHE_DIR = os.path.join(user_dirs.CACHE_ROOT, 'builds')
+
+
+class BuildCache:
+    """
+    On-disk cache of built agent packages.
+
+    Entries are keyed on a hash of everything that affects the build output,
+    so a hit can return the existing package without re-reading, re-parsing
+    or re-writing anything. Entries are evicted least-recently-used first once
+    the cache exceeds its entry or size budget, or when they get too old.
+    """
+
+    INDEX_FILE = 'index.json'
+    LOCK_FILE = 'index.lock'
+
+    # Seconds between index writes for lookups alone
+    SAVE_INTERVAL = 5.0
+
+    def __init__(self,
+                 cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_entries: int = 1000,
+                 max_bytes: int = 2 * 1024 ** 3,
+                 max_age: float = 7 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.RLock()
+
+        # Entries are unpickled: only from a directory no one else can write to
+        user_dirs.private_dir(self.cache_dir)
+        os.makedirs(os.path.join(self.cache_dir, 'entries'), exist_ok=True)
+        self._index = self._load_index()
+        self._reset_pending()
+        self._saved_at = time.monotonic()
+
+        # Lookups are saved in batches: flush what is left when the process exits
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+    @staticmethod
+    def compute_key(source_digest: str,
+                    config: Dict[str, Any],
+                    framework: str,
+                    adapter_version: str,
+                    optimization: str,
+                    extra_inputs: Optional[List[str]] = None,
+                    builder_version: Optional[str] = None) -> str:
+        """
+        Compute the cache key for a build.
+
+        Args:
+            source_digest: Content hash of the agent source (AgentSource.digest)
+            config: Merged build configuration
+            framework: Target framework name
+            adapter_version: Version of the adapter doing the build
+            optimization: Optimization level
+            extra_inputs: Paths of other files or directories copied into
+                the package (tests, docs)
+            builder_version: Version of the code generating the rest of the
+                package (Dockerfile, server, package layout)
+        """
+        digest = hashlib.sha256()
+        header = {
+            'source': source_digest,
+            'framework': framework,
+            'adapter_version': adapter_version,
+            'builder_version': builder_version,
+            'optimization': optimization,
+            'config': config
+        }
+        digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+
+        for path in sorted(extra_inputs or []):
+            _hash_path(digest, path)
+
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached package for key, or None on a miss"""
+        with self._lock:
+            entry = self._index['entries'].get(key)
+
+            if entry and not self._is_valid(entry):
+                self._remove_entry(key)
+                entry = None
+
+            package = None
+            if entry:
+                try:
+                    with open(self._entry_path(key), 'rb') as f:
+                        package = pickle.load(f)
+                except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                    self._remove_entry(key)
+
+            if package is None:
+                self._count('misses')
+                self._save_index_soon()
+                return None
+
+            entry['last_access'] = time.time()
+            self._touched[key] = entry['last_access']
+            self._count('hits')
+            self._save_index_soon()
+
+        package['cached'] = True
+        return package
+
+    def put(self, key: str, package: Dict[str, Any]):
+        """Store a freshly built package under key"""
+        package_path = package['package_path']
+
+        with self._lock:
+            # Large texts (compiled code) are stored once for all entries
+            with open(self._entry_path(key) + '.tmp', 'wb') as f, text_store.sharing():
+                pickle.dump(package, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(self._entry_path(key) + '.tmp', self._entry_path(key))
+
+            now = time.time()
+            entry = {
+                'package_path': package_path,
+                'fingerprint': _fingerprint(package_path),
+                'size': _tree_size(package_path),
+                'created_at': now,
+                'last_access': now
+            }
+            self._index['entries'][key] = entry
+            self._added[key] = entry
+            self._removed.discard(key)
+
+            # Evicts against every process's entries
+            self._save_index()
+
+    def flush(self):
+        """Write pending access times and hit/miss counts to the index now"""
+        with self._lock:
+            if self._has_pending():
+                self._save_index()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics and current cache usage"""
+        with self._lock:
+            stats = dict(self._index['stats'])
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+            stats['entries'] = len(self._index['entries'])
+            stats['bytes'] = sum(e['size'] for e in self._index['entries'].values())
+            return stats
+
+    def clear(self):
+        """Remove every entry (packages are left on disk)"""
+        with self._lock, self._index_lock():
+            self._merge_index()
+            for key in list(self._index['entries']):
+                self._remove_entry(key)
+            self._write_index()
+
+    # Private helper methods
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, 'entries', f"{key}.pkl")
+
+    def _is_valid(self, entry: Dict[str, Any]) -> bool:
+        """An entry is valid while it is fresh and its package is untouched"""
+        if time.time() - entry['created_at'] > self.max_age:
+            return False
+
+        # Packages are written to a path derived from the agent id, so a
+        # build with a different config can overwrite a cached package.
+        return _fingerprint(entry['package_path']) == entry['fingerprint']
+
+    def _evict(self):
+        """Drop expired entries, then least-recently-used until within budget"""
+        entries = self._index['entries']
+        now = time.time()
+
+        for key in [k for k, e in entries.items() if now - e['created_at'] > self.max_age]:
+            self._remove_entry(key)
+
+        by_access = sorted(entries, key=lambda k: entries[k]['last_access'])
+        total = sum(e['size'] for e in entries.values())
+
+        while by_access and (len(entries) > self.max_entries or total > self.max_bytes):
+            key = by_access.pop(0)
+            total -= entries[key]['size']
+            self._remove_entry(key)
+
+    def _remove_entry(self, key: str):
+        """
+        Forget an entry and delete its pickle. The package directory is not
+        the cache's: an uncached build may have just rewritten it.
+        """
+        if self._index['entries'].pop(key, None) is None:
+            return
+
+        self._count('evictions')
+        self._added.pop(key, None)
+        self._touched.pop(key, None)
+        self._removed.add(key)
+
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _count(self, counter: str):
+        self._index['stats'][counter] += 1
+        self._pending[counter] += 1
+
+    def _has_pending(self) -> bool:
+        return bool(self._added or self._removed or self._touched or any(self._pending.values()))
+
+    def _reset_pending(self):
+        self._pending = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._added = {}
+        self._touched = {}
+        self._removed = set()
+
+    def _load_index(self) -> Dict[str, Any]:
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        try:
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+
+        index.setdefault('entries', {})
+        index.setdefault('stats', {})
+        for counter in ('hits', 'misses', 'evictions'):
+            index['stats'].setdefault(counter, 0)
+        return index
+
+    def _save_index_soon(self):
+        """Lookups only change access times and counters: save those at most every SAVE_INTERVAL"""
+        if time.monotonic() - self._saved_at >= self.SAVE_INTERVAL:
+            self._save_index()
+
+    def _save_index(self):
+        """Merge this process's changes into the on-disk index, evict, and write it back"""
+        with self._index_lock():
+            self._merge_index()
+            self._evict()
+            self._write_index()
+
+    def _merge_index(self):
+        """
+        Replace the in-memory index with the on-disk one plus this process's
+        pending changes, so concurrent builders don't drop each other's entries.
+        Call with the index lock held.
+        """
+        index = self._load_index()
+        entries = index['entries']
+
+        for key in self._removed:
+            entries.pop(key, None)
+        entries.update(self._added)
+        for key, last_access in self._touched.items():
+            if key in entries:
+                entries[key]['last_access'] = max(entries[key]['last_access'], last_access)
+        for counter, count in self._pending.items():
+            index['stats'][counter] += count
+
+        self._index = index
+        self._reset_pending()
+
+    def _write_index(self):
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        tmp_path = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, index_path)
+        self._reset_pending()
+        self._saved_at = time.monotonic()
+
+    @contextlib.contextmanager
+    def _index_lock(self):
+        """Exclusive lock on the index across processes (where flock exists)"""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.cache_dir, self.LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class MemoryBuildCache(BuildCache):
+    """
+    BuildCache with an in-memory front, for long-running build processes.
+
+    Hits on recently used entries are answered from memory: no unpickling
+    and no index write, just a check that the package's package.json is
+    unchanged. Misses and new entries go through the on-disk cache as usual.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_memory_entries: int = 256, **kwargs):
+        super().__init__(cache_dir, **kwargs)
+        self.max_memory_entries = max_memory_entries
+        self.memory_hits = 0
+        self._memory: 'OrderedDict[str, Tuple[Dict[str, Any], Optional[str], float]]' = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            held = self._memory.get(key)
+            if held is not None:
+                package, fingerprint, created_at = held
+                fresh = time.time() - created_at <= self.max_age
+                if fresh and _fingerprint(package['package_path']) == fingerprint:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    entry = self._index['entries'].get(key)
+                    if entry is not None:
+                        entry['last_access'] = self._touched[key] = time.time()
+                    return dict(package, cached=True)
+                del self._memory[key]
+
+        package = super().get(key)
+        if package is not None:
+            self._remember(key, package)
+        return package
+
+    def put(self, key: str, package: Dict[str, Any]):
+        super().put(key, package)
+        self._remember(key, package)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(super().stats(), memory_hits=self.memory_hits, memory_entries=len(self._memory))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            super().clear()
+
+    def _remember(self, key: str, package: Dict[str, Any]):
+        with self._lock:
+            entry = self._index['entries'].get(key)
+            if entry is None:
+                return
+            self._memory[key] = (dict(package), entry['fingerprint'], entry['created_at'])
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+
+def _flush_at_exit(cache_ref: 'weakref.ref'):
+    cache = cache_ref()
+    if cache is not None:
+        try:
+            cache.flush()
+        except OSError:
+            pass
+
+
+def _hash_path(digest, path: str):
+    """Feed a file, or every file under a directory, into digest"""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                _hash_path(digest, os.path.join(root, name))
+        return
+
+    if not os.path.exists(path):
+        return
+
+    digest.update(path.encode())
+    digest.update(b'\0')
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+
+
+def _fingerprint(package_path: str) -> Optional[str]:
+    """Hash of a package's package.json, or None if the package is gone"""
+    try:
+        with open(os.path.join(package_path, 'package.json'), 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _tree_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
@@ -0,0 +1,176 @@
+"""
+Build Profiler for AgentForge
+Opt-in CPU (cProfile) and allocation (tracemalloc) profiling of a build
+"""
+
+import os
+import json
+import time
+import pstats
+import cProfile
+import tempfile
+import warnings
+import threading
+import tracemalloc
+import contextvars
+from typing import Dict, Any, List
+
+
+# Files written next to package.json
+PROFILE_FILE = 'build.prof'
+SUMMARY_FILE = 'build-profile.json'
+
+DEFAULT_TOP = 25
+
+# Allocations made by these files are profiling overhead, not the build's
+IGNORED_FILES = (tracemalloc.__file__, '<frozen importlib._bootstrap>', '<frozen importlib._bootstrap_external>')
+
+_profiling: contextvars.ContextVar = contextvars.ContextVar('agentforge_profiling', default=False)
+
+# cProfile and tracemalloc are process-wide: one profiled build at a time
+_active = threading.Lock()
+
+
+def is_profiling() -> bool:
+    """Whether the current build (task or thread) is being profiled"""
+    return _profiling.get()
+
+
+class BuildProfiler:
+    """
+    Profiles everything run in the current thread while entered, and every
+    allocation in the process.
+
+    cProfile only sees the thread that enabled it, so while is_profiling()
+    is true the builder runs its blocking stages inline rather than in its
+    executor. Other builds sharing the event loop meanwhile show up in the
+    profile too; profile builds one at a time for clean numbers. While one
+    profiler is active, entering another warns (RuntimeWarning) and leaves
+    its active flag False.
+    """
+
+    def __init__(self, top: int = DEFAULT_TOP, frames: int = 10):
+        self.top = top
+        self.frames = frames
+        self.active = False
+        self.wall_seconds = 0.0
+        self.peak_bytes = 0
+        self._profiler = None
+        self._baseline = None
+        self._snapshot = None
+        self._started_tracemalloc = False
+        self._started = 0.0
+        self._token = None
+
+    def __enter__(self) -> 'BuildProfiler':
+        if not _active.acquire(blocking=False):
+            # Leaves active False: the build runs unprofiled and callers skip write()
+            warnings.warn("Another build is already being profiled; building without profiling",
+                          RuntimeWarning, stacklevel=2)
+            return self
+        self.active = True
+        self._token = _profiling.set(True)
+
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.take_snapshot()
+
+        self._started = time.perf_counter()
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if not self.active:
+            return False
+        self._profiler.disable()
+        self.wall_seconds = time.perf_counter() - self._started
+
+        self._snapshot = tracemalloc.take_snapshot()
+        self.peak_bytes = tracemalloc.get_traced_memory()[1]
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        _profiling.reset(self._token)
+        _active.release()
+        return False
+
+    def summary(self) -> Dict[str, Any]:
+        """Top hotspots by own and cumulative time, and top allocation sites by growth"""
+        return {
+            'wall_seconds': round(self.wall_seconds, 4),
+            'peak_traced_bytes': self.peak_bytes,
+            'hotspots': self._functions('tottime'),
+            'cumulative': self._functions('cumtime'),
+            'allocations': self._allocations()
+        }
+
+    def write(self, directory: str) -> Dict[str, Any]:
+        """
+        Write PROFILE_FILE (pstats format, for snakeviz or python -m pstats)
+        and SUMMARY_FILE (JSON) to directory.
+
+        Returns:
+            The summary, with the 'profile_path' and 'summary_path' written
+        """
+        if self._profiler is None:
+            raise RuntimeError("Nothing was profiled: check BuildProfiler.active before writing")
+        os.makedirs(directory, exist_ok=True)
+        profile_path = os.path.join(directory, PROFILE_FILE)
+        summary_path = os.path.join(directory, SUMMARY_FILE)
+
+        self._profiler.dump_stats(profile_path)
+        summary = self.summary()
+        with open(summary_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        return dict(summary, profile_path=profile_path, summary_path=summary_path)
+
+    # Private helper methods
+
+    def _functions(self, sort_key: str) -> List[Dict[str, Any]]:
+        stats = pstats.Stats(self._profiler).stats
+        index = {'tottime': 2, 'cumtime': 3}[sort_key]
+        ranked = sorted(stats.items(), key=lambda item: item[1][index], reverse=True)[:self.top]
+
+        return [{
+            'function': f"{file}:{line}({name})",
+            'calls': calls,
+            'primitive_calls': primitive_calls,
+            'own_seconds': round(own, 6),
+            'cumulative_seconds': round(cumulative, 6)
+        } for (file, line, name), (primitive_calls, calls, own, cumulative, _) in ranked]
+
+    def _allocations(self) -> List[Dict[str, Any]]:
+        filters = [tracemalloc.Filter(False, name) for name in IGNORED_FILES]
+        snapshot = self._snapshot.filter_traces(filters)
+        baseline = self._baseline.filter_traces(filters)
+
+        allocations = []
+        for stat in snapshot.compare_to(baseline, 'traceback')[:self.top]:
+            # Frames run from the oldest to where the memory was allocated
+            frames = [f"{frame.filename}:{frame.lineno}" for frame in reversed(stat.traceback)]
+            allocations.append({
+                'location': frames[0],
+                'size_bytes': stat.size,
+                'size_diff_bytes': stat.size_diff,
+                'count': stat.count,
+                'traceback': frames
+            })
+        return allocations
+
+
+def profile_directory(package: Dict[str, Any]) -> str:
+    """
+    Where a build's profile goes: the package directory (next to
+    package.json), '<archive>.profile' for archives written to a path,
+    or a new temporary directory for streamed archives.
+    """
+    path = package.get('package_path')
+    if path and os.path.isdir(path):
+        return path
+    if path:
+        return f"{path}.profile"
+    return tempfile.mkdtemp(prefix='agentforge-profile-')
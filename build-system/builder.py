@@ -6,15 +6,32 @@ Works with existing agents from inferloop-agents repository
 import os
 import json
 import asyncio
-from typing import Dict, Any, Optional
+import hashlib
+import functools
+import contextvars
+from concurrent.futures import Executor
+from typing import Dict, Any, Optional, List, Union, AsyncIterator
 from datetime import datetime
-import shutil
 import subprocess
 
 # Import framework registry
 import sys
 sys.path.append('/home/dmiruke/agent-dev-products/inferloop-agentforge')
 from framework_registry import FrameworkRegistry
+from agent_catalog import DOC_FILES
+from build_system.build_cache import BuildCache, DEFAULT_CACHE_DIR
+from build_system.package_writer import PackageWriter, MANIFEST_FILE
+from build_system.archive import ARCHIVE_FORMATS, DEFAULT_ARCHIVE_FORMAT
+from build_system.blob_store import BlobStore
+from build_system.dependency_resolver import DependencyResolver
+from build_system.server_template import generate_server
+from build_system import build_profiler
+from framework_abstractions import dockerfile, tracing
+from framework_abstractions.base import CompactAgent
+
+
+# Where packages and default archives are written
+DEFAULT_OUTPUT_DIR = '/tmp'
 
 
 class AgentBuilder:
@@ -23,15 +40,49 @@ class AgentBuilder:
     functionality from inferloop-agents repository.
     """
     
-    def __init__(self):
+    # Documentation copied from the original agent into the package
+    DOC_FILES = DOC_FILES
+    
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 use_cache: bool = True,
+                 executor: Optional[Executor] = None,
+                 incremental: bool = True,
+                 blob_store: Optional[BlobStore] = None,
+                 resolver: Optional[DependencyResolver] = None,
+                 build_cache: Optional[BuildCache] = None,
+                 output_dir: Optional[str] = None):
         self.registry = FrameworkRegistry()
-        self.build_cache = {}
+        
+        # Pass a build_cache to share one (e.g. a MemoryBuildCache in a daemon)
+        if build_cache is None and use_cache:
+            build_cache = BuildCache(cache_dir or DEFAULT_CACHE_DIR)
+        self.build_cache = build_cache if use_cache else None
+        
+        # Blocking filesystem work runs here (None = loop's default executor)
+        self.executor = executor
+        
+        # Only rewrite package files whose content changed
+        self.incremental = incremental
+        
+        # Link package files from a shared content-addressed store
+        self.blob_store = blob_store
+        
+        # Merges agent and adapter requirements (pass one with a wheelhouse
+        # or index snapshot to pin versions)
+        self.resolver = resolver or DependencyResolver()
+        
+        # Packages go to <output_dir>/agent-package-<id>
+        self.output_dir = output_dir or DEFAULT_OUTPUT_DIR
+        self._package_locks: Dict[str, asyncio.Lock] = {}
         
     async def build(self,
                     agent_source: str,
                     framework: str,
                     optimization: str = 'balanced',
-                    config: Optional[Dict] = None) -> Dict[str, Any]:
+                    config: Optional[Dict] = None,
+                    profile: bool = False,
+                    **package_options) -> Dict[str, Any]:
         """
         Build agent for specified framework.
         
@@ -40,6 +91,11 @@ class AgentBuilder:
             framework: Target framework (langchain, crewai, autogen, etc.)
             optimization: Optimization level (development, balanced, production)
             config: Additional configuration
+            profile: Profile the build's CPU time and allocations, writing
+                build.prof and build-profile.json next to package.json (see
+                build_profiler); the summary is returned as 'profile'
+            package_options: Passed to package_agent (output_format,
+                archive_format, output)
         
         Returns:
             Built agent package
@@ -51,120 +107,437 @@ class AgentBuilder:
             parts = agent_source.split('/')
             if len(parts) == 2:
                 category, agent_name = parts
-                return await self.build_from_repo(category, agent_name, framework, optimization, config)
+                return await self.build_from_repo(category, agent_name, framework, optimization, config,
+                                                  profile, **package_options)
         
         # Otherwise, treat as raw source code
-        return await self.build_from_source(agent_source, framework, optimization, config)
+        return await self.build_from_source(agent_source, framework, optimization, config, profile,
+                                            **package_options)
+    
+    async def build_many(self,
+                         specs: List[Union[str, Dict[str, Any]]],
+                         framework: Optional[str] = None,
+                         optimization: str = 'production',
+                         max_concurrency: int = 4) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Build several agents concurrently.
+        
+        Args:
+            specs: Agent sources as accepted by build(), or dicts with
+                'agent_source' and optional 'framework', 'optimization'
+                and 'config' keys overriding the defaults below
+            framework: Default target framework
+            optimization: Default optimization level
+            max_concurrency: Maximum number of builds in flight at once
+        
+        Yields:
+            Build results in completion order, each with the originating
+            'spec'. A failing build yields {'success': False, 'error': ...}
+            instead of aborting the others.
+        
+        Example:
+            async for result in builder.build_many(['finance/fraud_detection',
+                                                    'hr/resume_screener'],
+                                                   framework='langchain'):
+                print(result['spec'], result['success'])
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(spec):
+            options = {'agent_source': spec} if isinstance(spec, str) else dict(spec)
+            async with semaphore:
+                try:
+                    result = await self.build(
+                        options['agent_source'],
+                        options.get('framework', framework),
+                        options.get('optimization', optimization),
+                        options.get('config')
+                    )
+                except Exception as e:
+                    result = {'success': False, 'error': f"{type(e).__name__}: {e}"}
+            return dict(result, spec=spec)
+        
+        tasks = [asyncio.ensure_future(run(spec)) for spec in specs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early: don't leave builds running unattended
+            for task in tasks:
+                task.cancel()
     
     async def build_from_repo(self,
                               category: str,
                               agent_name: str,
                               framework: str,
                               optimization: str = 'production',
-                              config: Optional[Dict] = None) -> Dict[str, Any]:
+                              config: Optional[Dict] = None,
+                              profile: bool = False,
+                              **package_options) -> Dict[str, Any]:
         """
         Build agent from inferloop-agents repository.
         Preserves all original functionality.
         """
         
-        print(f"Building {category}/{agent_name} with {framework} framework...")
+        if profile:
+            return await self._profiled(
+                self.build_from_repo(category, agent_name, framework, optimization, config, **package_options)
+            )
         
-        # Get agent from repository
-        agent_data = self.registry.get_agent_from_repo(category, agent_name)
+        with tracing.span('build_from_repo', category=category, agent=agent_name, framework=framework,
+                          optimization=optimization) as span:
+            print(f"Building {category}/{agent_name} with {framework} framework...")
+            
+            # Get agent from repository
+            agent_data = await self._run_blocking(self.registry.get_agent_from_repo, category, agent_name)
+            
+            # Get framework adapter
+            adapter = await self._run_blocking(self.registry.get_adapter, framework)
+            
+            if not adapter:
+                # Fallback: package as-is without framework translation
+                return await self.package_raw_agent(agent_data, **package_options)
+            
+            # Build configuration
+            build_config = {
+                'agent_id': f"{category}-{agent_name}",
+                'name': agent_name.replace('_', ' ').title(),
+                'category': category,
+                'optimization': optimization
+            }
+            
+            if config:
+                build_config.update(config)
+            
+            # Return the existing package if nothing that affects it changed
+            # Only package directories are cached; archives may go to streams
+            cache_key = None
+            if self.build_cache is not None and package_options.get('output_format', 'directory') == 'directory':
+                cache_key = await self._run_blocking(
+                    self._cache_key, agent_data, framework, adapter, build_config, optimization
+                )
+                cached = await self._run_blocking(self.build_cache.get, cache_key)
+                span.set_attribute('cache_hit', bool(cached))
+                if cached:
+                    print(f"Using cached build for {category}/{agent_name}")
+                    # Same Agent type as a fresh build
+                    return dict(cached, agent=cached['agent'].to_agent())
+            
+            # Build with framework and optimize; the adapter streams the source
+            agent = await self._run_blocking(
+                self._compile_agent, adapter, agent_data['source'], build_config, optimization,
+                agent_data['requirements']
+            )
+            
+            # Package
+            package = await self.package_agent(agent, agent_data, **package_options)
+            
+            if cache_key:
+                # Cached packages hold a CompactAgent: the source stays on disk and
+                # the compiled code is stored once however many agents share it
+                cached = dict(package, agent=CompactAgent.from_agent(agent))
+                await self._run_blocking(self.build_cache.put, cache_key, cached)
+            
+            return package
+    
+    async def build_from_source(self,
+                                source_code: str,
+                                framework: str,
+                                optimization: str = 'balanced',
+                                config: Optional[Dict] = None,
+                                profile: bool = False,
+                                **package_options) -> Dict[str, Any]:
+        """Build agent from raw source code"""
         
-        # Get framework adapter
-        adapter = self.registry.get_adapter(framework)
+        if profile:
+            return await self._profiled(
+                self.build_from_source(source_code, framework, optimization, config, **package_options)
+            )
         
-        if not adapter:
-            # Fallback: package as-is without framework translation
-            return await self.package_raw_agent(agent_data)
+        with tracing.span('build_from_source', framework=framework, optimization=optimization):
+            adapter = await self._run_blocking(self.registry.get_adapter, framework)
+            
+            if not adapter:
+                raise ValueError(f"Framework {framework} not supported")
+            
+            # Default configuration
+            build_config = {
+                'agent_id': f"custom-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+                'name': 'Custom Agent',
+                'optimization': optimization
+            }
+            
+            if config:
+                build_config.update(config)
+            
+            # Build and optimize
+            agent = await self._run_blocking(self._compile_agent, adapter, source_code, build_config, optimization)
+            
+            # Package
+            package = await self.package_agent(agent, None, **package_options)
+            
+            return package
+    
+    async def package_agent(self,
+                            agent: Any,
+                            agent_data: Optional[Dict] = None,
+                            output_format: str = 'directory',
+                            archive_format: str = DEFAULT_ARCHIVE_FORMAT,
+                            output: Any = None) -> Dict[str, Any]:
+        """
+        Package agent for deployment.
+        Maintains compatibility with inferloop-agents structure.
         
-        # Combine source files
-        source_code = "\n\n".join([f['content'] for f in agent_data['source_files']])
+        Args:
+            agent: Built agent
+            agent_data: Agent data from inferloop-agents, if built from there
+            output_format: 'directory' to write a package tree, or 'archive'
+                to stream the package straight into a compressed archive
+            archive_format: Archive format (tar.zst, tar.gz, zip; default tar.zst
+                if zstandard is installed, else tar.gz)
+            output: Archive destination: a path, a writable binary file
+                object or a socket (default: <output_dir>/agent-package-<id>.<ext>)
+        """
         
-        # Build configuration
-        build_config = {
-            'agent_id': f"{category}-{agent_name}",
-            'name': agent_name.replace('_', ' ').title(),
-            'category': category,
-            'optimization': optimization
-        }
+        if output_format == 'archive':
+            output = output or os.path.join(
+                self.output_dir, f"agent-package-{agent.id}{ARCHIVE_FORMATS.get(archive_format, '')}"
+            )
+            metadata = {
+                'agent_id': agent.id,
+                'name': agent.name,
+                'framework': agent.framework
+            }
+            return await self._package_archive(
+                self._collect_package_files, (agent, agent_data), metadata, output, archive_format,
+                agent=agent
+            )
         
-        if config:
-            build_config.update(config)
+        self._check_output_format(output_format)
+        package_dir = os.path.join(self.output_dir, f"agent-package-{agent.id}")
         
-        # Build with framework
-        agent = adapter.build_agent(source_code, build_config)
+        async with self._package_lock(package_dir):
+            metadata = await self._run_blocking(self._write_package, package_dir, agent, agent_data)
         
-        # Optimize
-        if optimization != 'none':
-            agent = adapter.optimize_agent(agent, optimization)
+        return {
+            'success': True,
+            'package_path': package_dir,
+            'metadata': metadata,
+            'agent': agent
+        }
+    
+    async def package_raw_agent(self,
+                                agent_data: Dict,
+                                output_format: str = 'directory',
+                                archive_format: str = DEFAULT_ARCHIVE_FORMAT,
+                                output: Any = None) -> Dict[str, Any]:
+        """
+        Package agent without framework translation.
+        Used when framework adapter is not available.
+        Takes the same output options as package_agent.
+        """
         
-        # Package
-        package = await self.package_agent(agent, agent_data)
+        package_name = f"agent-package-{agent_data['category']}-{agent_data['name']}"
         
-        return package
-    
-    async def build_from_source(self,
-                                source_code: str,
-                                framework: str,
-                                optimization: str = 'balanced',
-                                config: Optional[Dict] = None) -> Dict[str, Any]:
-        """Build agent from raw source code"""
+        if output_format == 'archive':
+            output = output or os.path.join(self.output_dir, f"{package_name}{ARCHIVE_FORMATS.get(archive_format, '')}")
+            metadata = {
+                'agent_id': f"{agent_data['category']}-{agent_data['name']}",
+                'name': agent_data['name'],
+                'category': agent_data['category'],
+                'framework': 'original'
+            }
+            return await self._package_archive(
+                self._collect_raw_package_files, (agent_data,), metadata, output, archive_format,
+                warning='Packaged without framework translation'
+            )
         
-        adapter = self.registry.get_adapter(framework)
+        self._check_output_format(output_format)
+        package_dir = os.path.join(self.output_dir, package_name)
         
-        if not adapter:
-            raise ValueError(f"Framework {framework} not supported")
+        async with self._package_lock(package_dir):
+            metadata = await self._run_blocking(self._write_raw_package, package_dir, agent_data)
         
-        # Default configuration
-        build_config = {
-            'agent_id': f"custom-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
-            'name': 'Custom Agent',
-            'optimization': optimization
+        return {
+            'success': True,
+            'package_path': package_dir,
+            'metadata': metadata,
+            'warning': 'Packaged without framework translation'
         }
+    
+    async def _package_archive(self,
+                               collect,
+                               collect_args: tuple,
+                               metadata: Dict[str, Any],
+                               output: Any,
+                               archive_format: str,
+                               **result) -> Dict[str, Any]:
+        """Stream a package into an archive and build the package result"""
+        
+        def write():
+            with tracing.span('package_agent', agent=metadata['agent_id'], output_format='archive'):
+                writer = PackageWriter()
+                collect(writer, *collect_args)
+                
+                # No timestamps or local paths, so the archive is reproducible
+                metadata['files'] = sorted({path.split('/', 1)[0] for path in list(writer.files) + writer.dirs})
+                writer.add_text('package.json', json.dumps(metadata, indent=2))
+                
+                return writer.write_archive(output, archive_format)
+        
+        if isinstance(output, str):
+            async with self._package_lock(output):
+                archive_stats = await self._run_blocking(write)
+        else:
+            archive_stats = await self._run_blocking(write)
+        
+        archive_path = output if isinstance(output, str) else None
+        metadata = dict(metadata, created_at=datetime.now().isoformat(), package_path=archive_path)
+        
+        return dict({
+            'success': True,
+            'package_path': archive_path,
+            'metadata': metadata,
+            'archive': archive_stats
+        }, **result)
+    
+    def _check_output_format(self, output_format: str):
+        if output_format not in ('directory', 'archive'):
+            raise ValueError(f"Output format {output_format} not supported. Available: ['directory', 'archive']")
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """
+        Run blocking work in the executor so builds overlap on the event loop.
+        The work runs in a copy of the caller's context, so it is traced as
+        part of the caller's span.
+        """
+        if build_profiler.is_profiling():
+            # cProfile only sees the thread it was enabled in
+            return func(*args, **kwargs)
         
-        if config:
-            build_config.update(config)
-        
-        # Build
-        agent = adapter.build_agent(source_code, build_config)
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self.executor, functools.partial(context.run, func, *args, **kwargs))
+    
+    async def _profiled(self, build) -> Dict[str, Any]:
+        """Run a build under a BuildProfiler and write its profile next to the package"""
+        profiler = build_profiler.BuildProfiler()
+        with profiler:
+            package = await build
+        
+        if not profiler.active:
+            return package
+        summary = await self._run_blocking(profiler.write, build_profiler.profile_directory(package))
+        return dict(package, profile=summary)
+    
+    def _package_lock(self, package_dir: str) -> asyncio.Lock:
+        """Serialize concurrent builds writing the same package directory"""
+        if package_dir not in self._package_locks:
+            self._package_locks[package_dir] = asyncio.Lock()
+        return self._package_locks[package_dir]
+    
+    def _compile_agent(self,
+                       adapter: Any,
+                       source_code: Any,
+                       build_config: Dict,
+                       optimization: str,
+                       requirements: Optional[List[str]] = None) -> Any:
+        """
+        Build and optimize an agent with its framework adapter, then merge
+        the agent's own requirements into the adapter's dependencies.
+        Raises DependencyConflictError if they cannot be satisfied together.
+        """
+        with tracing.span('build_agent', framework=adapter.framework_name):
+            agent = adapter.build_agent(source_code, build_config)
         
-        # Optimize
         if optimization != 'none':
-            agent = adapter.optimize_agent(agent, optimization)
+            with tracing.span('optimize_agent', framework=adapter.framework_name, target=optimization):
+                agent = adapter.optimize_agent(agent, optimization)
+        
+        with tracing.span('resolve_dependencies') as span:
+            framework_requirements = adapter.get_dependencies()
+            resolution = self.resolver.resolve(agent.dependencies or [], requirements or [], strict=True)
+            
+            # The framework's own requirements go into its shared base image
+            base = self.resolver.resolve(framework_requirements)
+            span.set_attribute('requirements', len(resolution.requirements))
+        
+        agent.dependencies = resolution.requirements
+        agent.metadata = dict(agent.metadata or {}, dependencies={
+            'base': base.requirements,
+            'digest': resolution.digest,
+            'pinned': len(resolution.pins),
+            'unresolved': resolution.unresolved
+        })
+        for warning in resolution.warnings:
+            print(f"Warning: {warning}")
+        
+        return agent
+    
+    def _write_package(self, package_dir: str, agent: Any, agent_data: Optional[Dict]) -> Dict[str, Any]:
+        """Write the package tree for a built agent and return its metadata"""
         
-        # Package
-        package = await self.package_agent(agent, None)
+        with tracing.span('package_agent', agent=agent.id, output_format='directory'):
+            writer = PackageWriter(package_dir, incremental=self.incremental, blob_store=self.blob_store)
+            self._collect_package_files(writer, agent, agent_data)
+            changes = writer.write()
         
-        return package
+        # Create package metadata
+        metadata = {
+            'agent_id': agent.id,
+            'name': agent.name,
+            'framework': agent.framework,
+            'created_at': datetime.now().isoformat(),
+            'package_path': package_dir
+        }
+        
+        return self._write_metadata(package_dir, metadata, changes)
     
-    async def package_agent(self, agent: Any, agent_data: Optional[Dict] = None) -> Dict[str, Any]:
-        """
-        Package agent for deployment.
-        Maintains compatibility with inferloop-agents structure.
-        """
+    def _write_raw_package(self, package_dir: str, agent_data: Dict) -> Dict[str, Any]:
+        """Copy an untranslated agent into its package and return its metadata"""
         
-        # Create package directory
-        package_dir = f"/tmp/agent-package-{agent.id}"
-        os.makedirs(package_dir, exist_ok=True)
+        with tracing.span('package_agent', agent=f"{agent_data['category']}-{agent_data['name']}",
+                          output_format='directory', raw=True):
+            writer = PackageWriter(package_dir, incremental=self.incremental, blob_store=self.blob_store)
+            self._collect_raw_package_files(writer, agent_data)
+            changes = writer.write()
+        
+        # Add package metadata
+        metadata = {
+            'agent_id': f"{agent_data['category']}-{agent_data['name']}",
+            'name': agent_data['name'],
+            'category': agent_data['category'],
+            'framework': 'original',
+            'created_at': datetime.now().isoformat(),
+            'package_path': package_dir
+        }
+        
+        return self._write_metadata(package_dir, metadata, changes)
+    
+    def _collect_package_files(self, writer: PackageWriter, agent: Any, agent_data: Optional[Dict]):
+        """Add every file of a built agent's package to writer"""
         
         # Create standard structure
-        dirs = ['src', 'tests', 'config', 'deployment', 'docs']
-        for dir_name in dirs:
-            os.makedirs(os.path.join(package_dir, dir_name), exist_ok=True)
+        for dir_name in ['src', 'tests', 'config', 'deployment', 'docs']:
+            writer.add_dir(dir_name)
+        
+        # Agent code
+        writer.add_text('src/agent.py', agent.compiled_code or str(agent.source_code))
         
-        # Write agent code
-        with open(os.path.join(package_dir, 'src', 'agent.py'), 'w') as f:
-            f.write(agent.compiled_code or agent.source_code)
+        # Serving entry point for agents that expose an ASGI app
+        deployment_config = agent.deployment_config or {}
+        if deployment_config.get('asgi_app'):
+            serving = (agent.configuration or {}).get('serving')
+            writer.add_text('src/server.py', generate_server(agent.id, deployment_config['asgi_app'], serving))
         
-        # Write requirements
-        with open(os.path.join(package_dir, 'requirements.txt'), 'w') as f:
-            f.write('\n'.join(agent.dependencies or []))
+        # Requirements, split into the framework base image and agent layers
+        python_version, base_requirements, agent_requirements, base_image = self._docker_layers(agent)
+        writer.add_text('requirements.txt', '\n'.join(agent.dependencies or []))
+        writer.add_text(dockerfile.BASE_REQUIREMENTS_FILE, '\n'.join(base_requirements))
+        writer.add_text(dockerfile.AGENT_REQUIREMENTS_FILE, '\n'.join(agent_requirements))
         
-        # Write configuration
-        with open(os.path.join(package_dir, 'config', 'agent_config.json'), 'w') as f:
-            json.dump(agent.configuration or {}, f, indent=2)
+        # Configuration
+        writer.add_text('config/agent_config.json', json.dumps(agent.configuration or {}, indent=2))
         
         # Copy original files if available
         if agent_data and 'path' in agent_data:
@@ -173,112 +546,140 @@ class AgentBuilder:
             # Copy tests if they exist
             test_path = os.path.join(original_path, 'tests')
             if os.path.exists(test_path):
-                shutil.copytree(test_path, os.path.join(package_dir, 'tests'), dirs_exist_ok=True)
+                writer.add_tree('tests', test_path)
             
             # Copy docs
-            doc_files = ['README.md', 'architecture.md', 'IMPLEMENTATION_GUIDE.md']
-            for doc in doc_files:
+            for doc in self.DOC_FILES:
                 doc_path = os.path.join(original_path, doc)
                 if os.path.exists(doc_path):
-                    shutil.copy(doc_path, os.path.join(package_dir, 'docs'))
+                    writer.add_file(os.path.join('docs', doc), doc_path)
         
         # Generate deployment files
-        deployment_config = agent.deployment_config or {}
         
         # Docker
-        dockerfile = deployment_config.get('dockerfile', self.generate_dockerfile(agent))
-        with open(os.path.join(package_dir, 'deployment', 'Dockerfile'), 'w') as f:
-            f.write(dockerfile)
+        writer.add_text('deployment/Dockerfile',
+                        deployment_config.get('dockerfile') or self.generate_dockerfile(agent))
+        writer.add_text('deployment/Dockerfile.base', dockerfile.generate_base_dockerfile(python_version))
         
         # Docker Compose
-        compose = deployment_config.get('compose', self.generate_compose(agent))
-        with open(os.path.join(package_dir, 'deployment', 'docker-compose.yml'), 'w') as f:
-            import yaml
-            yaml.dump(compose, f)
-        
-        # Create package metadata
-        metadata = {
-            'agent_id': agent.id,
-            'name': agent.name,
-            'framework': agent.framework,
-            'created_at': datetime.now().isoformat(),
-            'package_path': package_dir,
-            'files': os.listdir(package_dir)
-        }
+        import yaml
+        compose = deployment_config.get('compose') or self.generate_compose(agent)
+        writer.add_text('deployment/docker-compose.yml', yaml.dump(compose))
         
-        with open(os.path.join(package_dir, 'package.json'), 'w') as f:
-            json.dump(metadata, f, indent=2)
+        # How to build the two images
+        writer.add_text('README.md', dockerfile.generate_deployment_readme(agent.id, base_image))
+    
+    def _collect_raw_package_files(self, writer: PackageWriter, agent_data: Dict):
+        """Add every file of an untranslated agent's package to writer"""
         
-        return {
-            'success': True,
-            'package_path': package_dir,
-            'metadata': metadata,
-            'agent': agent
-        }
+        # Copy all files from original agent
+        if os.path.exists(agent_data['path']):
+            writer.add_tree('.', agent_data['path'])
     
-    async def package_raw_agent(self, agent_data: Dict) -> Dict[str, Any]:
+    def _write_metadata(self, package_dir: str, metadata: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Package agent without framework translation.
-        Used when framework adapter is not available.
+        Write package.json, unless an incremental rebuild changed nothing,
+        in which case the existing metadata is kept as is.
         """
+        metadata_path = os.path.join(package_dir, 'package.json')
         
-        package_dir = f"/tmp/agent-package-{agent_data['category']}-{agent_data['name']}"
-        os.makedirs(package_dir, exist_ok=True)
+        if self.incremental and not (changes['written'] or changes['removed']):
+            try:
+                with open(metadata_path, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
         
-        # Copy all files from original agent
-        if os.path.exists(agent_data['path']):
-            shutil.copytree(agent_data['path'], package_dir, dirs_exist_ok=True)
+        metadata['files'] = sorted(
+            name for name in os.listdir(package_dir)
+            if name not in ('package.json', MANIFEST_FILE, build_profiler.PROFILE_FILE, build_profiler.SUMMARY_FILE)
+        )
         
-        # Add package metadata
-        metadata = {
-            'agent_id': f"{agent_data['category']}-{agent_data['name']}",
-            'name': agent_data['name'],
-            'category': agent_data['category'],
-            'framework': 'original',
-            'created_at': datetime.now().isoformat(),
-            'package_path': package_dir
-        }
-        
-        with open(os.path.join(package_dir, 'package.json'), 'w') as f:
+        with open(metadata_path, 'w') as f:
             json.dump(metadata, f, indent=2)
         
-        return {
-            'success': True,
-            'package_path': package_dir,
-            'metadata': metadata,
-            'warning': 'Packaged without framework translation'
-        }
+        return metadata
+    
+    def _cache_key(self,
+                   agent_data: Dict,
+                   framework: str,
+                   adapter: Any,
+                   build_config: Dict,
+                   optimization: str) -> str:
+        """Compute the build cache key for an agent from inferloop-agents"""
+        adapter_version = getattr(adapter, 'version', None) or self.registry.get_framework(framework).version
+        
+        # Tests, docs and requirements end up in the package, so they are inputs too
+        original_path = agent_data['path']
+        extra_inputs = [os.path.join(original_path, 'tests'), os.path.join(original_path, 'requirements.txt')]
+        extra_inputs += [os.path.join(original_path, doc) for doc in self.DOC_FILES]
+        
+        return BuildCache.compute_key(
+            agent_data['source'].digest(),
+            build_config,
+            framework,
+            # Available versions decide the pins, so the resolver's snapshot counts
+            f"{type(adapter).__module__}.{type(adapter).__name__}:{adapter_version}:"
+            f"{adapter_code_version(type(adapter).__module__)}:{self.resolver.fingerprint()}",
+            optimization,
+            extra_inputs,
+            builder_version()
+        )
+    
+    def _docker_layers(self, agent: Any):
+        """
+        Python version, base image requirements, agent layer requirements
+        and base image tag for an agent's Docker image
+        """
+        python_version = (agent.configuration or {}).get('python_version', dockerfile.DEFAULT_PYTHON_VERSION)
+        base_requirements = (agent.metadata or {}).get('dependencies', {}).get('base', [])
+        agent_requirements = dockerfile.agent_requirements(agent.dependencies or [], base_requirements)
+        base_image = dockerfile.base_image_tag(agent.framework, base_requirements, python_version)
+        return python_version, base_requirements, agent_requirements, base_image
     
     def generate_dockerfile(self, agent: Any) -> str:
-        """Generate default Dockerfile"""
-        return f"""
-FROM python:3.10-slim
-
-WORKDIR /app
-
-# Install dependencies
-COPY requirements.txt .
-RUN pip install --no-cache-dir -r requirements.txt
-
-# Copy agent code
-COPY src/ ./src/
-COPY config/ ./config/
-
-# Set environment variables
-ENV AGENT_ID={agent.id}
-ENV AGENT_FRAMEWORK={agent.framework}
-
-# Run agent
-CMD ["python", "src/agent.py"]
-"""
+        """
+        Generate default Dockerfile: a thin agent layer on the shared
+        framework base image (deployment/Dockerfile.base)
+        """
+        python_version, _, agent_requirements, base_image = self._docker_layers(agent)
+        deployment_config = agent.deployment_config or {}
+        return dockerfile.generate_agent_dockerfile(
+            agent.id, agent.framework, base_image, agent_requirements,
+            entrypoint='src/server.py' if deployment_config.get('asgi_app') else 'src/agent.py',
+            python_version=python_version,
+            port=deployment_config.get('port', 8000)
+        )
     
     def generate_compose(self, agent: Any) -> Dict:
-        """Generate default docker-compose.yml"""
+        """
+        Generate default docker-compose.yml: a service building the shared
+        base image, and the agent service built on it
+        """
+        _, _, _, base_image = self._docker_layers(agent)
         return {
             'version': '3.8',
             'services': {
+                # Builds and tags the base image; its container exits at once
+                dockerfile.BASE_SERVICE: {
+                    'build': {
+                        'context': '..',
+                        'dockerfile': 'deployment/Dockerfile.base'
+                    },
+                    'image': base_image,
+                    'command': ['python', '-c', 'pass'],
+                    'restart': 'no'
+                },
                 agent.id: {
-                    'build': '.',
+                    # Compose file lives in deployment/, the build context is the package root
+                    'build': {
+                        'context': '..',
+                        'dockerfile': 'deployment/Dockerfile',
+                        'args': {'BASE_IMAGE': base_image}
+                    },
+                    'depends_on': {
+                        dockerfile.BASE_SERVICE: {'condition': 'service_completed_successfully'}
+                    },
                     'container_name': agent.id,
                     'ports': ['8000:8000'],
                     'environment': {
@@ -291,6 +692,41 @@ CMD ["python", "src/agent.py"]
         }
 
 
+# Modules generating package contents besides the adapter's code
+CODEGEN_MODULES = [__name__, PackageWriter.__module__, dockerfile.__name__, generate_server.__module__,
+                   DependencyResolver.__module__]
+
+
+@functools.lru_cache(maxsize=None)
+def builder_version() -> str:
+    """
+    Hash of the code generating Dockerfiles, servers and package layout, so
+    cached packages are rebuilt when that code changes
+    """
+    digest = hashlib.sha256()
+    for module_name in CODEGEN_MODULES:
+        with open(sys.modules[module_name].__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def adapter_code_version(module_name: str) -> str:
+    """
+    Hash of an adapter's package: the adapter module and the templates and
+    parsers next to it, which generate most of an agent's code. Cached
+    packages are rebuilt when any of them changes, version bump or not.
+    """
+    directory = os.path.dirname(sys.modules[module_name].__file__)
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.py'):
+            digest.update(name.encode('utf-8'))
+            with open(os.path.join(directory, name), 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
 # Convenience functions
 
 async def build_agent(agent_path: str, framework: str, **kwargs):
@@ -303,6 +739,9 @@ async def build_agent(agent_path: str, framework: str, **kwargs):
         
         # From source code
         agent = await build_agent(source_code, 'crewai')
+        
+        # Profiled: writes build.prof and build-profile.json next to package.json
+        agent = await build_agent('finance/fraud_detection', 'langchain', profile=True)
     """
     builder = AgentBuilder()
     return await builder.build(agent_path, framework, **kwargs)
@@ -314,6 +753,9 @@ async def build_from_repo(category: str, name: str, framework: str, **kwargs):
     
     Example:
         agent = await build_from_repo('finance', 'fraud_detection', 'langchain')
+        
+        # Profiled, see AgentBuilder.build
+        agent = await build_from_repo('finance', 'fraud_detection', 'langchain', profile=True)
     """
     builder = AgentBuilder()
     return await builder.build_from_repo(category, name, framework, **kwargs)
\ No newline at end of file
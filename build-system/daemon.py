@@ -0,0 +1,463 @@
+"""
+Build Daemon for AgentForge
+Resident build server on a Unix socket, and a client that falls back to in-process builds
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+import tempfile
+import contextvars
+from typing import Dict, Any, Optional, List, Callable
+
+from framework_abstractions import tracing, user_dirs
+
+
+def default_socket() -> str:
+    """
+    $AGENTFORGE_SOCKET, else daemon.sock in a per-user directory: under
+    $XDG_RUNTIME_DIR, or /tmp/agentforge-<uid> (created 0700) without it
+    """
+    if os.environ.get('AGENTFORGE_SOCKET'):
+        return os.environ['AGENTFORGE_SOCKET']
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], 'agentforge', 'daemon.sock')
+    return os.path.join(tempfile.gettempdir(), f"agentforge-{os.getuid()}", 'daemon.sock')
+
+
+DEFAULT_SOCKET = default_socket()
+
+# Build requests carry raw agent sources on one line
+STREAM_LIMIT = 64 * 1024 * 1024
+
+_progress: contextvars.ContextVar = contextvars.ContextVar('agentforge_progress', default=None)
+
+
+class ProgressTracer(tracing.RecordingTracer):
+    """
+    Tracer that hands each finished span to the progress callback of the
+    build it belongs to, instead of keeping it. Spans run in executor
+    threads find the callback through the copied context.
+    """
+
+    def _finish(self, span: tracing.Span):
+        callback = _progress.get()
+        if callback is not None:
+            callback(_progress_event(span))
+
+
+class BuildDaemon:
+    """
+    Long-lived AgentBuilder behind a Unix socket.
+
+    Adapters are imported once at startup, the catalog stays loaded (and is
+    only rescanned when the agents repository changes), and recent builds
+    are answered from a MemoryBuildCache without touching the disk index.
+
+    Protocol: the client sends one JSON line, {"op": "build" | "ping" |
+    "stats" | "shutdown", ...}, and reads JSON lines back until the
+    connection closes. A build streams {"event": "progress"} lines as
+    pipeline stages finish, then one {"event": "result"} or
+    {"event": "error"} line.
+
+    Example:
+        python -m build_system.daemon serve
+        python -m build_system.daemon build finance/fraud_detection langchain
+    """
+
+    def __init__(self,
+                 socket_path: str = DEFAULT_SOCKET,
+                 frameworks: Optional[List[str]] = None,
+                 cache_dir: Optional[str] = None):
+        self.socket_path = socket_path
+        self.frameworks = frameworks
+        self.cache_dir = cache_dir
+        self.builder = None
+        self.adapters: Dict[str, bool] = {}
+        self.builds = 0
+        self.failures = 0
+        self.started_at = None
+        self._server = None
+        self._stopped = None
+        self._previous_tracer = None
+
+    async def start(self):
+        """Warm up adapters and the catalog, then listen on socket_path"""
+        # The client only needs this module; the builder stack loads here
+        from framework_registry import FrameworkRegistry
+        from build_system.builder import AgentBuilder
+        from build_system.build_cache import MemoryBuildCache, DEFAULT_CACHE_DIR
+
+        # Builds write wherever the request says: local user only. Nobody
+        # else may create or replace the socket in its directory.
+        user_dirs.private_dir(os.path.dirname(self.socket_path) or '.')
+        if _daemon_running(self.socket_path):
+            raise RuntimeError(f"A build daemon is already listening on {self.socket_path}")
+        if os.path.lexists(self.socket_path):
+            # Left behind by a daemon that did not shut down cleanly
+            os.unlink(self.socket_path)
+
+        loop = asyncio.get_running_loop()
+        self.adapters = await loop.run_in_executor(None, FrameworkRegistry.warmup, self.frameworks)
+        await loop.run_in_executor(None, FrameworkRegistry.get_catalog().load)
+        self.builder = AgentBuilder(build_cache=MemoryBuildCache(self.cache_dir or DEFAULT_CACHE_DIR))
+
+        self._previous_tracer = tracing.set_tracer(ProgressTracer())
+        self._stopped = asyncio.Event()
+        # Bound under umask 177, so the socket is 0600 from the moment it exists
+        umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle, self.socket_path, limit=STREAM_LIMIT)
+        finally:
+            os.umask(umask)
+        self.started_at = time.time()
+
+        available = [name for name, loaded in self.adapters.items() if loaded]
+        print(f"Build daemon listening on {self.socket_path} (adapters: {', '.join(available) or 'none'})")
+
+    async def serve_forever(self):
+        """Start, serve until a shutdown request or SIGTERM/SIGINT, then clean up"""
+        await self.start()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Not the main thread, or no signal support on this platform
+                pass
+
+        try:
+            await self._stopped.wait()
+        finally:
+            await self.close()
+
+    def stop(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            tracing.set_tracer(self._previous_tracer)
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            print("Build daemon stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.time() - self.started_at, 3),
+            'adapters': self.adapters,
+            'builds': self.builds,
+            'failures': self.failures,
+            'cache': self.builder.build_cache.stats()
+        }
+
+    # Private helper methods
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                request = json.loads(await reader.readline())
+            except ValueError as e:
+                await _send(writer, {'event': 'error', 'error': f"Invalid request: {e}", 'type': 'ValueError'})
+                return
+
+            op = request.get('op')
+            if op == 'build':
+                await self._build(request, writer)
+            elif op == 'ping':
+                await _send(writer, {'event': 'pong', 'pid': os.getpid()})
+            elif op == 'stats':
+                await _send(writer, dict(self.stats(), event='stats'))
+            elif op == 'shutdown':
+                await _send(writer, {'event': 'stopping'})
+                self.stop()
+            else:
+                await _send(writer, {
+                    'event': 'error',
+                    'error': f"Operation {op} not supported. Available: ['build', 'ping', 'stats', 'shutdown']",
+                    'type': 'ValueError'
+                })
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # Client went away; a build it started still finishes and is cached
+            pass
+        finally:
+            writer.close()
+
+    async def _build(self, request: Dict[str, Any], writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        # A CLI build rescans a changed repository on startup; do the same per request
+        from framework_registry import FrameworkRegistry
+        await loop.run_in_executor(None, FrameworkRegistry.get_catalog().refresh_if_stale)
+
+        # Progress may come from executor threads; call_soon_threadsafe keeps
+        # it ordered before the build's own completion
+        token = _progress.set(lambda event: loop.call_soon_threadsafe(events.put_nowait, event))
+        try:
+            task = asyncio.ensure_future(self.builder.build(
+                request['agent_source'],
+                request['framework'],
+                request.get('optimization') or 'balanced',
+                request.get('config'),
+                bool(request.get('profile')),
+                **request.get('package_options', {})
+            ))
+        finally:
+            _progress.reset(token)
+        task.add_done_callback(lambda _: events.put_nowait(None))
+        self.builds += 1
+
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                await _send(writer, event)
+        except ConnectionError:
+            # Keep the build's outcome from being reported as never retrieved
+            task.add_done_callback(lambda finished: finished.cancelled() or finished.exception())
+            raise
+
+        try:
+            package = task.result()
+        except Exception as e:
+            self.failures += 1
+            await _send(writer, {'event': 'error', 'error': str(e), 'type': type(e).__name__})
+            return
+        await _send(writer, {'event': 'result', 'result': _result(package)})
+
+
+class BuildClient:
+    """
+    Sends builds to a running BuildDaemon, or builds in this process when
+    none is listening (with fallback=True), so callers need not care which.
+
+    Example:
+        client = BuildClient()
+        package = await client.build('finance/fraud_detection', 'langchain',
+                                     on_progress=lambda event: print(event['stage']))
+        print(package['package_path'], package['daemon'])
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, fallback: bool = True):
+        self.socket_path = socket_path
+        self.fallback = fallback
+
+    async def build(self,
+                    agent_source: str,
+                    framework: str,
+                    optimization: str = 'balanced',
+                    config: Optional[Dict] = None,
+                    profile: bool = False,
+                    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                    **package_options) -> Dict[str, Any]:
+        """
+        Build an agent as AgentBuilder.build would.
+
+        Args:
+            on_progress: Called with each {'event': 'progress', 'stage',
+                'duration_ms', 'status', 'attributes'} as stages finish
+            package_options: As for AgentBuilder.build; an archive 'output'
+                must be a path
+
+        Returns:
+            The package with 'agent' summarized as {'id', 'name',
+            'framework'}, and 'daemon' telling whether the daemon built it
+        """
+        request = {
+            'op': 'build',
+            'agent_source': agent_source,
+            'framework': framework,
+            'optimization': optimization,
+            'config': config,
+            'profile': profile,
+            'package_options': package_options
+        }
+
+        connection = await self._connect()
+        if connection is None:
+            return await _build_in_process(request, on_progress)
+
+        reader, writer = connection
+        try:
+            await _send(writer, request)
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError(f"Build daemon on {self.socket_path} closed the connection")
+                event = json.loads(line)
+                if event['event'] == 'progress':
+                    if on_progress is not None:
+                        on_progress(event)
+                elif event['event'] == 'result':
+                    return dict(event['result'], daemon=True)
+                else:
+                    _raise(event)
+        finally:
+            writer.close()
+
+    async def ping(self) -> bool:
+        """Whether a daemon is listening"""
+        try:
+            return (await self._request({'op': 'ping'}))['event'] == 'pong'
+        except (FileNotFoundError, ConnectionRefusedError, PermissionError):
+            return False
+
+    async def stats(self) -> Dict[str, Any]:
+        """Daemon uptime, build counts and cache stats"""
+        return await self._request({'op': 'stats'})
+
+    async def shutdown(self):
+        await self._request({'op': 'shutdown'})
+
+    # Private helper methods
+
+    async def _connect(self):
+        try:
+            return await self._open()
+        except (FileNotFoundError, ConnectionRefusedError, PermissionError) as e:
+            if not self.fallback:
+                raise
+            if isinstance(e, PermissionError):
+                print(f"Warning: {e}; building in process")
+            return None
+
+    async def _open(self):
+        # Requests carry sources and output paths: only to our own daemon
+        owner = os.stat(self.socket_path).st_uid
+        if owner != os.getuid():
+            raise PermissionError(f"{self.socket_path} belongs to uid {owner}, not to this user")
+        return await asyncio.open_unix_connection(self.socket_path, limit=STREAM_LIMIT)
+
+    async def _request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        reader, writer = await self._open()
+        try:
+            await _send(writer, request)
+            event = json.loads(await reader.readline())
+        finally:
+            writer.close()
+        if event['event'] == 'error':
+            _raise(event)
+        return event
+
+
+# Private helper functions
+
+async def _send(writer: asyncio.StreamWriter, message: Dict[str, Any]):
+    writer.write(json.dumps(message, default=str).encode('utf-8') + b'\n')
+    await writer.drain()
+
+
+def _raise(event: Dict[str, Any]):
+    error = ValueError if event.get('type') == 'ValueError' else RuntimeError
+    raise error(event['error'])
+
+
+def _progress_event(span: tracing.Span) -> Dict[str, Any]:
+    return {
+        'event': 'progress',
+        'stage': span.name,
+        'duration_ms': round(span.duration_ns / 1e6, 3),
+        'status': span.status,
+        'attributes': dict(span.attributes)
+    }
+
+
+def _result(package: Dict[str, Any]) -> Dict[str, Any]:
+    """A build result as JSON: the agent object replaced by a summary"""
+    result = {key: value for key, value in package.items() if key != 'agent'}
+    agent = package.get('agent')
+    if agent is not None:
+        result['agent'] = {'id': agent.id, 'name': agent.name, 'framework': agent.framework}
+    return json.loads(json.dumps(result, default=str))
+
+
+async def _build_in_process(request: Dict[str, Any], on_progress: Optional[Callable]) -> Dict[str, Any]:
+    """The client's fallback: the same build and result shape, in this process"""
+    from build_system.builder import AgentBuilder
+
+    previous = None
+    if on_progress is not None and not tracing.get_tracer().enabled:
+        previous = tracing.set_tracer(ProgressTracer())
+    token = _progress.set(on_progress)
+    try:
+        package = await AgentBuilder().build(
+            request['agent_source'], request['framework'], request['optimization'], request['config'],
+            request['profile'], **request['package_options']
+        )
+    finally:
+        _progress.reset(token)
+        if previous is not None:
+            tracing.set_tracer(previous)
+    return dict(_result(package), daemon=False)
+
+
+def _daemon_running(socket_path: str) -> bool:
+    """Whether something accepts connections on socket_path"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Resident AgentForge build server and client')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET,
+                        help='Unix socket (default: $AGENTFORGE_SOCKET, else in a per-user runtime directory)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='Run the build daemon in the foreground')
+    serve.add_argument('--frameworks', nargs='+', default=None, help='Adapters to warm up (default: all)')
+    serve.add_argument('--cache-dir', default=None)
+
+    build = commands.add_parser('build', help='Build through the daemon, or in-process if none is running')
+    build.add_argument('agent_source', help="Agent in inferloop-agents, e.g. 'finance/fraud_detection'")
+    build.add_argument('framework')
+    build.add_argument('--optimization', default='balanced')
+    build.add_argument('--profile', action='store_true')
+    build.add_argument('--no-fallback', action='store_true', help='Fail if no daemon is running')
+
+    commands.add_parser('stats', help="Show the daemon's build and cache stats")
+    commands.add_parser('stop', help='Shut the daemon down')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        asyncio.run(BuildDaemon(args.socket, args.frameworks, args.cache_dir).serve_forever())
+        return
+
+    client = BuildClient(args.socket, fallback=not getattr(args, 'no_fallback', False))
+    if args.command == 'build':
+        def progress(event):
+            print(f"  {event['stage']}: {event['duration_ms']:.1f}ms", file=sys.stderr)
+        result = asyncio.run(client.build(
+            args.agent_source, args.framework, args.optimization, profile=args.profile, on_progress=progress
+        ))
+    elif args.command == 'stats':
+        result = asyncio.run(client.stats())
+    else:
+        asyncio.run(client.shutdown())
+        return
+
+    json.dump(result, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+"""
+Dependency Resolver for AgentForge
+Offline merging, conflict detection and pinning of agent requirements
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Any, Optional, List, Set, Iterable
+from dataclasses import dataclass, field, asdict
+
+from packaging.requirements import Requirement, InvalidRequirement
+from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name, parse_wheel_filename, parse_sdist_filename
+from packaging.version import Version, InvalidVersion
+
+from framework_abstractions import user_dirs
+
+
+DEFAULT_CACHE_DIR = os.path.join(user_dirs.CACHE_ROOT, 'resolutions')
+
+# Part of every memo key: bump when resolution logic changes
+RESOLVER_VERSION = 3
+
+# pip options that include another file, which is not packaged with the agent
+FILE_OPTIONS = ('-r', '--requirement', '-c', '--constraint')
+
+
+class DependencyConflictError(ValueError):
+    """Raised when requirement sets cannot be satisfied together"""
+
+    def __init__(self, conflicts: List[str]):
+        self.conflicts = conflicts
+        super().__init__("Incompatible requirements: " + '; '.join(conflicts))
+
+
+@dataclass
+class Resolution:
+    """Result of resolving one or more requirement sets"""
+    requirements: List[str]
+    pins: Dict[str, str] = field(default_factory=dict)
+    conflicts: List[str] = field(default_factory=list)
+    unresolved: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    digest: str = ''
+
+
+class DependencyResolver:
+    """
+    Merges requirement sets (e.g. an agent's requirements.txt and its
+    framework adapter's dependencies) without touching the network.
+
+    Specifiers for the same project are intersected and checked for
+    satisfiability. If a local wheelhouse directory or an index snapshot
+    (JSON mapping project -> list of versions) is given, every project found
+    there is pinned to the newest version allowed. Only the requirements
+    given are resolved; transitive dependencies are left to pip, as are
+    pip options (-e, --index-url, ...) and lines that are not PEP 508
+    requirements (e.g. bare VCS URLs), which are kept as they are.
+
+    Resolutions are memoized by a hash of the requirement set, in memory
+    and on disk, so identical sets across a catalog resolve once.
+    """
+
+    def __init__(self,
+                 wheelhouse: Optional[str] = None,
+                 index_snapshot: Optional[str] = None,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 allow_prereleases: bool = False):
+        self.wheelhouse = wheelhouse
+        self.index_snapshot = index_snapshot
+        self.cache_dir = cache_dir
+        self.allow_prereleases = allow_prereleases
+        self._candidates: Optional[Dict[str, Set[Version]]] = None
+        self._fingerprint: Optional[str] = None
+        self._memo: Dict[str, Resolution] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, *requirement_sets: Iterable[str], strict: bool = False) -> Resolution:
+        """
+        Merge and pin requirement sets.
+
+        Args:
+            requirement_sets: Requirement lines (requirements.txt syntax;
+                comments and blank lines are ignored)
+            strict: Raise DependencyConflictError on conflicts
+
+        Returns:
+            The Resolution: pip options first, then merged requirements
+            sorted by project, then lines passed to pip unresolved (also
+            listed in 'unresolved'). Including another requirements file
+            (-r, -c) is a conflict, as that file is not packaged.
+        """
+        lines = sorted({line for requirements in requirement_sets for line in _clean_lines(requirements)})
+        key = hashlib.sha256(json.dumps([RESOLVER_VERSION, self.fingerprint(), lines]).encode()).hexdigest()
+
+        resolution = self._memo.get(key) or self._load(key)
+        if resolution is None:
+            resolution = self._resolve(lines)
+            self._store(key, resolution)
+
+        if strict and resolution.conflicts:
+            raise DependencyConflictError(resolution.conflicts)
+        return resolution
+
+    def fingerprint(self) -> str:
+        """Hash of the available versions; part of every resolution key"""
+        if self._fingerprint is None:
+            candidates = self._get_candidates()
+            snapshot = {name: sorted(str(v) for v in versions) for name, versions in candidates.items()}
+            self._fingerprint = hashlib.sha256(
+                json.dumps([snapshot, self.allow_prereleases], sort_keys=True).encode()
+            ).hexdigest()
+        return self._fingerprint
+
+    # Private helper methods
+
+    def _resolve(self, lines: List[str]) -> Resolution:
+        merged: Dict[tuple, Dict[str, Any]] = {}
+        options, passthrough, conflicts, warnings = [], [], [], []
+
+        for line in lines:
+            if line.startswith('-'):
+                if _option_name(line) in FILE_OPTIONS:
+                    conflicts.append(f"{line!r} includes a file that is not packaged; list its requirements instead")
+                else:
+                    options.append(line)
+                continue
+
+            try:
+                requirement = Requirement(line)
+            except InvalidRequirement as e:
+                # Still valid for pip (e.g. a bare VCS URL): pass it on as written
+                warnings.append(f"Passing {line!r} to pip unresolved: {e}")
+                passthrough.append(line)
+                continue
+
+            key = (canonicalize_name(requirement.name), str(requirement.marker or ''))
+            entry = merged.setdefault(key, {
+                'name': requirement.name,
+                'extras': set(),
+                'specifier': SpecifierSet(),
+                'url': None,
+                'marker': requirement.marker,
+                'sources': []
+            })
+            entry['extras'] |= requirement.extras
+            entry['specifier'] &= requirement.specifier
+            entry['sources'].append(line)
+
+            if requirement.url:
+                if entry['url'] and entry['url'] != requirement.url:
+                    entry['conflict'] = f"{requirement.name}: different URLs in {entry['sources']}"
+                entry['url'] = requirement.url
+
+        candidates = self._get_candidates()
+        resolution = Resolution(requirements=list(options), conflicts=conflicts, warnings=warnings)
+
+        for (name, _), entry in sorted(merged.items()):
+            if entry.get('conflict'):
+                resolution.conflicts.append(entry['conflict'])
+                continue
+
+            specifier = entry['specifier']
+            pin = None
+
+            if not entry['url'] and name in candidates:
+                allowed = list(specifier.filter(candidates[name], prereleases=self.allow_prereleases))
+                if not allowed:
+                    resolution.conflicts.append(
+                        f"{entry['name']}: no available version satisfies {entry['sources']}"
+                    )
+                    continue
+                pin = max(allowed)
+                resolution.pins[name] = str(pin)
+            elif not entry['url']:
+                if not _satisfiable(specifier):
+                    resolution.conflicts.append(f"{entry['name']}: {entry['sources']} cannot all be satisfied")
+                    continue
+                if candidates:
+                    resolution.unresolved.append(entry['name'])
+
+            resolution.requirements.append(_format(entry, pin))
+
+        resolution.requirements.extend(passthrough)
+        # Installed as given, unpinned
+        resolution.unresolved.extend(line for line in options if _option_name(line) in ('-e', '--editable'))
+        resolution.unresolved.extend(passthrough)
+        resolution.digest = hashlib.sha256('\n'.join(resolution.requirements).encode()).hexdigest()
+        return resolution
+
+    def _get_candidates(self) -> Dict[str, Set[Version]]:
+        """Available versions per project from the wheelhouse and snapshot"""
+        if self._candidates is not None:
+            return self._candidates
+
+        candidates: Dict[str, Set[Version]] = {}
+
+        if self.wheelhouse and os.path.isdir(self.wheelhouse):
+            for filename in os.listdir(self.wheelhouse):
+                try:
+                    if filename.endswith('.whl'):
+                        name, version, _, _ = parse_wheel_filename(filename)
+                    elif filename.endswith(('.tar.gz', '.zip')):
+                        name, version = parse_sdist_filename(filename)
+                    else:
+                        continue
+                except ValueError:
+                    continue
+                candidates.setdefault(name, set()).add(version)
+
+        if self.index_snapshot:
+            with open(self.index_snapshot, 'r') as f:
+                for name, versions in json.load(f).items():
+                    for version in versions:
+                        try:
+                            candidates.setdefault(canonicalize_name(name), set()).add(Version(version))
+                        except InvalidVersion:
+                            continue
+
+        self._candidates = candidates
+        return candidates
+
+    def _load(self, key: str) -> Optional[Resolution]:
+        if not self.cache_dir:
+            return None
+        try:
+            user_dirs.private_dir(self.cache_dir)
+            with open(os.path.join(self.cache_dir, f"{key}.json"), 'r') as f:
+                resolution = Resolution(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        with self._lock:
+            self._memo[key] = resolution
+        return resolution
+
+    def _store(self, key: str, resolution: Resolution):
+        with self._lock:
+            self._memo[key] = resolution
+
+        if not self.cache_dir:
+            return
+        try:
+            user_dirs.private_dir(self.cache_dir)
+            path = os.path.join(self.cache_dir, f"{key}.json")
+            with open(f"{path}.{os.getpid()}.tmp", 'w') as f:
+                json.dump(asdict(resolution), f)
+            os.replace(f"{path}.{os.getpid()}.tmp", path)
+        except OSError as e:
+            print(f"Warning: Could not persist dependency resolution: {e}")
+
+
+def _clean_lines(requirements: Iterable[str]) -> List[str]:
+    """Requirement and pip option lines without comments or blanks"""
+    lines = []
+    for line in requirements or []:
+        line = line.split(' #', 1)[0].strip()
+        if line and not line.startswith('#'):
+            lines.append(line)
+    return lines
+
+
+def _option_name(line: str) -> str:
+    """'-r' for '-r base.txt' or '-rbase.txt', '--index-url' for '--index-url=...'"""
+    option = line.split(None, 1)[0]
+    if option.startswith('--'):
+        return option.split('=', 1)[0]
+    return option[:2]
+
+
+def _satisfiable(specifier: SpecifierSet) -> bool:
+    """
+    Whether any version can satisfy specifier, without knowing which
+    versions exist: probe the lowest version, every version the specifier
+    mentions, and a version just below and just above each one. Upper
+    bounds alone ('<2') are satisfied by the probes below them.
+    """
+    if not specifier:
+        return True
+
+    probes = [Version('0')]
+    for spec in specifier:
+        try:
+            version = Version(spec.version.rstrip('.*'))
+        except InvalidVersion:
+            # Arbitrary equality (===) and the like: assume satisfiable
+            return True
+        probes.append(version)
+        probes.append(Version('.'.join(str(part) for part in version.release + (0, 0, 1))))
+        below = _just_below(version.release)
+        if below is not None:
+            probes.append(below)
+
+    return any(specifier.contains(probe, prereleases=True) for probe in probes)
+
+
+def _just_below(release: tuple) -> Optional[Version]:
+    """A release just under release (1.5 -> 1.4.999999), or None for 0"""
+    for index in range(len(release) - 1, -1, -1):
+        if release[index] > 0:
+            lower = release[:index] + (release[index] - 1, 999999)
+            return Version('.'.join(str(part) for part in lower))
+    return None
+
+
+def _format(entry: Dict[str, Any], pin: Optional[Version]) -> str:
+    requirement = entry['name']
+    if entry['extras']:
+        requirement += f"[{','.join(sorted(entry['extras']))}]"
+
+    if entry['url']:
+        requirement += f" @ {entry['url']}"
+    elif pin is not None:
+        requirement += f"=={pin}"
+    else:
+        requirement += str(entry['specifier'])
+
+    if entry['marker']:
+        requirement += f"; {entry['marker']}"
+    return requirement
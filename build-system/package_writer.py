@@ -0,0 +1,240 @@
+"""
+Package Writer for AgentForge
+Writes agent package trees, incrementally when possible
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import contextlib
+from typing import Dict, Any, Optional, List
+from dataclasses import dataclass
+
+from build_system.archive import write_archive, DEFAULT_ARCHIVE_FORMAT
+from framework_abstractions import tracing
+
+
+MANIFEST_FILE = '.agentforge-manifest.json'
+
+
+@dataclass
+class PackageFile:
+    """A file in a package: generated content or a copy of an existing file"""
+    path: str
+    data: Optional[bytes] = None
+    source_path: Optional[str] = None
+
+    def digest(self) -> str:
+        """SHA-256 of the file content"""
+        if self.data is not None:
+            return hashlib.sha256(self.data).hexdigest()
+        return file_digest(self.source_path)
+
+    def size(self) -> int:
+        if self.data is not None:
+            return len(self.data)
+        return os.path.getsize(self.source_path)
+
+
+class PackageWriter:
+    """
+    Collects the files of a package and writes them to a directory, or
+    streams them into an archive.
+
+    A manifest of content hashes is kept inside the package. In incremental
+    mode only files whose content changed are written or copied, and
+    unchanged files keep their mtimes so Docker layer caches stay valid.
+    Either way, files from a previous build that are no longer part of the
+    package are removed.
+
+    With a blob store, file contents are stored there once and linked into
+    the package instead of being written per package.
+    """
+
+    def __init__(self,
+                 package_dir: Optional[str] = None,
+                 incremental: bool = True,
+                 blob_store: Optional[Any] = None):
+        self.package_dir = package_dir
+        self.incremental = incremental
+        self.blob_store = blob_store
+        self.files: Dict[str, PackageFile] = {}
+        self.dirs: List[str] = []
+
+    def add_dir(self, path: str):
+        """Make sure a (possibly empty) directory exists in the package"""
+        self.dirs.append(path)
+
+    def add_text(self, path: str, text: str):
+        """Add a generated text file"""
+        self.add_bytes(path, text.encode('utf-8'))
+
+    def add_bytes(self, path: str, data: bytes):
+        """Add a generated file"""
+        self.files[path] = PackageFile(path, data=data)
+
+    def add_file(self, path: str, source_path: str):
+        """Add a copy of an existing file"""
+        self.files[path] = PackageFile(path, source_path=source_path)
+
+    def add_tree(self, path: str, source_dir: str):
+        """Add copies of every file under an existing directory"""
+        for root, dirs, files in os.walk(source_dir):
+            dirs.sort()
+            rel_root = os.path.relpath(root, source_dir)
+            for name in sorted(files):
+                rel_path = os.path.normpath(os.path.join(path, rel_root, name))
+                self.add_file(rel_path, os.path.join(root, name))
+
+    def write(self) -> Dict[str, Any]:
+        """
+        Write the package.
+
+        Returns:
+            Lists of 'written', 'unchanged' and 'removed' package paths
+        """
+        with tracing.span('package.write', package_dir=self.package_dir) as span:
+            os.makedirs(self.package_dir, exist_ok=True)
+            for path in self.dirs:
+                os.makedirs(os.path.join(self.package_dir, path), exist_ok=True)
+
+            # Read even when not incremental: its files are removed if dropped
+            previous = self._load_manifest()
+            manifest = {}
+            changes = {'written': [], 'unchanged': [], 'removed': []}
+
+            # Where the store cannot share storage with the package, linking
+            # would only add a copy of every file: write directly instead
+            blob_store = self.blob_store
+            if blob_store is not None and not blob_store.shares_storage(self.package_dir):
+                blob_store.remove_reference(self.package_dir)
+                blob_store = None
+
+            # Blobs are stored and linked under the store's lock, so gc cannot
+            # delete one in between
+            blobs = blob_store.writing() if blob_store is not None else contextlib.nullcontext()
+            with blobs:
+                self._write_files(previous, manifest, changes, span, blob_store)
+
+            # Files written by an earlier build that are no longer in the package
+            for path in sorted(set(previous) - set(manifest)):
+                try:
+                    os.remove(os.path.join(self.package_dir, path))
+                except FileNotFoundError:
+                    pass
+                self._prune_empty_dirs(os.path.dirname(path))
+                changes['removed'].append(path)
+
+            # Always describes exactly what this write left in the package, so
+            # a later incremental write never trusts hashes it did not write
+            if changes['written'] or changes['removed'] or not previous:
+                self._save_manifest(manifest)
+
+            if blob_store is not None:
+                blob_store.add_reference(self.package_dir, (entry['sha256'] for entry in manifest.values()))
+
+            span.set_attribute('files_unchanged', len(changes['unchanged']))
+            span.set_attribute('files_removed', len(changes['removed']))
+
+            return changes
+
+    def write_archive(self, output: Any, archive_format: str = DEFAULT_ARCHIVE_FORMAT) -> Dict[str, Any]:
+        """
+        Stream the package into an archive (see archive.write_archive).
+        Nothing is staged on disk and package_dir is not used.
+        """
+        with tracing.span('package.write_archive', archive_format=archive_format) as span:
+            stats = write_archive(list(self.files.values()), self.dirs, output, archive_format)
+            span.add('files_written', stats['files'])
+            span.add('bytes_written', stats['bytes'])
+            return stats
+
+    # Private helper methods
+
+    def _write_files(self,
+                     previous: Dict[str, Dict[str, Any]],
+                     manifest: Dict[str, Dict[str, Any]],
+                     changes: Dict[str, List[str]],
+                     span: Any,
+                     blob_store: Optional[Any] = None):
+        """Write every file not already current, recording each in manifest and changes"""
+        for path in sorted(self.files):
+            package_file = self.files[path]
+            digest = package_file.digest()
+            target = os.path.join(self.package_dir, path)
+
+            if self.incremental and self._is_current(previous.get(path), digest, target):
+                manifest[path] = previous[path]
+                changes['unchanged'].append(path)
+                continue
+
+            self._write_file(package_file, target, digest, blob_store)
+            stat = os.stat(target)
+            span.add('files_written')
+            span.add('bytes_written', stat.st_size)
+            manifest[path] = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            changes['written'].append(path)
+
+    def _is_current(self, entry: Optional[Dict[str, Any]], digest: str, target: str) -> bool:
+        """Whether target still holds exactly what the manifest says it does"""
+        if not entry or entry['sha256'] != digest:
+            return False
+
+        # Catch files edited or deleted in the package since the last build
+        try:
+            stat = os.stat(target)
+        except OSError:
+            return False
+        return stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']
+
+    def _write_file(self, package_file: PackageFile, target: str, digest: str, blob_store: Optional[Any] = None):
+        """Replace target atomically with the file's content"""
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+
+        if blob_store is not None:
+            if package_file.data is not None:
+                blob_store.put_bytes(package_file.data, digest)
+            else:
+                blob_store.put_file(package_file.source_path, digest)
+            blob_store.link(digest, tmp_path)
+        elif package_file.data is not None:
+            with open(tmp_path, 'wb') as f:
+                f.write(package_file.data)
+        else:
+            shutil.copyfile(package_file.source_path, tmp_path)
+
+        os.replace(tmp_path, target)
+
+    def _prune_empty_dirs(self, path: str):
+        """Remove now-empty directories left behind by removed files"""
+        keep = {os.path.normpath(d) for d in self.dirs}
+        while path and path not in keep:
+            try:
+                os.rmdir(os.path.join(self.package_dir, path))
+            except OSError:
+                return
+            path = os.path.dirname(path)
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.package_dir, MANIFEST_FILE), 'r') as f:
+                return json.load(f).get('files', {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, Dict[str, Any]]):
+        manifest_path = os.path.join(self.package_dir, MANIFEST_FILE)
+        with open(f"{manifest_path}.tmp", 'w') as f:
+            json.dump({'files': manifest}, f, indent=2, sort_keys=True)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,264 @@
+"""
+Serving Entry Point Template for AgentForge
+Generates src/server.py, which serves a packaged agent's ASGI app
+"""
+
+import json
+from typing import Dict, Any, Optional
+
+
+# Defaults baked into src/server.py; each can be overridden at run time
+# with an AGENT_<NAME> environment variable (e.g. AGENT_WORKERS=4)
+SERVING_DEFAULTS = {
+    'workers': 1,
+    'max_concurrency': 32,
+    'max_queue': 64,
+    'queue_timeout': 10.0,
+    'keep_alive': 75,
+    'drain_seconds': 5.0,
+    'graceful_timeout': 30.0,
+    'backlog': 2048
+}
+
+
+def generate_server(agent_id: str, asgi_app: str = 'agent:app', serving: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Generate the serving entry point of a package.
+
+    Args:
+        agent_id: Agent ID, for the module docstring
+        asgi_app: The agent's ASGI app as 'module:attribute', module
+            relative to src/
+        serving: Overrides of SERVING_DEFAULTS (usually the 'serving' dict
+            of the agent configuration)
+    """
+    module, attribute = asgi_app.split(':')
+    defaults = dict(SERVING_DEFAULTS, **{k: v for k, v in (serving or {}).items() if k in SERVING_DEFAULTS})
+    return (SERVER_TEMPLATE
+            .replace('{agent_id}', agent_id)
+            .replace('{module}', module)
+            .replace('{attribute}', attribute)
+            .replace('{defaults}', json.dumps(defaults, indent=4, sort_keys=True)))
+
+
+SERVER_TEMPLATE = '''"""
+Serving entry point for {agent_id}
+Generated by AgentForge: serves the agent's ASGI app with admission control
+
+Endpoints besides the agent's own:
+    GET /healthz  liveness, 200 while the process is up
+    GET /readyz   readiness, 503 until started and once draining
+
+Set AGENT_<OPTION> environment variables (AGENT_WORKERS, AGENT_MAX_QUEUE,
+...) to override the defaults below, and OPENAI_API_BASE to point the agent
+at another OpenAI-compatible endpoint, such as a local stub LLM.
+"""
+
+import os
+import json
+import signal
+import asyncio
+import threading
+import multiprocessing
+
+import uvicorn
+
+from {module} import {attribute} as agent_app
+
+
+DEFAULTS = {defaults}
+
+
+def option(name):
+    value = os.environ.get(f"AGENT_{name.upper()}")
+    if value is None:
+        return DEFAULTS[name]
+    return type(DEFAULTS[name])(value)
+
+
+class AdmissionControl:
+    """
+    ASGI middleware bounding the work in flight.
+
+    At most max_concurrency requests run at once; up to max_queue more wait
+    (for at most queue_timeout seconds) and anything beyond is shed at once
+    with 503 and Retry-After, so overload shows up as fast rejections
+    instead of ever-growing latency.
+    """
+
+    def __init__(self, app, max_concurrency, max_queue, queue_timeout):
+        self.app = app
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.ready = False
+        self.draining = False
+        self.in_flight = 0
+        self.admitted = 0
+        self.served = 0
+        self.shed = 0
+        self._slots = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(scope, receive, send)
+            return
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        if scope['path'] == '/healthz':
+            await self.respond(send, 200, {'status': 'ok'})
+            return
+        if scope['path'] == '/readyz':
+            ready = self.ready and not self.draining
+            await self.respond(send, 200 if ready else 503, dict(self.stats(), ready=ready))
+            return
+
+        if self.draining:
+            await self.reject(send, 'Draining')
+            return
+        if self.admitted >= self.max_concurrency + self.max_queue:
+            await self.reject(send, 'Overloaded')
+            return
+
+        # Take a place before waiting for a slot, so a burst arriving before
+        # any of it gets a slot is still bounded by max_queue
+        self.admitted += 1
+        try:
+            try:
+                await asyncio.wait_for(self.slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                await self.reject(send, 'Timed out waiting in queue')
+                return
+
+            self.in_flight += 1
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.in_flight -= 1
+                self.served += 1
+                self.slots.release()
+        finally:
+            self.admitted -= 1
+
+    @property
+    def queued(self):
+        # Admitted requests beyond what may run at once
+        return max(0, self.admitted - self.max_concurrency)
+
+    @property
+    def slots(self):
+        # Created on first use so it belongs to the serving event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._slots
+
+    async def lifespan(self, scope, receive, send):
+        async def send_wrapper(message):
+            if message['type'] == 'lifespan.startup.complete':
+                self.ready = True
+            await send(message)
+        await self.app(scope, receive, send_wrapper)
+
+    def stats(self):
+        return {
+            'in_flight': self.in_flight,
+            'queued': self.queued,
+            'served': self.served,
+            'shed': self.shed,
+            'draining': self.draining
+        }
+
+    async def reject(self, send, reason):
+        self.shed += 1
+        await self.respond(send, 503, {'error': reason}, [(b'retry-after', b'1')])
+
+    async def respond(self, send, status, payload, headers=()):
+        body = json.dumps(payload).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode())
+            ] + list(headers)
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+app = AdmissionControl(
+    agent_app,
+    max_concurrency=option('max_concurrency'),
+    max_queue=option('max_queue'),
+    queue_timeout=option('queue_timeout')
+)
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    On SIGTERM, fail readiness first so the load balancer stops sending
+    traffic, then after drain_seconds let uvicorn stop accepting and finish
+    in-flight requests (for up to graceful_timeout seconds). A second
+    signal stops at once.
+    """
+
+    def handle_exit(self, sig, frame):
+        if app.draining or option('drain_seconds') <= 0:
+            super().handle_exit(sig, frame)
+            return
+        app.draining = True
+        timer = threading.Timer(option('drain_seconds'), super().handle_exit, (sig, frame))
+        timer.daemon = True
+        timer.start()
+
+
+def make_config():
+    return uvicorn.Config(
+        app,
+        host=os.environ.get('HOST', '0.0.0.0'),
+        port=int(os.environ.get('PORT', 8000)),
+        lifespan='on',
+        access_log=False,
+        backlog=option('backlog'),
+        timeout_keep_alive=option('keep_alive'),
+        timeout_graceful_shutdown=option('graceful_timeout'),
+        # Safety net above the admission queue: uvicorn counts connections
+        # and running requests, and health checks need room too
+        limit_concurrency=2 * (option('max_concurrency') + option('max_queue')) + 16
+    )
+
+
+def run_worker(sock):
+    DrainingServer(make_config()).run(sockets=[sock])
+
+
+def serve():
+    config = make_config()
+    workers = option('workers')
+
+    if workers <= 1:
+        DrainingServer(config).run()
+        return
+
+    # Worker processes share one listening socket; signals are forwarded
+    sock = config.bind_socket()
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=run_worker, args=(sock,)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    def forward(sig, frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, sig)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == '__main__':
+    serve()
+'''
@@ -5,9 +5,12 @@ while working seamlessly with the inferloop-agents repository.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Union
 from dataclasses import dataclass
 
+from framework_abstractions.source import AgentSource, SourceFile
+from framework_abstractions import text_store
+
 
 @dataclass
 class Agent:
@@ -15,7 +18,7 @@ class Agent:
     id: str
     name: str
     framework: str
-    source_code: str
+    source_code: Union[str, AgentSource]
     compiled_code: Optional[str] = None
     dependencies: List[str] = None
     configuration: Dict[str, Any] = None
@@ -33,6 +36,159 @@ class BuiltAgent:
     documentation: Optional[str] = None
 
 
+class CompactAgent:
+    """
+    Memory-compact, cheaply pickled form of an Agent for large batches
+    (process pool results, build caches).
+    
+    File-backed source is kept as (name, path) pairs plus its content hash
+    and re-opened lazily by source_code. Compiled code is interned, so
+    agents with identical compiled code share one string. Pickles carry
+    everything they need, except inside text_store.sharing() (as in the
+    build cache), where large texts are pickled by hash. Dependency lists
+    become shared tuples.
+    """
+    
+    __slots__ = ('id', 'name', 'framework', 'source_digest', 'source_files', 'compiled_code',
+                 'dependencies', 'configuration', 'deployment_config', 'metadata')
+    
+    def __init__(self,
+                 id: str,
+                 name: str,
+                 framework: str,
+                 source_digest: str,
+                 source_files: Tuple[Tuple[str, Optional[str], Optional[str]], ...],
+                 compiled_code: Optional[str] = None,
+                 dependencies: Optional[Tuple[str, ...]] = None,
+                 configuration: Dict[str, Any] = None,
+                 deployment_config: Dict[str, Any] = None,
+                 metadata: Dict[str, Any] = None):
+        self.id = id
+        self.name = name
+        self.framework = framework
+        self.source_digest = source_digest
+        # (name, path, content): path for files on disk, content for in-memory source
+        self.source_files = source_files
+        self.compiled_code = text_store.intern(compiled_code)
+        self.dependencies = _shared_tuple(dependencies)
+        self.configuration = configuration
+        self.deployment_config = deployment_config
+        self.metadata = metadata
+    
+    @classmethod
+    def from_agent(cls, agent: Agent) -> 'CompactAgent':
+        if isinstance(agent, cls):
+            return agent
+        source = AgentSource.coerce(agent.source_code)
+        metadata = agent.metadata
+        if metadata and 'features' in metadata:
+            metadata = dict(metadata, features=_shared_tuple(metadata['features']))
+        
+        return cls(
+            id=agent.id,
+            name=agent.name,
+            framework=agent.framework,
+            source_digest=source.digest(),
+            source_files=tuple(
+                (f.name, f.path, None if f.path else text_store.intern(f.read())) for f in source
+            ),
+            compiled_code=agent.compiled_code,
+            dependencies=agent.dependencies,
+            configuration=agent.configuration,
+            deployment_config=agent.deployment_config,
+            metadata=metadata
+        )
+    
+    @property
+    def source_code(self) -> AgentSource:
+        """The agent's source, opened lazily (nothing is read until iterated)"""
+        return AgentSource([SourceFile(name, path=path, content=content)
+                            for name, path, content in self.source_files])
+    
+    def source_changed(self) -> bool:
+        """Whether the source files on disk no longer match source_digest"""
+        try:
+            return self.source_code.digest() != self.source_digest
+        except OSError:
+            return True
+    
+    def to_agent(self) -> Agent:
+        """Expand into a regular, mutable Agent"""
+        return Agent(
+            id=self.id,
+            name=self.name,
+            framework=self.framework,
+            source_code=self.source_code,
+            compiled_code=self.compiled_code,
+            dependencies=list(self.dependencies) if self.dependencies is not None else None,
+            configuration=self.configuration,
+            deployment_config=self.deployment_config,
+            metadata=self.metadata
+        )
+    
+    def __getstate__(self):
+        return (self.id, self.name, self.framework, self.source_digest,
+                tuple((name, path, text_store.share(content)) for name, path, content in self.source_files),
+                text_store.share(self.compiled_code), self.dependencies,
+                self.configuration, self.deployment_config, self.metadata)
+    
+    def __setstate__(self, state):
+        (self.id, self.name, self.framework, self.source_digest, source_files, compiled_code,
+         dependencies, self.configuration, self.deployment_config, self.metadata) = state
+        self.source_files = tuple((name, path, text_store.resolve(content)) for name, path, content in source_files)
+        self.compiled_code = text_store.resolve(compiled_code)
+        self.dependencies = _shared_tuple(dependencies)
+    
+    def __repr__(self):
+        return f"CompactAgent(id={self.id!r}, framework={self.framework!r}, source={self.source_digest[:12]})"
+
+
+class CompactBuiltAgent:
+    """BuiltAgent holding a CompactAgent"""
+    
+    __slots__ = ('agent', 'package_path', 'docker_image', 'deployment_manifest', 'documentation')
+    
+    def __init__(self,
+                 agent: CompactAgent,
+                 package_path: str,
+                 docker_image: Optional[str] = None,
+                 deployment_manifest: Optional[str] = None,
+                 documentation: Optional[str] = None):
+        self.agent = agent
+        self.package_path = package_path
+        self.docker_image = docker_image
+        self.deployment_manifest = deployment_manifest
+        self.documentation = documentation
+    
+    @classmethod
+    def from_built_agent(cls, built: BuiltAgent) -> 'CompactBuiltAgent':
+        return cls(CompactAgent.from_agent(built.agent), built.package_path, built.docker_image,
+                   built.deployment_manifest, built.documentation)
+    
+    def __getstate__(self):
+        return (self.agent, self.package_path, self.docker_image, self.deployment_manifest, self.documentation)
+    
+    def __setstate__(self, state):
+        self.agent, self.package_path, self.docker_image, self.deployment_manifest, self.documentation = state
+
+
+# Shared tuples for values repeated across many agents (dependency lists, features)
+_SHARED_TUPLES_MAX = 4096
+_shared_tuples: Dict[tuple, tuple] = {}
+
+
+def _shared_tuple(values) -> Optional[tuple]:
+    if values is None:
+        return None
+    values = tuple(values)
+    shared = _shared_tuples.get(values)
+    if shared is not None:
+        return shared
+    if len(_shared_tuples) < _SHARED_TUPLES_MAX:
+        _shared_tuples[values] = values
+    return values
+
+
 class BaseAgentFramework(ABC):
     """
     Base interface for all agent frameworks.
@@ -44,10 +200,11 @@ class BaseAgentFramework(ABC):
         self.supported_features = []
         
     @abstractmethod
-    def build_agent(self, source_code: str, config: Dict[str, Any]) -> Agent:
+    def build_agent(self, source_code: Union[str, AgentSource], config: Dict[str, Any]) -> Agent:
         """
         Build an agent from source code.
-        Source code can come from inferloop-agents templates.
+        Source code can come from inferloop-agents templates, either as a
+        string or as an AgentSource that is read file by file.
         """
         pass
     
@@ -65,10 +222,12 @@ class BaseAgentFramework(ABC):
         pass
     
     @abstractmethod
-    def generate_deployment(self, agent: Agent, platform: str) -> Dict[str, Any]:
+    def generate_deployment(self, agent: Agent, platform: str, profile: Optional[Any] = None) -> Dict[str, Any]:
         """
         Generate deployment configuration.
         Platforms: kubernetes, docker, aws, azure, gcp
+        profile: Measured sizing.PerformanceProfile (or its dict, or a
+        profile JSON path) to size resources and autoscaling from
         """
         pass
     
@@ -92,6 +251,13 @@ class BaseAgentFramework(ABC):
         Import agent code from inferloop-agents repository.
         Preserves existing agent functionality.
         """
+        return self.open_agents_repo_source(agent_path).read()
+    
+    def open_agents_repo_source(self, agent_path: str) -> AgentSource:
+        """
+        Open agent code from inferloop-agents repository without reading it.
+        Files are streamed as the returned AgentSource is iterated.
+        """
         import os
         
         # Support both relative and absolute paths
@@ -100,17 +266,7 @@ class BaseAgentFramework(ABC):
             agents_repo = "/home/dmiruke/agent-dev-products/inferloop-agents"
             agent_path = os.path.join(agents_repo, agent_path)
         
-        # Read agent source code
-        source_files = []
-        src_path = os.path.join(agent_path, "src")
-        
-        if os.path.exists(src_path):
-            for file in os.listdir(src_path):
-                if file.endswith('.py'):
-                    with open(os.path.join(src_path, file), 'r') as f:
-                        source_files.append(f.read())
-        
-        return "\n\n".join(source_files)
+        return AgentSource.from_directory(os.path.join(agent_path, "src"))
     
     def package_agent(self, agent: Agent, output_format: str = 'standalone') -> BuiltAgent:
         """
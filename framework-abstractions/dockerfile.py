@@ -0,0 +1,172 @@
+"""
+Dockerfile Generation for AgentForge
+Multi-stage images built on shared per-framework base images
+"""
+
+import hashlib
+from typing import List, Optional
+
+
+DEFAULT_PYTHON_VERSION = '3.10'
+BASE_IMAGE_REPOSITORY = 'agentforge'
+
+# Requirement files next to the Dockerfiles' build context root
+BASE_REQUIREMENTS_FILE = 'requirements-base.txt'
+AGENT_REQUIREMENTS_FILE = 'requirements-agent.txt'
+
+# docker-compose service that builds the base image
+BASE_SERVICE = 'base-image'
+
+
+def base_image_tag(framework: str,
+                   base_requirements: List[str],
+                   python_version: str = DEFAULT_PYTHON_VERSION) -> str:
+    """
+    Tag of the shared base image for a framework.
+
+    The tag is a hash of the (resolved) framework requirements and the
+    Python version, so every agent on the same framework and dependency
+    snapshot shares one base image, and changing either builds a new one.
+    """
+    digest = hashlib.sha256(
+        '\n'.join([python_version] + sorted(base_requirements)).encode()
+    ).hexdigest()
+    return f"{BASE_IMAGE_REPOSITORY}/{framework}-base:py{python_version}-{digest[:12]}"
+
+
+def agent_requirements(requirements: List[str], base_requirements: List[str]) -> List[str]:
+    """Requirements not already installed by the base image"""
+    base = set(base_requirements)
+    return [requirement for requirement in requirements if requirement not in base]
+
+
+def generate_base_dockerfile(python_version: str = DEFAULT_PYTHON_VERSION) -> str:
+    """
+    Dockerfile of a framework base image. Build it once per tag from the
+    package root:
+
+        docker build -f deployment/Dockerfile.base -t <base image> .
+    """
+    return f"""# syntax=docker/dockerfile:1
+FROM python:{python_version}-slim AS wheels
+
+WORKDIR /wheels
+COPY {BASE_REQUIREMENTS_FILE} .
+RUN --mount=type=cache,target=/root/.cache/pip \\
+    pip wheel --wheel-dir /wheels -r {BASE_REQUIREMENTS_FILE}
+
+FROM python:{python_version}-slim
+
+ENV PYTHONDONTWRITEBYTECODE=1 \\
+    PYTHONUNBUFFERED=1
+
+RUN --mount=type=bind,from=wheels,source=/wheels,target=/wheels \\
+    pip install --no-cache-dir --no-index --find-links /wheels -r /wheels/{BASE_REQUIREMENTS_FILE}
+
+WORKDIR /app
+"""
+
+
+def generate_agent_dockerfile(agent_id: str,
+                              framework: str,
+                              base_image: str,
+                              requirements: Optional[List[str]] = None,
+                              entrypoint: str = 'src/agent.py',
+                              python_version: str = DEFAULT_PYTHON_VERSION,
+                              port: Optional[int] = None) -> str:
+    """
+    Dockerfile of an agent image: a wheel-build stage for the agent's own
+    requirements, then a thin layer on the framework base image holding
+    only those wheels, config/ and src/ (most often edited, so last).
+
+    Args:
+        agent_id: Agent ID
+        framework: Framework name
+        base_image: Base image tag (see base_image_tag)
+        requirements: Requirements not in the base image (see agent_requirements)
+        entrypoint: Script the container runs
+        python_version: Must match the base image
+        port: Port the entrypoint serves on, if any
+    """
+    stages = [f"""# syntax=docker/dockerfile:1
+ARG BASE_IMAGE={base_image}
+"""]
+
+    if requirements:
+        stages.append(f"""FROM python:{python_version}-slim AS wheels
+
+WORKDIR /wheels
+COPY {AGENT_REQUIREMENTS_FILE} .
+RUN --mount=type=cache,target=/root/.cache/pip \\
+    pip wheel --wheel-dir /wheels -r {AGENT_REQUIREMENTS_FILE}
+""")
+
+    agent_stage = """FROM ${BASE_IMAGE}
+
+WORKDIR /app
+"""
+    if requirements:
+        agent_stage += f"""
+RUN --mount=type=bind,from=wheels,source=/wheels,target=/wheels \\
+    pip install --no-cache-dir --no-index --find-links /wheels -r /wheels/{AGENT_REQUIREMENTS_FILE}
+"""
+    agent_stage += f"""
+# Set environment variables
+ENV AGENT_ID={agent_id}
+ENV AGENT_FRAMEWORK={framework}
+"""
+    if port:
+        agent_stage += f"""ENV PORT={port}
+EXPOSE {port}
+"""
+    agent_stage += f"""
+# Copy agent code
+COPY config/ ./config/
+COPY src/ ./src/
+
+# Run agent
+CMD ["python", "{entrypoint}"]
+"""
+    stages.append(agent_stage)
+
+    return '\n'.join(stages)
+
+
+def generate_deployment_readme(agent_id: str, base_image: str) -> str:
+    """README.md of a package: how to build its two images and run it"""
+    return f"""# {agent_id}
+
+Built by AgentForge. The image is two layers: a shared framework base image
+(`deployment/Dockerfile.base`, tagged `{base_image}`) and a thin agent
+image on top of it (`deployment/Dockerfile`).
+
+## Run with Docker Compose
+
+The compose file builds the base image first (service `{BASE_SERVICE}`),
+then the agent:
+
+```bash
+docker compose -f deployment/docker-compose.yml up --build
+```
+
+If your Compose version builds services in parallel, build the base image
+explicitly first:
+
+```bash
+docker compose -f deployment/docker-compose.yml build {BASE_SERVICE}
+docker compose -f deployment/docker-compose.yml up --build
+```
+
+## Build with Docker
+
+From this directory:
+
+```bash
+# 1. Base image, once per tag (shared by agents on the same framework and dependencies)
+docker build -f deployment/Dockerfile.base -t {base_image} .
+
+# 2. Agent image
+docker build -f deployment/Dockerfile -t {agent_id} .
+docker run -p 8000:8000 {agent_id}
+```
+"""
@@ -0,0 +1,204 @@
+"""
+Resource Sizing for AgentForge
+Derives deployment resources and autoscaling from measured agent performance
+"""
+
+import json
+import math
+from typing import Dict, Any, Optional, Union
+from dataclasses import dataclass, asdict
+
+
+MIB = 1024 * 1024
+
+# Memory per vCPU on AWS Lambda (CPU is allocated in proportion to memory)
+LAMBDA_MB_PER_VCPU = 1769
+
+
+@dataclass
+class PerformanceProfile:
+    """Measured behaviour of one agent replica under load"""
+    rss_bytes: int
+    p95_latency_ms: float
+    rps_per_replica: float
+    concurrency: int
+    p50_latency_ms: Optional[float] = None
+    cpu_cores: Optional[float] = None
+    source: Optional[str] = None
+
+    def __post_init__(self):
+        # Sizing memory from a missing measurement would request 0Mi
+        if not self.rss_bytes or self.rss_bytes <= 0:
+            raise ValueError(
+                "Performance profile has no memory measurement (rss_bytes); "
+                "measure with the server's pid so peak RSS is sampled"
+            )
+
+    @classmethod
+    def from_load_result(cls, result: Dict[str, Any], source: Optional[str] = None) -> 'PerformanceProfile':
+        """Profile from a load_test.run_load result (run with the server's pid)"""
+        cpu_cores = None
+        if result.get('cpu_seconds') is not None and result.get('duration'):
+            cpu_cores = round(result['cpu_seconds'] / result['duration'], 3)
+
+        return cls(
+            rss_bytes=result.get('peak_rss_bytes'),
+            p95_latency_ms=result['latency_ms'].get('p95', 0.0),
+            rps_per_replica=result['rps'],
+            concurrency=result['concurrency'],
+            p50_latency_ms=result['latency_ms'].get('p50'),
+            cpu_cores=cpu_cores,
+            source=source or result.get('url')
+        )
+
+    @classmethod
+    def coerce(cls, profile: Union['PerformanceProfile', Dict[str, Any], str]) -> 'PerformanceProfile':
+        """Accept a profile, its dict form, or the path of a profile JSON file"""
+        if isinstance(profile, cls):
+            return profile
+        if isinstance(profile, str):
+            with open(profile, 'r') as f:
+                profile = json.load(f)
+        return cls(**profile)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def container_concurrency(profile: PerformanceProfile) -> int:
+    """
+    Requests a replica should run at once: by Little's law, throughput
+    times latency (p95, for headroom) is the work in flight at the
+    measured load.
+    """
+    return max(1, math.ceil(profile.rps_per_replica * profile.p95_latency_ms / 1000))
+
+
+def kubernetes_resources(profile: PerformanceProfile) -> Dict[str, Any]:
+    """Container requests and limits from measured memory and CPU"""
+    memory_request = _round_up(profile.rss_bytes * 1.2, 16 * MIB)
+    memory_limit = _round_up(profile.rss_bytes * 1.5, 16 * MIB)
+
+    # Without a CPU measurement fall back to half a core
+    cpu_request = max(0.1, (profile.cpu_cores or 0.5) * 1.1)
+
+    return {
+        'requests': {
+            'cpu': f"{math.ceil(cpu_request * 1000)}m",
+            'memory': f"{memory_request // MIB}Mi"
+        },
+        'limits': {
+            'cpu': f"{math.ceil(cpu_request * 2000)}m",
+            'memory': f"{memory_limit // MIB}Mi"
+        }
+    }
+
+
+def replica_range(profile: PerformanceProfile, scaling: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """
+    Minimum and maximum replicas. With scaling['target_rps'] (expected
+    peak traffic) the minimum carries it at target_utilization.
+    """
+    scaling = scaling or {}
+    utilization = scaling.get('target_utilization', 0.7)
+    min_replicas = scaling.get('min_replicas', 2)
+
+    if scaling.get('target_rps') and profile.rps_per_replica:
+        min_replicas = max(min_replicas, math.ceil(scaling['target_rps'] / (profile.rps_per_replica * utilization)))
+
+    return {
+        'min': min_replicas,
+        'max': max(min_replicas, scaling.get('max_replicas', min_replicas * 4))
+    }
+
+
+def hpa_spec(name: str, profile: PerformanceProfile, scaling: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """HorizontalPodAutoscaler scaling on CPU relative to the derived request"""
+    scaling = scaling or {}
+    replicas = replica_range(profile, scaling)
+
+    return {
+        'apiVersion': 'autoscaling/v2',
+        'kind': 'HorizontalPodAutoscaler',
+        'metadata': {'name': name},
+        'spec': {
+            'scaleTargetRef': {'apiVersion': 'apps/v1', 'kind': 'Deployment', 'name': name},
+            'minReplicas': replicas['min'],
+            'maxReplicas': replicas['max'],
+            'metrics': [{
+                'type': 'Resource',
+                'resource': {
+                    'name': 'cpu',
+                    'target': {
+                        'type': 'Utilization',
+                        'averageUtilization': int(scaling.get('target_utilization', 0.7) * 100)
+                    }
+                }
+            }]
+        }
+    }
+
+
+def keda_spec(name: str, profile: PerformanceProfile, scaling: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    KEDA ScaledObject scaling on request rate: one replica per
+    target_utilization x measured requests/second. The rate comes from
+    Prometheus (scaling['prometheus_address'], scaling['rps_query']).
+    """
+    scaling = scaling or {}
+    replicas = replica_range(profile, scaling)
+    threshold = profile.rps_per_replica * scaling.get('target_utilization', 0.7)
+    query = scaling.get('rps_query', f'sum(rate(nginx_ingress_controller_requests{{service="{name}"}}[1m]))')
+
+    return {
+        'apiVersion': 'keda.sh/v1alpha1',
+        'kind': 'ScaledObject',
+        'metadata': {'name': name},
+        'spec': {
+            'scaleTargetRef': {'name': name},
+            'minReplicaCount': replicas['min'],
+            'maxReplicaCount': replicas['max'],
+            'triggers': [{
+                'type': 'prometheus',
+                'metadata': {
+                    'serverAddress': scaling.get('prometheus_address', 'http://prometheus.monitoring:9090'),
+                    'query': query,
+                    'threshold': f"{max(threshold, 0.1):.2f}"
+                }
+            }]
+        }
+    }
+
+
+def lambda_settings(profile: PerformanceProfile, scaling: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Lambda memory, timeout and reserved concurrency. Each Lambda instance
+    serves one request at a time, so memory must cover the measured RSS
+    and buy enough CPU for one request's share of the measured CPU use.
+    """
+    scaling = scaling or {}
+    memory_mb = profile.rss_bytes * 1.5 / MIB
+
+    if profile.cpu_cores and profile.rps_per_replica:
+        cpu_seconds_per_request = profile.cpu_cores / profile.rps_per_replica
+        latency = (profile.p50_latency_ms or profile.p95_latency_ms) / 1000
+        if latency:
+            memory_mb = max(memory_mb, cpu_seconds_per_request / latency * LAMBDA_MB_PER_VCPU)
+
+    settings = {
+        'memory': min(10240, max(128, _round_up(memory_mb, 64))),
+        'timeout': min(900, max(10, math.ceil(profile.p95_latency_ms * 4 / 1000)))
+    }
+
+    if scaling.get('target_rps'):
+        settings['reserved_concurrency'] = math.ceil(scaling['target_rps'] * profile.p95_latency_ms / 1000 * 1.2)
+
+    return settings
+
+
+def _round_up(value: float, step: int) -> int:
+    return int(math.ceil(value / step) * step)
@@ -0,0 +1,176 @@
+"""
+Agent Source Abstraction for AgentForge
+Lazy, streaming access to agent source code from inferloop-agents
+"""
+
+import os
+import mmap
+import hashlib
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from framework_abstractions import tracing
+
+
+class SourceFile(Mapping):
+    """
+    A single agent source file, read only when its content is needed.
+
+    A read-only mapping with the keys 'name' and 'content', so it stands in
+    for the {'name': ..., 'content': ...} dicts get_agent_from_repo used to
+    return: item access, get(), items(), dict(file) and comparison with
+    such dicts all work. Use to_dict() (or dict(file)) to serialize.
+    """
+
+    KEYS = ('name', 'content')
+
+    __slots__ = ('name', 'path', '_content')
+
+    def __init__(self, name: str, path: Optional[str] = None, content: Optional[str] = None):
+        if path is None and content is None:
+            raise ValueError(f"Source file {name} needs a path or content")
+        self.name = name
+        self.path = path
+        self._content = content
+
+    def read(self) -> str:
+        """Read the whole file"""
+        if self._content is not None:
+            return self._content
+        with open(self.path, 'r') as f:
+            _count_read(f)
+            return f.read()
+
+    def read_bytes(self) -> bytes:
+        """Read the whole file undecoded"""
+        if self._content is not None:
+            return self._content.encode()
+        with open(self.path, 'rb') as f:
+            _count_read(f)
+            return f.read()
+
+    def iter_lines(self) -> Iterator[str]:
+        """Stream the file line by line, without trailing newlines"""
+        if self._content is not None:
+            yield from self._content.split('\n')
+            return
+        with open(self.path, 'r') as f:
+            _count_read(f)
+            for line in f:
+                yield line.rstrip('\n')
+
+    def digest(self) -> str:
+        """SHA-256 of the file content, hashed straight from an mmap"""
+        digest = hashlib.sha256()
+        if self._content is not None:
+            digest.update(self._content.encode())
+            return digest.hexdigest()
+
+        with open(self.path, 'rb') as f:
+            if _count_read(f):
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+        return digest.hexdigest()
+
+    def to_dict(self) -> Dict[str, str]:
+        """The file as a plain {'name', 'content'} dict (reads it)"""
+        return {'name': self.name, 'content': self.read()}
+
+    def __getitem__(self, key: str):
+        if key == 'name':
+            return self.name
+        if key == 'content':
+            return self.read()
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __getstate__(self):
+        return (self.name, self.path, self._content)
+
+    def __setstate__(self, state):
+        self.name, self.path, self._content = state
+
+    def __repr__(self):
+        return f"SourceFile({self.name!r}, path={self.path!r})"
+
+
+class AgentSource:
+    """
+    Source code of an agent as a sequence of files.
+
+    Files are read one at a time as they are iterated, so adapters can scan
+    components file by file. The concatenated source is only built when
+    read() (or str()) is called, e.g. when a package ships the original code.
+    """
+
+    SEPARATOR = "\n\n"
+
+    def __init__(self, files: List[SourceFile]):
+        self.files = files
+
+    @classmethod
+    def from_directory(cls, src_path: str, names: Optional[List[str]] = None) -> 'AgentSource':
+        """Source made of the .py files in a directory (or the given names in it)"""
+        if names is None:
+            names = sorted(f for f in os.listdir(src_path) if f.endswith('.py')) if os.path.isdir(src_path) else []
+        return cls([SourceFile(name, path=os.path.join(src_path, name)) for name in names])
+
+    @classmethod
+    def from_string(cls, source_code: str, name: str = 'agent.py') -> 'AgentSource':
+        """Source held in memory, e.g. raw code passed to a build"""
+        return cls([SourceFile(name, content=source_code)])
+
+    @classmethod
+    def coerce(cls, source) -> 'AgentSource':
+        """Accept either an AgentSource or a source code string"""
+        return source if isinstance(source, cls) else cls.from_string(source)
+
+    def iter_files(self) -> Iterator[Tuple[str, str]]:
+        """Yield (name, content) one file at a time"""
+        for source_file in self.files:
+            yield source_file.name, source_file.read()
+
+    def iter_lines(self) -> Iterator[Tuple[str, int, str]]:
+        """Yield (file name, line number, line) across all files, streaming"""
+        for source_file in self.files:
+            for lineno, line in enumerate(source_file.iter_lines(), 1):
+                yield source_file.name, lineno, line
+
+    def digest(self) -> str:
+        """Content hash over every file name and file content"""
+        digest = hashlib.sha256()
+        for source_file in self.files:
+            digest.update(source_file.name.encode())
+            digest.update(b'\0')
+            digest.update(source_file.digest().encode())
+        return digest.hexdigest()
+
+    def read(self) -> str:
+        """Build the concatenated source of all files"""
+        return self.SEPARATOR.join(source_file.read() for source_file in self.files)
+
+    def __iter__(self) -> Iterator[SourceFile]:
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __str__(self) -> str:
+        return self.read()
+
+    def __repr__(self):
+        return f"AgentSource({[f.name for f in self.files]!r})"
+
+
+def _count_read(f) -> int:
+    """Count a whole-file read on the current trace span; returns the file size"""
+    size = os.fstat(f.fileno()).st_size
+    span = tracing.current_span()
+    span.add('files_read')
+    span.add('bytes_read', size)
+    return size
@@ -0,0 +1,249 @@
+"""
+Shared Text Store for AgentForge
+Deduplicates large generated texts and pickles them by content hash
+"""
+
+import os
+import time
+import hashlib
+import threading
+import contextlib
+import contextvars
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Union
+
+from framework_abstractions import user_dirs
+
+
+DEFAULT_TEXT_DIR = os.path.join(user_dirs.CACHE_ROOT, 'texts')
+
+# Texts shorter than this are pickled inline
+INLINE_LIMIT = 4096
+
+# Stored texts nobody has shared or loaded for MAX_AGE seconds are deleted
+# by gc(), which share() runs at most every GC_INTERVAL seconds. Matches the
+# build cache's default max_age, whose entries refer to these texts.
+MAX_AGE = 7 * 24 * 3600
+GC_INTERVAL = 24 * 3600
+GC_STAMP = '.gc'
+
+# How often a process refreshes the access time of a text it keeps sharing
+_TOUCH_INTERVAL = 3600
+
+_MEMO_SIZE = 256
+_shared: 'OrderedDict[str, str]' = OrderedDict()
+_digests: 'OrderedDict[str, str]' = OrderedDict()
+_loaded: 'OrderedDict[str, str]' = OrderedDict()
+# Text path -> when this process last wrote or touched it
+_stored: Dict[str, float] = {}
+_lock = threading.Lock()
+
+# Store that share() writes to by default: set only inside sharing()
+_sharing: contextvars.ContextVar = contextvars.ContextVar('agentforge_text_dir', default=None)
+
+
+class TextRef:
+    """A text stored by share(), pickled as its content hash only"""
+
+    __slots__ = ('digest',)
+
+    def __init__(self, digest: str):
+        self.digest = digest
+
+    def __reduce__(self):
+        return (TextRef, (self.digest,))
+
+    def __repr__(self):
+        return f"TextRef({self.digest[:12]})"
+
+
+def intern(text: str) -> str:
+    """
+    One shared copy of text among recently seen texts (e.g. identical
+    compiled agents). Unlike sys.intern, texts are only held while among
+    the last few hundred seen.
+    """
+    if type(text) is not str:
+        return text
+    with _lock:
+        shared = _shared.get(text)
+        if shared is None:
+            shared = _shared[text] = text
+            _trim(_shared)
+        else:
+            _shared.move_to_end(text)
+    return shared
+
+
+@contextlib.contextmanager
+def sharing(text_dir: Optional[str] = None):
+    """
+    Pickle large texts by reference while in this block, storing them in
+    text_dir (default: DEFAULT_TEXT_DIR). For pickles that stay on this
+    host, like build cache entries; anything else pickles texts inline and
+    loads anywhere.
+    """
+    token = _sharing.set(text_dir or DEFAULT_TEXT_DIR)
+    try:
+        yield
+    finally:
+        _sharing.reset(token)
+
+
+def share(text: str, text_dir: Optional[str] = None) -> Union[str, TextRef]:
+    """
+    What to pickle for text: small texts as they are, large ones written
+    once to text_dir (or the store of the enclosing sharing() block) and
+    referred to by hash, so thousands of agents with the same compiled code
+    pickle it once. Falls back to the text itself outside sharing(), or if
+    the store is not writable.
+    """
+    text_dir = text_dir or _sharing.get()
+    if text is None or len(text) < INLINE_LIMIT or text_dir is None:
+        return text
+
+    with _lock:
+        digest = _digests.get(text)
+    if digest is None:
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        with _lock:
+            _digests[text] = digest
+            _trim(_digests)
+
+    path = _text_path(text_dir, digest)
+    stored_at = _stored.get(path)
+    if stored_at is None or time.monotonic() - stored_at > _TOUCH_INTERVAL:
+        try:
+            user_dirs.private_dir(text_dir)
+            if _intact(path, digest):
+                # Still in use: keep it from gc()
+                os.utime(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                os.replace(tmp_path, path)
+                _maybe_gc(text_dir)
+        except OSError:
+            return text
+        _stored[path] = time.monotonic()
+
+    return TextRef(digest)
+
+
+def resolve(value: Union[str, TextRef, None], text_dir: Optional[str] = None) -> str:
+    """
+    The text behind a value produced by share(), loaded once per process.
+    Raises OSError if the text is gone or does not match its hash, which
+    the build cache treats as a miss.
+    """
+    if not isinstance(value, TextRef):
+        return intern(value)
+
+    with _lock:
+        text = _loaded.get(value.digest)
+    if text is None:
+        path = _text_path(text_dir or DEFAULT_TEXT_DIR, value.digest)
+        with open(path, 'rb') as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != value.digest:
+            raise OSError(f"Stored text {path} does not match its hash")
+        text = intern(data.decode('utf-8'))
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with _lock:
+            _loaded[value.digest] = text
+            _trim(_loaded)
+            _digests[text] = value.digest
+            _trim(_digests)
+        _stored[path] = time.monotonic()
+    return text
+
+
+def gc(text_dir: Optional[str] = None, max_age: float = MAX_AGE, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Delete texts not shared or loaded for max_age seconds.
+
+    Pickles still referring to a deleted text fail to load with OSError,
+    which the build cache treats as a miss.
+
+    Args:
+        text_dir: Store to clean up (default: DEFAULT_TEXT_DIR)
+        max_age: Keep texts used within this many seconds
+        dry_run: Only report what would be deleted
+    """
+    text_dir = text_dir or DEFAULT_TEXT_DIR
+    removed = kept = freed = 0
+    now = time.time()
+
+    try:
+        prefixes = os.listdir(text_dir)
+    except FileNotFoundError:
+        prefixes = []
+
+    for prefix in prefixes:
+        prefix_dir = os.path.join(text_dir, prefix)
+        if not os.path.isdir(prefix_dir):
+            continue
+        for name in os.listdir(prefix_dir):
+            path = os.path.join(prefix_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            # Leftover temporary files age out the same way
+            if now - stat.st_mtime < max_age:
+                kept += 1
+                continue
+
+            removed += 1
+            freed += stat.st_size
+            if not dry_run:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                _stored.pop(path, None)
+
+    return {'removed': removed, 'kept': kept, 'freed_bytes': freed}
+
+
+# Private helper functions
+
+def _text_path(text_dir: str, digest: str) -> str:
+    return os.path.join(text_dir, digest[:2], digest)
+
+
+def _intact(path: str, digest: str) -> bool:
+    """Whether path holds the text with this hash (it is rewritten if not)"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest() == digest
+    except FileNotFoundError:
+        return False
+
+
+def _maybe_gc(text_dir: str):
+    """Run gc() if no process has in the last GC_INTERVAL seconds"""
+    stamp = os.path.join(text_dir, GC_STAMP)
+    try:
+        if time.time() - os.stat(stamp).st_mtime < GC_INTERVAL:
+            return
+    except FileNotFoundError:
+        pass
+    try:
+        with open(stamp, 'a'):
+            pass
+        os.utime(stamp)
+        gc(text_dir)
+    except OSError as e:
+        print(f"Warning: Could not clean up text store {text_dir}: {e}")
+
+
+def _trim(memo: OrderedDict):
+    while len(memo) > _MEMO_SIZE:
+        memo.popitem(last=False)
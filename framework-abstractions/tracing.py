@@ -0,0 +1,246 @@
+"""
+Build Tracing for AgentForge
+Spans and counters around build pipeline stages, exportable as JSON or OTLP/JSON
+"""
+
+import os
+import json
+import time
+import threading
+import contextvars
+from typing import Dict, Any, Optional, List
+
+
+# Counters summed per stage by RecordingTracer.summary()
+COUNTERS = ['bytes_read', 'bytes_written', 'files_read', 'files_written']
+
+
+class NoopSpan:
+    """Span that records nothing; what every stage gets while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> 'NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def add(self, key: str, amount: int = 1):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('agentforge_span', default=NOOP_SPAN)
+
+
+class NoopTracer:
+    """Default tracer: spans cost one method call and record nothing"""
+
+    enabled = False
+
+    def span(self, name: str, **attributes) -> NoopSpan:
+        return NOOP_SPAN
+
+
+class Span:
+    """
+    A timed stage. Use as a context manager; spans opened inside it (in the
+    same thread, task or copied context) become its children.
+    """
+
+    __slots__ = ('tracer', 'name', 'trace_id', 'span_id', 'parent_id', 'attributes',
+                 'start_time_ns', 'duration_ns', 'status', 'error', '_started', '_token')
+
+    def __init__(self, tracer: 'RecordingTracer', name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span_id = os.urandom(8).hex()
+        self.trace_id = None
+        self.parent_id = None
+        self.start_time_ns = 0
+        self.duration_ns = 0
+        self.status = 'ok'
+        self.error = None
+        self._started = 0
+        self._token = None
+
+    def __enter__(self) -> 'Span':
+        parent = _current_span.get()
+        if isinstance(parent, Span):
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+        else:
+            self.trace_id = os.urandom(16).hex()
+
+        self._token = _current_span.set(self)
+        self.start_time_ns = time.time_ns()
+        self._started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.duration_ns = time.perf_counter_ns() - self._started
+        if exc_type is not None:
+            self.status = 'error'
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self.tracer._finish(self)
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def add(self, key: str, amount: int = 1):
+        """Increment a counter attribute (e.g. 'bytes_written')"""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_time_ns': self.start_time_ns,
+            'duration_ms': round(self.duration_ns / 1e6, 3),
+            'status': self.status,
+            'error': self.error,
+            'attributes': dict(self.attributes)
+        }
+
+
+class RecordingTracer:
+    """
+    Keeps every finished span in memory.
+
+    Example:
+        tracer = RecordingTracer()
+        set_tracer(tracer)
+        await builder.build('finance/fraud_detection', 'langchain')
+        print(tracer.summary())
+        tracer.export('trace.json', format='otlp')
+    """
+
+    enabled = True
+
+    def __init__(self, service_name: str = 'agentforge'):
+        self.service_name = service_name
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes) -> Span:
+        return Span(self, name, attributes)
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Count, total and max duration, and summed counters per span name"""
+        stages: Dict[str, Dict[str, Any]] = {}
+        for span in self.finished():
+            stage = stages.setdefault(span.name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'errors': 0})
+            duration_ms = span.duration_ns / 1e6
+            stage['count'] += 1
+            stage['total_ms'] = round(stage['total_ms'] + duration_ms, 3)
+            stage['max_ms'] = round(max(stage['max_ms'], duration_ms), 3)
+            stage['errors'] += span.status == 'error'
+            for counter in COUNTERS:
+                if counter in span.attributes:
+                    stage[counter] = stage.get(counter, 0) + span.attributes[counter]
+        return stages
+
+    def finished(self) -> List[Span]:
+        with self._lock:
+            return list(self.spans)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {'service': self.service_name, 'spans': [span.to_dict() for span in self.finished()]}
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Spans as an OTLP/JSON ExportTraceServiceRequest (for an OTLP/HTTP collector)"""
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': _otlp_attributes({'service.name': self.service_name})},
+                'scopeSpans': [{
+                    'scope': {'name': 'agentforge.build'},
+                    'spans': [_otlp_span(span) for span in self.finished()]
+                }]
+            }]
+        }
+
+    def export(self, path: str, format: str = 'json'):
+        """Write the spans to path as 'json' or 'otlp' (OTLP/JSON)"""
+        if format not in ('json', 'otlp'):
+            raise ValueError(f"Trace format {format} not supported. Available: ['json', 'otlp']")
+        with open(path, 'w') as f:
+            json.dump(self.to_otlp() if format == 'otlp' else self.to_json(), f, indent=2)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+
+_tracer: Any = NoopTracer()
+
+
+def get_tracer():
+    """The process-wide tracer (a NoopTracer unless one was set)"""
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Any]):
+    """Install a tracer for the whole process (None restores the no-op one). Returns the previous"""
+    global _tracer
+    previous = _tracer
+    _tracer = tracer or NoopTracer()
+    return previous
+
+
+def span(name: str, **attributes):
+    """Open a span on the current tracer"""
+    return _tracer.span(name, **attributes)
+
+
+def current_span():
+    """The innermost open span, to add counters to; NOOP_SPAN if none"""
+    return _current_span.get()
+
+
+# Private helper functions
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    otlp = {
+        'traceId': span.trace_id,
+        'spanId': span.span_id,
+        'name': span.name,
+        # SPAN_KIND_INTERNAL
+        'kind': 1,
+        'startTimeUnixNano': str(span.start_time_ns),
+        'endTimeUnixNano': str(span.start_time_ns + span.duration_ns),
+        'attributes': _otlp_attributes(span.attributes),
+        # STATUS_CODE_OK / STATUS_CODE_ERROR
+        'status': {'code': 2, 'message': span.error} if span.status == 'error' else {'code': 1}
+    }
+    if span.parent_id:
+        otlp['parentSpanId'] = span.parent_id
+    return otlp
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    converted = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {'boolValue': value}
+        elif isinstance(value, int):
+            typed = {'intValue': str(value)}
+        elif isinstance(value, float):
+            typed = {'doubleValue': value}
+        else:
+            typed = {'stringValue': str(value)}
+        converted.append({'key': key, 'value': typed})
+    return converted
@@ -0,0 +1,56 @@
+"""
+Per-User Directories for AgentForge
+Private cache directories that other local users cannot plant files in
+"""
+
+import os
+import stat
+import tempfile
+
+
+def cache_root() -> str:
+    """
+    Root of AgentForge's caches: $AGENTFORGE_CACHE_DIR, else agentforge
+    under $XDG_CACHE_HOME (or ~/.cache), else /tmp/agentforge-cache-<uid>
+    when there is no writable home directory
+    """
+    if os.environ.get('AGENTFORGE_CACHE_DIR'):
+        return os.environ['AGENTFORGE_CACHE_DIR']
+    if os.environ.get('XDG_CACHE_HOME'):
+        return os.path.join(os.environ['XDG_CACHE_HOME'], 'agentforge')
+    home = os.path.expanduser('~')
+    if home not in ('', '/') and os.access(home, os.W_OK):
+        return os.path.join(home, '.cache', 'agentforge')
+    return os.path.join(tempfile.gettempdir(), f"agentforge-cache-{os.getuid()}")
+
+
+CACHE_ROOT = cache_root()
+
+
+def private_dir(path: str) -> str:
+    """
+    Create path 0700, or check that an existing one belongs to this user
+    and that nobody else can write to it or replace it. Caches load pickles
+    and generated code from these directories, so anything another user
+    could plant files in raises PermissionError.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"{path} belongs to uid {info.st_uid}, not to this user")
+    if info.st_mode & 0o022:
+        raise PermissionError(f"{path} is writable by other users; use a private directory")
+
+    # Parents may be shared (like /tmp) only if sticky: nobody else can rename path away
+    parent = os.path.dirname(os.path.realpath(path))
+    while True:
+        info = os.stat(parent)
+        if info.st_uid not in (0, os.getuid()):
+            raise PermissionError(f"{parent} belongs to uid {info.st_uid}, not to this user or root")
+        if info.st_mode & 0o022 and not info.st_mode & stat.S_ISVTX:
+            raise PermissionError(f"{parent} is writable by other users; use a private directory")
+        if os.path.dirname(parent) == parent:
+            return path
+        parent = os.path.dirname(parent)
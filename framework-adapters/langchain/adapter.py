@@ -5,13 +5,17 @@ Builds and manages LangChain-based agents from inferloop-agents templates
 
 import os
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 import sys
 
 # Add framework abstractions to path
 sys.path.append('/home/dmiruke/agent-dev-products/inferloop-agentforge')
 
 from framework_abstractions.base import BaseAgentFramework, Agent, BuiltAgent
+from framework_abstractions.source import AgentSource
+from framework_abstractions import dockerfile, sizing
+from framework_adapters.langchain.components import extract_components
+from framework_adapters.langchain import runtime_templates as templates
 
 
 class LangChainAdapter(BaseAgentFramework):
@@ -20,6 +24,7 @@ class LangChainAdapter(BaseAgentFramework):
     def __init__(self):
         super().__init__()
         self.framework_name = 'langchain'
+        self.version = '0.1.6'
         self.supported_features = [
             'rag',
             'tools',
@@ -33,14 +38,15 @@ class LangChainAdapter(BaseAgentFramework):
             'llm_integration'
         ]
     
-    def build_agent(self, source_code: str, config: Dict[str, Any]) -> Agent:
+    def build_agent(self, source_code: Union[str, AgentSource], config: Dict[str, Any]) -> Agent:
         """
         Build a LangChain agent from source code.
         Can use existing agents from inferloop-agents repository.
         """
+        source = AgentSource.coerce(source_code)
         
         # Parse source code to identify LangChain components
-        components = self._parse_langchain_components(source_code)
+        components = self._parse_langchain_components(source)
         
         # Generate optimized LangChain code
         optimized_code = self._generate_langchain_code(components, config)
@@ -50,14 +56,14 @@ class LangChainAdapter(BaseAgentFramework):
             id=config.get('agent_id', 'langchain-agent'),
             name=config.get('name', 'LangChain Agent'),
             framework='langchain',
-            source_code=source_code,
+            source_code=source,
             compiled_code=optimized_code,
             dependencies=self.get_dependencies(),
             configuration=config,
             deployment_config=self._generate_deployment_config(config),
             metadata={
                 'components': components,
-                'version': '0.1.0',
+                'version': self.version,
                 'features': self.supported_features
             }
         )
@@ -102,7 +108,6 @@ class LangChainAdapter(BaseAgentFramework):
                 'verbose': False,
                 'cache': True,
                 'streaming': True,
-                'batching': True,
                 'async': True
             }
         }
@@ -114,15 +119,28 @@ class LangChainAdapter(BaseAgentFramework):
         # Update compiled code with optimizations
         agent.compiled_code = self._apply_optimizations(agent.compiled_code, opt_config)
         
+        # Streaming builds define an ASGI app the packaged server can serve
+        if templates.STREAM_APP in agent.compiled_code:
+            agent.deployment_config = dict(agent.deployment_config or {}, asgi_app='agent:app')
+        
         return agent
     
-    def generate_deployment(self, agent: Agent, platform: str) -> Dict[str, Any]:
-        """Generate LangChain deployment configuration"""
+    def generate_deployment(self, agent: Agent, platform: str,
+                            profile: Optional[Union[sizing.PerformanceProfile, Dict, str]] = None) -> Dict[str, Any]:
+        """
+        Generate LangChain deployment configuration.
+        
+        With a measured performance profile (see testing-utilities/profile_agent.py)
+        Kubernetes and AWS resources and autoscaling are sized from it,
+        tuned by the 'scaling' dict of the agent configuration.
+        """
+        if profile is not None:
+            profile = sizing.PerformanceProfile.coerce(profile)
         
         deployments = {
             'docker': self._generate_docker_deployment(agent),
-            'kubernetes': self._generate_k8s_deployment(agent),
-            'aws': self._generate_aws_deployment(agent),
+            'kubernetes': self._generate_k8s_deployment(agent, profile),
+            'aws': self._generate_aws_deployment(agent, profile),
             'azure': self._generate_azure_deployment(agent),
             'gcp': self._generate_gcp_deployment(agent)
         }
@@ -154,7 +172,8 @@ class LangChainAdapter(BaseAgentFramework):
             'tiktoken>=0.5.0',
             'faiss-cpu>=1.7.4',
             'beautifulsoup4>=4.12.0',
-            'python-dotenv>=1.0.0'
+            'python-dotenv>=1.0.0',
+            'uvicorn>=0.24.0'
         ]
     
     def get_supported_features(self) -> List[str]:
@@ -163,35 +182,13 @@ class LangChainAdapter(BaseAgentFramework):
     
     # Private helper methods
     
-    def _parse_langchain_components(self, source_code: str) -> Dict[str, Any]:
-        """Parse source code to identify LangChain components"""
-        components = {
-            'chains': [],
-            'agents': [],
-            'tools': [],
-            'memory': None,
-            'callbacks': [],
-            'embeddings': None,
-            'llm': None
-        }
-        
-        # Simple parsing logic (can be enhanced)
-        lines = source_code.split('\n')
-        for line in lines:
-            if 'Chain' in line and 'class' in line:
-                components['chains'].append(line)
-            elif 'Agent' in line and 'class' in line:
-                components['agents'].append(line)
-            elif 'Tool' in line or 'tool' in line:
-                components['tools'].append(line)
-            elif 'Memory' in line:
-                components['memory'] = line
-            elif 'Embedding' in line:
-                components['embeddings'] = line
-            elif 'ChatOpenAI' in line or 'OpenAI' in line:
-                components['llm'] = line
-        
-        return components
+    def _parse_langchain_components(self, source: AgentSource) -> Dict[str, Any]:
+        """
+        Parse source code to identify LangChain components.
+        Files are parsed with ast one at a time; results are memoized by file
+        content hash, so unchanged files are not re-parsed across builds.
+        """
+        return extract_components(source)
     
     def _generate_langchain_code(self, components: Dict, config: Dict) -> str:
         """Generate optimized LangChain code"""
@@ -201,21 +198,25 @@ class LangChainAdapter(BaseAgentFramework):
 # Built by AgentForge from inferloop-agents template
 
 import os
+import time
+import threading
+from collections import OrderedDict, deque
 from langchain.chat_models import ChatOpenAI
 from langchain.agents import initialize_agent, AgentType
-from langchain.memory import ConversationBufferMemory
+from langchain.schema import AIMessage, HumanMessage, SystemMessage
 from langchain.tools import Tool
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 
-class LangChainAgent:
+""" + templates.SESSION_MEMORY + """class LangChainAgent:
     def __init__(self, config):
         self.config = config
         self.llm = ChatOpenAI(
             model=config.get('model', 'gpt-4'),
+            openai_api_base=config.get('llm_base_url') or os.environ.get('OPENAI_API_BASE'),
             temperature=config.get('temperature', 0.7)
         )
-        self.memory = ConversationBufferMemory()
+        self.sessions = SessionMemory(config.get('memory', {}), self.llm)
         self.tools = self._initialize_tools()
         self.agent = self._initialize_agent()
     
@@ -229,49 +230,85 @@ class LangChainAgent:
             self.tools,
             self.llm,
             agent=AgentType.CHAT_CONVERSATIONAL_REACT_DESCRIPTION,
-            memory=self.memory,
             verbose=self.config.get('verbose', False)
         )
     
-    def run(self, input_text):
-        return self.agent.run(input_text)
-"""
+""" + templates.SYNC_RUN
         return code
     
     def _apply_optimizations(self, code: str, optimizations: Dict) -> str:
         """Apply optimizations to the code"""
         
         # Add optimization flags
-        if optimizations.get('async'):
-            code = code.replace('def run(', 'async def run(')
+        if optimizations.get('async') and templates.SYNC_RUN in code:
+            # Native ainvoke/arun, bounded by config['max_concurrency']. Concurrent
+            # calls are not micro-batched: the agent makes one chat-model request
+            # per reasoning step, and chat APIs take one conversation per request,
+            # so grouping calls would not save a single request
+            code = code.replace(templates.SYNC_RUN, templates.ASYNC_RUN)
+            code = code.replace(templates.IMPORTS_END, templates.IMPORTS_END + templates.ASYNC_IMPORTS)
+            code = code.replace(templates.INIT_END, templates.INIT_END + templates.ASYNC_INIT)
         
-        if optimizations.get('cache'):
-            code = "from langchain.cache import InMemoryCache\n" + code
-            code += "\nlangchain.llm_cache = InMemoryCache()\n"
+        if optimizations.get('cache') and templates.CACHE_BACKENDS not in code:
+            # Bounded LRU or shared SQLite cache, chosen by config['cache_backend']
+            code = code.replace(templates.IMPORTS_END, templates.IMPORTS_END + templates.CACHE_IMPORTS)
+            code = code.replace(templates.CLASS_START, templates.CACHE_BACKENDS + templates.CLASS_START)
+            code = code.replace(templates.INIT_END, templates.INIT_END + templates.CACHE_INIT)
+            code = code.replace(templates.METHODS_START, templates.CACHE_METHODS + templates.METHODS_START)
+        
+        if optimizations.get('streaming') and templates.STREAM_METHODS not in code:
+            # stream() token generator, served with /run and /stream by an ASGI app
+            imports = templates.STREAM_IMPORTS
+            if 'import asyncio\n' not in code:
+                imports = 'import asyncio\n' + imports
+            code = code.replace(templates.IMPORTS_END, templates.IMPORTS_END + imports)
+            code = code.replace(templates.LLM_ARGS_END, templates.STREAM_LLM_ARGS)
+            code = code.replace(templates.CLASS_START, templates.STREAM_BACKEND + templates.CLASS_START)
+            code = code.replace(templates.METHODS_START, templates.STREAM_METHODS + templates.METHODS_START)
+            code = code.rstrip('\n') + '\n' + templates.STREAM_APP
         
         return code
     
+    def _generate_deployment_config(self, config: Dict) -> Dict[str, Any]:
+        """Generate default deployment settings for a new agent"""
+        return {
+            'platform': config.get('platform', 'docker'),
+            'port': config.get('port', 8000)
+        }
+    
     def _generate_docker_deployment(self, agent: Agent) -> Dict[str, Any]:
-        """Generate Docker deployment configuration"""
+        """
+        Generate Docker deployment configuration: a shared LangChain base
+        image and a thin agent image on top of it
+        """
+        python_version = (agent.configuration or {}).get('python_version', dockerfile.DEFAULT_PYTHON_VERSION)
+        base_requirements = (agent.metadata or {}).get('dependencies', {}).get('base') or self.get_dependencies()
+        requirements = agent.dependencies or self.get_dependencies()
+        agent_requirements = dockerfile.agent_requirements(requirements, base_requirements)
+        base_image = dockerfile.base_image_tag(self.framework_name, base_requirements, python_version)
+        deployment_config = agent.deployment_config or {}
+        
         return {
-            'dockerfile': f"""
-FROM python:3.10-slim
-
-WORKDIR /app
-
-COPY requirements.txt .
-RUN pip install -r requirements.txt
-
-COPY . .
-
-CMD ["python", "app.py"]
-""",
-            'requirements': '\n'.join(self.get_dependencies()),
+            'dockerfile': dockerfile.generate_agent_dockerfile(
+                agent.id, self.framework_name, base_image, agent_requirements,
+                entrypoint='src/server.py' if deployment_config.get('asgi_app') else 'src/agent.py',
+                python_version=python_version,
+                port=deployment_config.get('port', 8000)
+            ),
+            'base_dockerfile': dockerfile.generate_base_dockerfile(python_version),
+            'base_image': base_image,
+            'requirements': '\n'.join(requirements),
+            'base_requirements': '\n'.join(base_requirements),
+            'agent_requirements': '\n'.join(agent_requirements),
             'compose': {
                 'version': '3.8',
                 'services': {
                     agent.id: {
-                        'build': '.',
+                        'build': {
+                            'context': '..',
+                            'dockerfile': 'deployment/Dockerfile',
+                            'args': {'BASE_IMAGE': base_image}
+                        },
                         'ports': ['8000:8000'],
                         'environment': {
                             'OPENAI_API_KEY': '${OPENAI_API_KEY}'
@@ -281,9 +318,15 @@ CMD ["python", "app.py"]
             }
         }
     
-    def _generate_k8s_deployment(self, agent: Agent) -> Dict[str, Any]:
-        """Generate Kubernetes deployment"""
-        return {
+    def _generate_k8s_deployment(self, agent: Agent,
+                                 profile: Optional[sizing.PerformanceProfile] = None) -> Dict[str, Any]:
+        """
+        Generate Kubernetes deployment. With a profile, a List of the
+        Deployment (with resources, admission limits and probes) and its
+        HorizontalPodAutoscaler, or KEDA ScaledObject if scaling['autoscaler']
+        is 'keda'.
+        """
+        deployment = {
             'apiVersion': 'apps/v1',
             'kind': 'Deployment',
             'metadata': {
@@ -312,16 +355,60 @@ CMD ["python", "app.py"]
                 }
             }
         }
+        
+        if profile is None:
+            return deployment
+        
+        scaling = (agent.configuration or {}).get('scaling', {})
+        replicas = sizing.replica_range(profile, scaling)
+        deployment['spec']['replicas'] = replicas['min']
+        
+        # Admit the work in flight the profile measured, and queue as much again
+        concurrency = sizing.container_concurrency(profile)
+        container = deployment['spec']['template']['spec']['containers'][0]
+        container.update({
+            'resources': sizing.kubernetes_resources(profile),
+            'env': [
+                {'name': 'AGENT_MAX_CONCURRENCY', 'value': str(concurrency)},
+                {'name': 'AGENT_MAX_QUEUE', 'value': str(concurrency)}
+            ],
+            'readinessProbe': {
+                'httpGet': {'path': '/readyz', 'port': 8000},
+                'periodSeconds': 5
+            },
+            'livenessProbe': {
+                'httpGet': {'path': '/healthz', 'port': 8000},
+                'periodSeconds': 10,
+                'failureThreshold': 3
+            }
+        })
+        
+        if scaling.get('autoscaler') == 'keda':
+            autoscaler = sizing.keda_spec(agent.id, profile, scaling)
+        else:
+            autoscaler = sizing.hpa_spec(agent.id, profile, scaling)
+        
+        return {
+            'apiVersion': 'v1',
+            'kind': 'List',
+            'items': [deployment, autoscaler]
+        }
     
-    def _generate_aws_deployment(self, agent: Agent) -> Dict[str, Any]:
+    def _generate_aws_deployment(self, agent: Agent,
+                                 profile: Optional[sizing.PerformanceProfile] = None) -> Dict[str, Any]:
         """Generate AWS deployment configuration"""
-        return {
+        deployment = {
             'service': 'AWS Lambda',
             'runtime': 'python3.10',
             'handler': 'lambda_function.lambda_handler',
             'timeout': 300,
             'memory': 512
         }
+        
+        if profile is not None:
+            deployment.update(sizing.lambda_settings(profile, (agent.configuration or {}).get('scaling', {})))
+        
+        return deployment
     
     def _generate_azure_deployment(self, agent: Agent) -> Dict[str, Any]:
         """Generate Azure deployment configuration"""
@@ -0,0 +1,188 @@
+"""
+LangChain Component Extraction for AgentForge
+AST-based discovery of LangChain components in agent source files
+"""
+
+import ast
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+from framework_abstractions.source import AgentSource, SourceFile
+
+
+COMPONENT_KINDS = ['chains', 'agents', 'tools', 'memory', 'callbacks', 'embeddings', 'llm']
+
+# Model classes that are LLMs despite not following a naming convention
+LLM_CLASSES = {
+    'OpenAI', 'ChatOpenAI', 'AzureOpenAI', 'AzureChatOpenAI',
+    'Anthropic', 'ChatAnthropic', 'VertexAI', 'ChatVertexAI',
+    'ChatGoogleGenerativeAI', 'Bedrock', 'ChatBedrock', 'Ollama', 'ChatOllama',
+    'Cohere', 'ChatCohere', 'ChatMistralAI', 'HuggingFaceHub', 'HuggingFacePipeline'
+}
+
+# Functions that construct agents rather than classes
+AGENT_FACTORIES = {
+    'initialize_agent', 'create_react_agent', 'create_openai_functions_agent',
+    'create_openai_tools_agent', 'create_tool_calling_agent', 'create_structured_chat_agent'
+}
+
+# Extracted components per file content hash, shared by every build in the process
+_MEMO_SIZE = 4096
+_memo: 'OrderedDict[str, Dict[str, List[Dict[str, Any]]]]' = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def extract_components(source: AgentSource) -> Dict[str, Any]:
+    """
+    Extract LangChain components from agent source, file by file.
+
+    Returns:
+        A list per component kind (see COMPONENT_KINDS). Each item holds the
+        file, the component 'name', what it was built from ('base' for
+        classes, 'constructor' for calls, 'decorator' for functions), and
+        its 'lineno'/'end_lineno' span. Files that fail to parse or decode
+        are listed under 'errors' and contribute no components.
+    """
+    components: Dict[str, Any] = {kind: [] for kind in COMPONENT_KINDS}
+    components['errors'] = []
+
+    for source_file in source:
+        try:
+            file_components = _extract_file(source_file)
+        except (SyntaxError, ValueError, UnicodeDecodeError) as e:
+            # Not parseable Python (NUL bytes, undecodable text): no components
+            components['errors'].append({'file': source_file.name, 'error': str(e)})
+            continue
+
+        for kind in COMPONENT_KINDS:
+            components[kind].extend(dict(item, file=source_file.name) for item in file_components[kind])
+
+    return components
+
+
+def clear_memo():
+    """Forget memoized extraction results"""
+    with _memo_lock:
+        _memo.clear()
+
+
+def classify(name: str) -> Optional[str]:
+    """Component kind of a LangChain class or factory name, if any"""
+    if name in LLM_CLASSES:
+        return 'llm'
+    if name in AGENT_FACTORIES or name.endswith('Agent') or name == 'AgentExecutor':
+        return 'agents'
+    if name.endswith('Chain'):
+        return 'chains'
+    if name.endswith('Tool') or name.endswith('Toolkit'):
+        return 'tools'
+    if name.endswith('Memory') or name.endswith('ChatMessageHistory'):
+        return 'memory'
+    if name.endswith('CallbackHandler'):
+        return 'callbacks'
+    if name.endswith('Embeddings'):
+        return 'embeddings'
+    return None
+
+
+# Private helper functions
+
+def _extract_file(source_file: SourceFile) -> Dict[str, List[Dict[str, Any]]]:
+    """Extract one file's components, reusing earlier results for identical content"""
+    # Read once: the same bytes are hashed and, on a miss, parsed
+    data = source_file.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+
+    with _memo_lock:
+        if digest in _memo:
+            _memo.move_to_end(digest)
+            return _memo[digest]
+
+    tree = ast.parse(data, filename=source_file.name)
+    file_components = _ComponentVisitor().extract(tree)
+
+    with _memo_lock:
+        _memo[digest] = file_components
+        while len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+
+    return file_components
+
+
+class _ComponentVisitor:
+    """Single walk over a module's AST collecting components"""
+
+    def extract(self, tree: ast.AST) -> Dict[str, List[Dict[str, Any]]]:
+        self.components = {kind: [] for kind in COMPONENT_KINDS}
+        self.assigned: Dict[int, str] = {}
+
+        # ast.walk is breadth-first, so an assignment is always seen before
+        # the call on its right-hand side
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Assign, ast.AnnAssign)) and isinstance(node.value, ast.Call):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                self.assigned[id(node.value)] = _dotted_name(targets[0]) or ''
+            elif isinstance(node, ast.ClassDef):
+                self._visit_class(node)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._visit_function(node)
+            elif isinstance(node, ast.Call):
+                self._visit_call(node)
+
+        for items in self.components.values():
+            items.sort(key=lambda item: item['lineno'])
+        return self.components
+
+    def _visit_class(self, node: ast.ClassDef):
+        bases = [_dotted_name(base) or '' for base in node.bases]
+        for base in bases:
+            kind = classify(base.rsplit('.', 1)[-1])
+            if kind:
+                self._add(kind, node, name=node.name, base=base)
+                return
+
+        # Plain classes named like a chain or agent, e.g. `class FraudAgent:`
+        kind = classify(node.name)
+        if kind in ('agents', 'chains'):
+            self._add(kind, node, name=node.name, base=None)
+
+    def _visit_function(self, node):
+        for decorator in node.decorator_list:
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            if _dotted_name(target) in ('tool', 'langchain.tools.tool', 'langchain_core.tools.tool'):
+                self._add('tools', node, name=node.name, decorator='tool')
+                return
+
+    def _visit_call(self, node: ast.Call):
+        constructor = _dotted_name(node.func)
+        if not constructor:
+            return
+
+        # Tool.from_function(...) is a tool, ChatOpenAI(...) is an llm
+        parts = constructor.split('.')
+        if parts[-1] in ('from_function', 'from_llm', 'from_chain_type', 'from_llm_and_tools') and len(parts) > 1:
+            kind = classify(parts[-2])
+        else:
+            kind = classify(parts[-1])
+
+        if kind:
+            self._add(kind, node, name=self.assigned.get(id(node)) or None, constructor=constructor)
+
+    def _add(self, kind: str, node: ast.AST, **details):
+        details['lineno'] = node.lineno
+        details['end_lineno'] = getattr(node, 'end_lineno', node.lineno)
+        self.components[kind].append(details)
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """'a.b.c' for Name/Attribute chains, None for anything else"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return '.'.join(reversed(parts))
+    return None
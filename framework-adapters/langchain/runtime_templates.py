@@ -0,0 +1,644 @@
+"""
+LangChain Runtime Templates for AgentForge
+Code fragments that optimizations splice into generated LangChain agents
+"""
+
+# Anchors in the code generated by LangChainAdapter._generate_langchain_code
+IMPORTS_END = "from langchain.prompts import PromptTemplate\n"
+INIT_END = "        self.agent = self._initialize_agent()\n"
+
+SYNC_RUN = """    def run(self, input_text, session_id=None):
+        history = self.sessions.history(session_id)
+        result = self.agent.invoke({'input': input_text, 'chat_history': history})
+        output = result.get('output', result) if isinstance(result, dict) else result
+        self.sessions.record(session_id, input_text, output)
+        return output
+"""
+
+# Per-session conversation memory, part of every generated agent
+SESSION_MEMORY = """class _Session:
+    __slots__ = ('turns', 'summary', 'tokens', 'size', 'touched')
+    
+    def __init__(self):
+        self.turns = deque()  # (human, ai, tokens) tuples
+        self.summary = None
+        self.tokens = 0
+        self.size = 0
+        self.touched = time.monotonic()
+
+
+class SessionMemory:
+    \"\"\"
+    Conversation history per session, configured by config['memory']:
+    
+        strategy          'window' (last window_turns turns), 'token'
+                          (newest turns within max_tokens), 'summary' (like
+                          'token', folding older turns into an LLM summary)
+                          or 'none'
+        idle_ttl_seconds  Forget sessions idle this long
+        max_sessions      Forget least recently used sessions beyond this
+        max_bytes         ... or beyond this much stored text
+    
+    Turns are stored as plain string tuples; messages are built per call.
+    \"\"\"
+    
+    def __init__(self, config, llm=None):
+        self.strategy = config.get('strategy', 'window')
+        self.window_turns = config.get('window_turns', 10)
+        self.max_tokens = config.get('max_tokens', 2000)
+        self.idle_ttl = config.get('idle_ttl_seconds', 1800)
+        self.max_sessions = config.get('max_sessions', 10000)
+        self.max_bytes = config.get('max_bytes', 64 * 1024 * 1024)
+        self.llm = llm
+        self.size = 0
+        self.evicted = 0
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def history(self, session_id):
+        \"\"\"Chat history messages of a session (none without a session_id)\"\"\"
+        if session_id is None or self.strategy == 'none':
+            return []
+        
+        with self._lock:
+            self._evict()
+            session = self._sessions.get(session_id)
+            if session is None:
+                return []
+            self._sessions.move_to_end(session_id)
+            session.touched = time.monotonic()
+            summary, turns = session.summary, list(session.turns)
+        
+        messages = [SystemMessage(content=f"Summary of the conversation so far: {summary}")] if summary else []
+        for human, ai, _ in turns:
+            messages.append(HumanMessage(content=human))
+            messages.append(AIMessage(content=ai))
+        return messages
+    
+    def record(self, session_id, human, ai):
+        \"\"\"Add a turn to a session\"\"\"
+        folded = self._append(session_id, human, ai)
+        if folded:
+            summary = self.llm.invoke(self._summary_prompt(*folded))
+            self._set_summary(session_id, getattr(summary, 'content', summary))
+    
+    async def arecord(self, session_id, human, ai):
+        \"\"\"Add a turn to a session, summarizing without blocking\"\"\"
+        folded = self._append(session_id, human, ai)
+        if folded:
+            summary = await self.llm.ainvoke(self._summary_prompt(*folded))
+            self._set_summary(session_id, getattr(summary, 'content', summary))
+    
+    def stats(self):
+        return {'sessions': len(self._sessions), 'bytes': self.size, 'evicted': self.evicted}
+    
+    def _append(self, session_id, human, ai):
+        \"\"\"Store a turn and trim the session; returns turns to fold into its summary\"\"\"
+        if session_id is None or self.strategy == 'none':
+            return None
+        
+        ai = str(ai)
+        tokens = self._count_tokens(human) + self._count_tokens(ai) if self.strategy != 'window' else 0
+        folded = []
+        
+        with self._lock:
+            session = self._sessions.pop(session_id, None) or _Session()
+            self._sessions[session_id] = session
+            session.touched = time.monotonic()
+            session.turns.append((human, ai, tokens))
+            session.tokens += tokens
+            self._resize(session, len(human) + len(ai))
+            
+            while len(session.turns) > 1 and (
+                    len(session.turns) > self.window_turns if self.strategy == 'window'
+                    else session.tokens > self.max_tokens):
+                old_human, old_ai, old_tokens = session.turns.popleft()
+                session.tokens -= old_tokens
+                self._resize(session, -len(old_human) - len(old_ai))
+                if self.strategy == 'summary':
+                    folded.append((old_human, old_ai))
+            
+            self._evict()
+            return (session.summary, folded) if folded else None
+    
+    def _set_summary(self, session_id, summary):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._resize(session, len(summary) - len(session.summary or ''))
+                session.summary = summary
+    
+    def _summary_prompt(self, summary, turns):
+        lines = '\\n'.join(f"Human: {human}\\nAI: {ai}" for human, ai in turns)
+        return (
+            'Progressively summarize the conversation, adding onto the previous summary.\\n\\n'
+            f"Previous summary: {summary or '(none)'}\\n\\nNew lines:\\n{lines}\\n\\nNew summary:"
+        )
+    
+    def _count_tokens(self, text):
+        try:
+            return self.llm.get_num_tokens(text)
+        except Exception:
+            return len(text) // 4 + 1
+    
+    def _resize(self, session, delta):
+        session.size += delta
+        self.size += delta
+    
+    def _evict(self):
+        # Least recently used first, so idle sessions are at the front
+        now = time.monotonic()
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if (now - session.touched <= self.idle_ttl and len(self._sessions) <= self.max_sessions
+                    and self.size <= self.max_bytes):
+                return
+            del self._sessions[session_id]
+            self.size -= session.size
+            self.evicted += 1
+
+
+"""
+
+# Native async execution with a concurrency limit ('async' optimization)
+ASYNC_IMPORTS = """import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+"""
+
+ASYNC_INIT = """        self._semaphore = None
+        self._executor = None
+"""
+
+ASYNC_RUN = """    async def run(self, input_text, session_id=None):
+        async with self._concurrency():
+            return await self._ainvoke(input_text, session_id)
+    
+    def _concurrency(self):
+        # Created on first use so it belongs to the serving event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.config.get('max_concurrency', 16))
+        return self._semaphore
+    
+    async def _ainvoke(self, input_text, session_id=None):
+        inputs = {'input': input_text, 'chat_history': self.sessions.history(session_id)}
+        if hasattr(self.agent, 'ainvoke'):
+            result = await self.agent.ainvoke(inputs)
+            output = result.get('output', result) if isinstance(result, dict) else result
+        elif hasattr(self.agent, 'arun'):
+            output = await self.agent.arun(**inputs)
+        else:
+            # No async path: keep the blocking call off the event loop
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.config.get('max_concurrency', 16))
+            loop = asyncio.get_running_loop()
+            output = await loop.run_in_executor(self._executor, functools.partial(self.agent.run, **inputs))
+        
+        await self.sessions.arecord(session_id, input_text, output)
+        return output
+"""
+
+# Anchors for module-level code and extra LangChainAgent methods
+CLASS_START = "class LangChainAgent:\n"
+METHODS_START = "    def _initialize_tools(self):\n"
+
+# Bounded LLM response caches ('cache' optimization)
+CACHE_IMPORTS = """import pickle
+import sqlite3
+import hashlib
+import stat
+import tempfile
+try:
+    from langchain_core.caches import BaseCache
+except ImportError:
+    from langchain.cache import BaseCache
+try:
+    from langchain.globals import set_llm_cache
+except ImportError:
+    def set_llm_cache(cache):
+        import langchain
+        langchain.llm_cache = cache
+"""
+
+CACHE_BACKENDS = """class LRUCache(BaseCache):
+    \"\"\"In-memory LLM cache holding at most max_entries responses\"\"\"
+    
+    backend = 'memory'
+    
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def lookup(self, prompt, llm_string):
+        with self._lock:
+            value = self._entries.get((prompt, llm_string))
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((prompt, llm_string))
+            self.hits += 1
+            return value
+    
+    def update(self, prompt, llm_string, return_val):
+        with self._lock:
+            self._entries[(prompt, llm_string)] = return_val
+            self._entries.move_to_end((prompt, llm_string))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self, **kwargs):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        return {'entries': len(self._entries)}
+
+
+class SQLiteCache(BaseCache):
+    \"\"\"
+    LLM cache in a SQLite file shared by this user's workers on the node.
+    Entries expire after ttl_seconds; past max_bytes the least recently
+    used entries are evicted.
+    \"\"\"
+    
+    backend = 'sqlite'
+    EVICT_EVERY = 64
+    
+    def __init__(self, path, ttl_seconds=None, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._updates = 0
+        self._local = threading.local()
+        self._check_private(path)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS llm_cache ('
+                'key TEXT PRIMARY KEY, value BLOB, size INTEGER, created REAL, accessed REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)')
+    
+    def lookup(self, prompt, llm_string):
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT value, created, accessed FROM llm_cache WHERE key = ?', (self._key(prompt, llm_string),)
+        ).fetchone()
+        
+        if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+            self.misses += 1
+            return None
+        
+        # Refresh recency at most once a minute to keep reads cheap
+        if now - row[2] > 60:
+            with conn:
+                conn.execute('UPDATE llm_cache SET accessed = ? WHERE key = ?', (now, self._key(prompt, llm_string)))
+        self.hits += 1
+        return pickle.loads(row[0])
+    
+    def update(self, prompt, llm_string, return_val):
+        value = pickle.dumps(return_val)
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)',
+                (self._key(prompt, llm_string), value, len(value), now, now)
+            )
+        
+        self._updates += 1
+        if self._updates % self.EVICT_EVERY == 0:
+            self._evict(conn)
+    
+    def clear(self, **kwargs):
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM llm_cache')
+    
+    def stats(self):
+        entries, size = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache'
+        ).fetchone()
+        return {'entries': entries, 'bytes': size, 'path': self.path}
+    
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+    
+    def _check_private(self, path):
+        # Entries are unpickled, so nobody but this user may write the file or its directory
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # A new database (and its WAL files, which copy its mode) is readable by this user only
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | getattr(os, 'O_NOFOLLOW', 0), 0o600))
+        for target in (directory, path):
+            info = os.lstat(target)
+            if stat.S_ISLNK(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o022:
+                raise PermissionError(
+                    f"{target} must belong to this user and not be writable by others to hold the LLM cache"
+                )
+    
+    def _key(self, prompt, llm_string):
+        return hashlib.sha256(f"{llm_string}\\0{prompt}".encode()).hexdigest()
+    
+    def _evict(self, conn):
+        with conn:
+            if self.ttl_seconds:
+                conn.execute('DELETE FROM llm_cache WHERE created < ?', (time.time() - self.ttl_seconds,))
+            
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_cache').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            
+            # Evict down to 90% of the limit, least recently used first
+            excess = total - int(self.max_bytes * 0.9)
+            keys = []
+            for key, size in conn.execute('SELECT key, size FROM llm_cache ORDER BY accessed'):
+                keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany('DELETE FROM llm_cache WHERE key = ?', keys)
+
+
+def default_cache_path():
+    \"\"\"llm-cache.sqlite in this user's agentforge cache directory\"\"\"
+    if os.environ.get('XDG_CACHE_HOME'):
+        root = os.environ['XDG_CACHE_HOME']
+    else:
+        home = os.path.expanduser('~')
+        if home in ('', '/') or not os.access(home, os.W_OK):
+            return os.path.join(tempfile.gettempdir(), f"agentforge-cache-{os.getuid()}", 'llm-cache.sqlite')
+        root = os.path.join(home, '.cache')
+    return os.path.join(root, 'agentforge', 'llm-cache.sqlite')
+
+
+def create_llm_cache(config):
+    \"\"\"LLM cache selected by config['cache_backend'] (memory, sqlite or none)\"\"\"
+    backend = config.get('cache_backend', 'memory')
+    if backend == 'none':
+        return None
+    if backend == 'sqlite':
+        return SQLiteCache(
+            config.get('cache_path') or default_cache_path(),
+            ttl_seconds=config.get('cache_ttl_seconds'),
+            max_bytes=config.get('cache_max_bytes', 256 * 1024 * 1024)
+        )
+    if backend == 'memory':
+        return LRUCache(config.get('cache_max_entries', 1024))
+    raise ValueError(f"Unknown cache backend {backend}")
+
+
+"""
+
+CACHE_INIT = """        self.llm_cache = create_llm_cache(config)
+        if self.llm_cache is not None:
+            set_llm_cache(self.llm_cache)
+"""
+
+CACHE_METHODS = """    def cache_stats(self):
+        \"\"\"Hit rate and size of the LLM response cache in this process\"\"\"
+        if self.llm_cache is None:
+            return {'backend': 'none'}
+        lookups = self.llm_cache.hits + self.llm_cache.misses
+        return dict(
+            self.llm_cache.stats(),
+            backend=self.llm_cache.backend,
+            hits=self.llm_cache.hits,
+            misses=self.llm_cache.misses,
+            hit_rate=self.llm_cache.hits / lookups if lookups else 0.0
+        )
+    
+"""
+
+# Token streaming and HTTP serving ('streaming' optimization)
+LLM_ARGS_END = "            temperature=config.get('temperature', 0.7)\n"
+
+STREAM_LLM_ARGS = """            temperature=config.get('temperature', 0.7),
+            streaming=config.get('streaming', True)
+"""
+
+STREAM_IMPORTS = """import json
+try:
+    from langchain_core.callbacks import AsyncCallbackHandler
+except ImportError:
+    from langchain.callbacks.base import AsyncCallbackHandler
+"""
+
+STREAM_BACKEND = """class TokenStreamHandler(AsyncCallbackHandler):
+    \"\"\"Queues LLM tokens as they arrive\"\"\"
+    
+    def __init__(self):
+        self.queue = asyncio.Queue()
+    
+    async def on_llm_new_token(self, token, **kwargs):
+        self.queue.put_nowait(token)
+
+
+def sse_event(data, event=None):
+    \"\"\"Encode one server-sent event\"\"\"
+    message = f"event: {event}\\n" if event else ''
+    return f"{message}data: {json.dumps(data, default=str)}\\n\\n".encode('utf-8')
+
+
+"""
+
+STREAM_METHODS = """    async def stream(self, input_text, session_id=None):
+        \"\"\"Yield the response token by token as the LLM produces it\"\"\"
+        tokens = self._stream(input_text, session_id)
+        try:
+            if not hasattr(self, '_concurrency'):
+                async for token in tokens:
+                    yield token
+                return
+            # A stream holds a max_concurrency permit until its last token, like run()
+            async with self._concurrency():
+                async for token in tokens:
+                    yield token
+        finally:
+            await tokens.aclose()
+    
+    async def _stream(self, input_text, session_id=None):
+        inputs = {'input': input_text, 'chat_history': self.sessions.history(session_id)}
+        
+        if hasattr(self.agent, 'astream_events'):
+            root_run, output, streamed = None, None, False
+            async for event in self.agent.astream_events(inputs, version='v1'):
+                root_run = root_run or event['run_id']
+                if event['event'] in ('on_chat_model_stream', 'on_llm_stream'):
+                    chunk = event['data'].get('chunk')
+                    token = chunk if isinstance(chunk, str) else getattr(chunk, 'content', None) or getattr(chunk, 'text', '')
+                    if token:
+                        streamed = True
+                        yield token
+                elif event['event'] == 'on_chain_end' and event['run_id'] == root_run:
+                    output = event['data'].get('output')
+            output = output.get('output', output) if isinstance(output, dict) else output
+            if not streamed and output:
+                # Nothing reached the LLM (e.g. a cache hit): send the answer as one chunk
+                yield output
+            await self.sessions.arecord(session_id, input_text, output or '')
+            return
+        
+        if hasattr(self.agent, 'ainvoke'):
+            handler = TokenStreamHandler()
+            task = asyncio.ensure_future(self.agent.ainvoke(inputs, config={'callbacks': [handler]}))
+            streamed = False
+            try:
+                while True:
+                    token = asyncio.ensure_future(handler.queue.get())
+                    done, _ = await asyncio.wait({token, task}, return_when=asyncio.FIRST_COMPLETED)
+                    if token in done:
+                        streamed = True
+                        yield token.result()
+                        continue
+                    token.cancel()
+                    while not handler.queue.empty():
+                        streamed = True
+                        yield handler.queue.get_nowait()
+                    output = task.result()
+                    output = output.get('output', output) if isinstance(output, dict) else output
+                    if not streamed and output:
+                        yield output
+                    await self.sessions.arecord(session_id, input_text, output)
+                    return
+            finally:
+                task.cancel()
+        
+        # No streaming path: the whole response is one chunk
+        if hasattr(self, '_ainvoke'):
+            # Not run(): stream() already holds this call's permit
+            yield await self._ainvoke(input_text, session_id)
+        else:
+            yield await self.run_async(input_text, session_id)
+    
+    async def run_async(self, input_text, session_id=None):
+        \"\"\"Await run(), whether the generated run() is async or blocking\"\"\"
+        if asyncio.iscoroutinefunction(self.run):
+            return await self.run(input_text, session_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.run, input_text, session_id)
+    
+"""
+
+STREAM_APP = """
+
+def create_agent(config_path=None):
+    \"\"\"Agent configured from config/agent_config.json (or $AGENT_CONFIG)\"\"\"
+    config_path = config_path or os.environ.get('AGENT_CONFIG') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'agent_config.json'
+    )
+    config = {}
+    if os.path.exists(config_path):
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+    return LangChainAgent(config)
+
+
+class AgentApp:
+    \"\"\"
+    Minimal ASGI app: POST /run answers {"input": ..., "session_id": ...}
+    with {"output": ...}, POST /stream answers with server-sent token events
+    and a final 'done' (or 'error') event. session_id is optional.
+    \"\"\"
+    
+    def __init__(self, factory=create_agent):
+        self.factory = factory
+        self._agent = None
+    
+    @property
+    def agent(self):
+        if self._agent is None:
+            self._agent = self.factory()
+        return self._agent
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    try:
+                        self.agent
+                    except Exception as e:
+                        await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                        return
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        
+        if scope['type'] != 'http':
+            return
+        
+        if scope['method'] != 'POST' or scope['path'] not in ('/run', '/stream'):
+            await self.send_json(send, 404, {'error': 'Not found'})
+            return
+        
+        try:
+            request = json.loads(await self.read_body(receive) or b'{}')
+            input_text, session_id = request['input'], request.get('session_id')
+        except (ValueError, KeyError, TypeError, AttributeError):
+            await self.send_json(send, 400, {'error': 'Expected a JSON body with an "input" field'})
+            return
+        
+        if scope['path'] == '/run':
+            try:
+                output = await self.agent.run_async(input_text, session_id)
+            except Exception as e:
+                await self.send_json(send, 500, {'error': str(e)})
+                return
+            await self.send_json(send, 200, {'output': output})
+            return
+        
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no')
+            ]
+        })
+        try:
+            async for token in self.agent.stream(input_text, session_id):
+                await send({'type': 'http.response.body', 'body': sse_event(token), 'more_body': True})
+            final = sse_event('', event='done')
+        except Exception as e:
+            final = sse_event(str(e), event='error')
+        await send({'type': 'http.response.body', 'body': final, 'more_body': False})
+    
+    async def read_body(self, receive):
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                return body
+    
+    async def send_json(self, send, status, payload):
+        body = json.dumps(payload, default=str).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+app = AgentApp()
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host=os.environ.get('HOST', '0.0.0.0'), port=int(os.environ.get('PORT', 8000)))
+"""
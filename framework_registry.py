@@ -4,10 +4,18 @@ Central registry of all supported frameworks with connections to inferloop-agent
 """
 
 import os
+import copy
 import importlib
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, List, Union
 from dataclasses import dataclass
 
+from agent_catalog import AgentCatalog
+from framework_abstractions.source import AgentSource
+from framework_abstractions.base import CompactAgent
+from framework_abstractions import tracing
+
 
 @dataclass
 class FrameworkInfo:
@@ -144,6 +152,13 @@ class FrameworkRegistry:
     # Path to inferloop-agents repository
     AGENTS_REPO_PATH = '/home/dmiruke/agent-dev-products/inferloop-agents'
     
+    # Process-wide adapter instances; None records an adapter not yet implemented
+    _adapters: Dict[str, Any] = {}
+    _adapters_lock = threading.Lock()
+    
+    # Catalog index per repository path, built on first use
+    _catalogs: Dict[str, AgentCatalog] = {}
+    
     @classmethod
     def get_framework(cls, name: str) -> FrameworkInfo:
         """Get framework information by name"""
@@ -160,10 +175,46 @@ class FrameworkRegistry:
     def get_adapter(cls, framework_name: str):
         """
         Get framework adapter instance.
-        Dynamically imports and instantiates the adapter.
+        Dynamically imports and instantiates the adapter on first use; later
+        calls, from any thread or task, share the same instance. Adapters
+        therefore must not keep per-build state.
         """
+        try:
+            return cls._adapters[framework_name]
+        except KeyError:
+            pass
+        
         framework = cls.get_framework(framework_name)
         
+        # Only first use is traced: later calls are a dict lookup
+        with tracing.span('get_adapter', framework=framework_name), cls._adapters_lock:
+            if framework_name not in cls._adapters:
+                cls._adapters[framework_name] = cls._load_adapter(framework)
+            return cls._adapters[framework_name]
+    
+    @classmethod
+    def warmup(cls, frameworks: Optional[List[str]] = None) -> Dict[str, bool]:
+        """
+        Import and instantiate adapters ahead of time.
+        Long-running build services call this at startup so builds never pay
+        import costs. Returns whether each framework has an adapter.
+        """
+        return {
+            name: cls.get_adapter(name) is not None
+            for name in (frameworks or cls.list_frameworks())
+        }
+    
+    @classmethod
+    def clear_adapter_cache(cls):
+        """Forget cached adapters, e.g. after installing a new adapter module"""
+        with cls._adapters_lock:
+            cls._adapters.clear()
+    
+    @classmethod
+    def _load_adapter(cls, framework: FrameworkInfo):
+        """Import and instantiate the adapter for a framework, or None"""
+        framework_name = framework.name
+        
         # Parse module and class names
         module_path, class_name = framework.adapter_module.rsplit('.', 1)
         
@@ -189,51 +240,54 @@ class FrameworkRegistry:
         Get agent template from inferloop-agents repository.
         Preserves existing functionality.
         """
-        agent_path = os.path.join(cls.AGENTS_REPO_PATH, 'archived', 'old-agents', category, agent_name)
-        
-        if not os.path.exists(agent_path):
-            # Try new structure
-            agent_path = os.path.join(cls.AGENTS_REPO_PATH, 'agentic-frameworks', 'agents-catalog', category, agent_name)
+        with tracing.span('get_agent_from_repo', category=category, agent=agent_name) as span:
+            catalog = cls.get_catalog()
+            entry = catalog.get(category, agent_name)
+            
+            if entry is None and catalog.refresh_if_stale():
+                # The agent may have been added since the index was built
+                entry = catalog.get(category, agent_name)
+            
+            if entry is None:
+                raise ValueError(f"Agent {category}/{agent_name} not found in repository")
+            if entry.error:
+                raise ValueError(f"Agent {category}/{agent_name} is invalid: {entry.error}")
+            span.set_attribute('source_files', len(entry.source_files))
         
-        if not os.path.exists(agent_path):
-            raise ValueError(f"Agent {category}/{agent_name} not found in repository")
+        # Source files are opened lazily: 'source' streams them file by file
+        # and each 'source_files' item, a read-only {'name', 'content'}
+        # mapping, reads its file on ['content'] access (to_dict() for JSON).
+        # Their reads are counted on whichever stage reads them. Callers are
+        # free to modify the result, so nothing is shared with the index.
+        source = AgentSource.from_directory(os.path.join(entry.path, 'src'), entry.source_files)
         
-        # Read agent files
-        agent_data = {
+        return {
             'category': category,
             'name': agent_name,
-            'path': agent_path,
-            'source_files': [],
-            'config': {},
-            'requirements': []
+            'path': entry.path,
+            'source': source,
+            'source_files': list(source),
+            'config': copy.deepcopy(entry.config),
+            'requirements': list(entry.requirements)
         }
-        
-        # Read source files
-        src_path = os.path.join(agent_path, 'src')
-        if os.path.exists(src_path):
-            for file in os.listdir(src_path):
-                if file.endswith('.py'):
-                    file_path = os.path.join(src_path, file)
-                    with open(file_path, 'r') as f:
-                        agent_data['source_files'].append({
-                            'name': file,
-                            'content': f.read()
-                        })
-        
-        # Read requirements
-        req_file = os.path.join(agent_path, 'requirements.txt')
-        if os.path.exists(req_file):
-            with open(req_file, 'r') as f:
-                agent_data['requirements'] = f.read().strip().split('\n')
-        
-        # Read config if exists
-        config_file = os.path.join(agent_path, 'agent.yaml')
-        if os.path.exists(config_file):
-            import yaml
-            with open(config_file, 'r') as f:
-                agent_data['config'] = yaml.safe_load(f)
-        
-        return agent_data
+    
+    @classmethod
+    def get_catalog(cls) -> AgentCatalog:
+        """Get the catalog index for the inferloop-agents repository"""
+        repo_path = cls.AGENTS_REPO_PATH
+        if repo_path not in cls._catalogs:
+            cls._catalogs[repo_path] = AgentCatalog(repo_path)
+        return cls._catalogs[repo_path]
+    
+    @classmethod
+    def list_agents(cls, category: Optional[str] = None) -> List[str]:
+        """List agents in inferloop-agents as 'category/agent_name'"""
+        return cls.get_catalog().list_agents(category)
+    
+    @classmethod
+    def list_categories(cls) -> List[str]:
+        """List agent categories in inferloop-agents"""
+        return cls.get_catalog().list_categories()
     
     @classmethod
     def build_agent_with_framework(cls, 
@@ -246,17 +300,79 @@ class FrameworkRegistry:
         This is the main integration point between repos.
         """
         
-        # Get agent from repository
-        agent_data = cls.get_agent_from_repo(agent_category, agent_name)
-        
         # Get framework adapter
         adapter = cls.get_adapter(target_framework)
         
         if not adapter:
             raise ValueError(f"Framework {target_framework} adapter not available")
         
-        # Combine source files
-        source_code = "\n\n".join([f['content'] for f in agent_data['source_files']])
+        return cls._build_with_adapter(adapter, agent_category, agent_name, config)
+    
+    @classmethod
+    def build_agents_parallel(cls,
+                              agents: List[str],
+                              target_frameworks: Union[str, List[str]],
+                              config: Optional[Dict] = None,
+                              max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Build many agents across a pool of worker processes.
+        
+        Args:
+            agents: Agents as 'category/agent_name'
+            target_frameworks: Framework, or list of frameworks, to build
+                every agent with
+            config: Configuration merged into every build
+            max_workers: Number of worker processes (default: CPU count)
+        
+        Returns:
+            One result per agent and framework, in input order, with keys
+            agent_category, agent_name, framework, success, agent, valid
+            and error. Agents come back as CompactAgents: self-contained
+            when pickled back from the workers, and sharing compiled code
+            once received. A failing build never affects the others.
+        """
+        if isinstance(target_frameworks, str):
+            target_frameworks = [target_frameworks]
+        
+        # A malformed spec fails on its own, like a failing build
+        jobs = []
+        for agent in agents:
+            agent_category, _, agent_name = agent.partition('/') if isinstance(agent, str) else ('', '', '')
+            for framework in target_frameworks:
+                if agent_category and agent_name:
+                    jobs.append(((agent_category, agent_name, framework), None))
+                else:
+                    error = f"ValueError: Agent {agent!r} is not in 'category/agent_name' form"
+                    jobs.append(((str(agent), None, framework), error))
+        
+        results = []
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_build_worker,
+                                 initargs=(target_frameworks, cls.AGENTS_REPO_PATH)) as pool:
+            futures = [None if error else pool.submit(_build_in_worker, *job, config) for job, error in jobs]
+            
+            for (job, error), future in zip(jobs, futures):
+                if future is None:
+                    results.append(_build_result(*job, error=error))
+                    continue
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # The worker itself died (e.g. killed or out of memory)
+                    results.append(_build_result(*job, error=f"{type(e).__name__}: {e}"))
+        
+        return results
+    
+    @classmethod
+    def _build_with_adapter(cls,
+                            adapter: Any,
+                            agent_category: str,
+                            agent_name: str,
+                            config: Optional[Dict] = None) -> Any:
+        """Build and optimize an agent from inferloop-agents with a given adapter"""
+        
+        # Get agent from repository
+        agent_data = cls.get_agent_from_repo(agent_category, agent_name)
         
         # Merge configurations
         build_config = agent_data['config'] or {}
@@ -264,14 +380,63 @@ class FrameworkRegistry:
             build_config.update(config)
         
         # Build with framework
-        built_agent = adapter.build_agent(source_code, build_config)
+        with tracing.span('build_agent', framework=adapter.framework_name):
+            built_agent = adapter.build_agent(agent_data['source'], build_config)
         
         # Optimize for production
-        optimized = adapter.optimize_agent(built_agent, 'production')
+        with tracing.span('optimize_agent', framework=adapter.framework_name, target='production'):
+            optimized = adapter.optimize_agent(built_agent, 'production')
         
         return optimized
 
 
+# Process pool workers for build_agents_parallel
+
+def _init_build_worker(frameworks: List[str], agents_repo_path: str):
+    """Initialize a build worker: set up the repo path and adapters once"""
+    # Spawned workers re-import this module, losing class attribute overrides
+    FrameworkRegistry.AGENTS_REPO_PATH = agents_repo_path
+    FrameworkRegistry.warmup(frameworks)
+
+
+def _build_in_worker(agent_category: str,
+                     agent_name: str,
+                     target_framework: str,
+                     config: Optional[Dict]) -> Dict[str, Any]:
+    """Build, optimize and validate one agent inside a worker process"""
+    adapter = FrameworkRegistry.get_adapter(target_framework)
+    if not adapter:
+        return _build_result(agent_category, agent_name, target_framework,
+                             error=f"Framework {target_framework} adapter not available")
+    
+    try:
+        agent = FrameworkRegistry._build_with_adapter(adapter, agent_category, agent_name, config)
+        valid = adapter.validate_agent(agent)
+    except Exception as e:
+        return _build_result(agent_category, agent_name, target_framework,
+                             error=f"{type(e).__name__}: {e}")
+    
+    return _build_result(agent_category, agent_name, target_framework, agent=CompactAgent.from_agent(agent),
+                         valid=valid)
+
+
+def _build_result(agent_category: str,
+                  agent_name: str,
+                  framework: str,
+                  agent: Any = None,
+                  valid: Optional[bool] = None,
+                  error: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        'agent_category': agent_category,
+        'agent_name': agent_name,
+        'framework': framework,
+        'success': error is None,
+        'agent': agent,
+        'valid': valid,
+        'error': error
+    }
+
+
 # Convenience functions for easy access
 
 def list_available_frameworks():
@@ -296,4 +461,15 @@ def build_agent(agent_category: str, agent_name: str, framework: str, config: Di
         agent_name,
         framework,
         config
-    )
\ No newline at end of file
+    )
+
+
+def build_agents(agents: List[str], frameworks: Union[str, List[str]], config: Dict = None, max_workers: int = None):
+    """
+    Build many agents from inferloop-agents in parallel worker processes.
+    
+    Example:
+        results = build_agents(['finance/fraud_detection', 'hr/resume_screener'],
+                               ['langchain', 'crewai'])
+    """
+    return FrameworkRegistry.build_agents_parallel(agents, frameworks, config, max_workers)
@@ -0,0 +1,416 @@
+"""
+Build Benchmark for AgentForge
+Times the build pipeline stages on a synthetic inferloop-agents catalog
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+import contextlib
+from typing import Dict, Any, Optional, List
+
+import agent_catalog
+from agent_catalog import AgentCatalog
+from framework_registry import FrameworkRegistry
+from build_system.builder import AgentBuilder
+from build_system.dependency_resolver import DependencyResolver
+from framework_adapters.langchain import components
+from framework_abstractions import text_store
+from testing_utilities.load_test import summarize
+
+
+RESULTS_VERSION = 1
+
+# Stages timed once per run
+SETUP_STAGES = ['catalog_scan', 'catalog_load', 'get_adapter_cold']
+
+# Stages timed per agent, in pipeline order
+STAGES = [
+    'get_agent_from_repo',
+    'get_adapter',
+    'build_agent',
+    'optimize_agent',
+    'package_agent',
+    'build_from_repo',
+    'build_from_repo_cached'
+]
+
+# Requirements synthetic agents draw from
+SYNTHETIC_REQUIREMENTS = [
+    'requests>=2.28.0',
+    'pydantic>=1.10,<3',
+    'numpy>=1.24',
+    'pandas>=1.5',
+    'tiktoken>=0.5',
+    'httpx>=0.24',
+    'tenacity>=8.2',
+    'beautifulsoup4>=4.12'
+]
+
+
+def generate_catalog(repo_path: str,
+                     categories: int = 4,
+                     agents_per_category: int = 10,
+                     min_source_kb: int = 2,
+                     max_source_kb: int = 64,
+                     max_source_files: int = 4,
+                     seed: int = 0) -> List[str]:
+    """
+    Write a synthetic inferloop-agents repository of categories x
+    agents_per_category LangChain agents: src/ files of varied size and
+    count, agent.yaml, requirements.txt, tests and docs on some agents.
+
+    The same arguments always produce the same catalog.
+
+    Returns:
+        Agents as 'category/agent_name'
+    """
+    rng = random.Random(seed)
+    catalog_root = os.path.join(repo_path, 'agentic-frameworks', 'agents-catalog')
+    agents = []
+
+    for c in range(categories):
+        category = f"bench{c:02d}"
+        for a in range(agents_per_category):
+            name = f"agent_{a:03d}"
+            agent_dir = os.path.join(catalog_root, category, name)
+            os.makedirs(os.path.join(agent_dir, 'src'), exist_ok=True)
+
+            for index in range(rng.randint(1, max_source_files)):
+                target_bytes = rng.randint(min_source_kb, max_source_kb) * 1024
+                file_name = 'agent.py' if index == 0 else f"module_{index}.py"
+                _write(os.path.join(agent_dir, 'src', file_name), _synthetic_source(rng, name, target_bytes))
+
+            _write(os.path.join(agent_dir, 'agent.yaml'),
+                   f"name: {name}\ncategory: {category}\nmodel: gpt-4\ntemperature: {rng.choice([0, 0.2, 0.7])}\n")
+            _write(os.path.join(agent_dir, 'requirements.txt'),
+                   '\n'.join(rng.sample(SYNTHETIC_REQUIREMENTS, rng.randint(1, 4))) + '\n')
+
+            if rng.random() < 0.7:
+                os.makedirs(os.path.join(agent_dir, 'tests'), exist_ok=True)
+                _write(os.path.join(agent_dir, 'tests', 'test_agent.py'),
+                       "def test_agent():\n    assert True\n")
+            if rng.random() < 0.8:
+                _write(os.path.join(agent_dir, 'README.md'), f"# {name}\n\n" + 'Synthetic agent. ' * rng.randint(10, 400))
+            if rng.random() < 0.3:
+                _write(os.path.join(agent_dir, 'architecture.md'), f"# {name} architecture\n\n" + 'Layer. ' * 200)
+
+            agents.append(f"{category}/{name}")
+
+    return agents
+
+
+async def run_benchmark(categories: int = 4,
+                        agents_per_category: int = 10,
+                        repeat: int = 3,
+                        framework: str = 'langchain',
+                        optimization: str = 'production',
+                        seed: int = 0,
+                        repo_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Time catalog indexing and every build stage for each agent of a
+    synthetic catalog (or of repo_path, if given), repeat times.
+
+    Packages, and everything the pipeline caches (catalog index, stored
+    texts, builds, resolutions), go to a temporary directory; stages
+    meant to be measured cold (the catalog scan, the first get_adapter)
+    are timed separately from their warm counterparts. Memoized component
+    extraction is cleared before build_agent and build_from_repo, so they
+    include parsing as a fresh build process would.
+
+    Returns:
+        Results (see compare()), with per-stage timing percentiles in ms
+    """
+    work_dir = tempfile.mkdtemp(prefix='agentforge-bench-')
+    saved_repo_path = FrameworkRegistry.AGENTS_REPO_PATH
+    saved_dirs = agent_catalog.DEFAULT_INDEX_DIR, text_store.DEFAULT_TEXT_DIR
+    timings: Dict[str, List[float]] = {stage: [] for stage in SETUP_STAGES + STAGES}
+
+    try:
+        # Keep the user's catalog index and text store out of it
+        agent_catalog.DEFAULT_INDEX_DIR = os.path.join(work_dir, 'index')
+        text_store.DEFAULT_TEXT_DIR = os.path.join(work_dir, 'texts')
+
+        if repo_path is None:
+            repo_path = os.path.join(work_dir, 'agents')
+            agents = generate_catalog(repo_path, categories, agents_per_category, seed=seed)
+        else:
+            agents = AgentCatalog(repo_path, os.path.join(work_dir, 'catalog.json')).list_agents()
+
+        catalog_stats = _catalog_stats(repo_path, agents)
+
+        # Catalog index: cold scan, then loading the persisted index
+        index_path = os.path.join(work_dir, 'catalog.json')
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        timings['catalog_scan'] = [_time(AgentCatalog(repo_path, index_path).refresh)]
+        timings['catalog_load'] = [_time(AgentCatalog(repo_path, index_path).load) for _ in range(repeat)]
+
+        FrameworkRegistry.AGENTS_REPO_PATH = repo_path
+        FrameworkRegistry._catalogs.pop(repo_path, None)
+        FrameworkRegistry.clear_adapter_cache()
+        timings['get_adapter_cold'] = [_time(FrameworkRegistry.get_adapter, framework)]
+
+        # Packages go to the work directory too: agents of a real repository
+        # may have packages the user built under the default output directory
+        output_dir = os.path.join(work_dir, 'packages')
+        resolver = DependencyResolver(cache_dir=os.path.join(work_dir, 'resolutions'))
+        builder = AgentBuilder(use_cache=False, resolver=resolver, output_dir=output_dir)
+        cached_builder = AgentBuilder(cache_dir=os.path.join(work_dir, 'builds'), resolver=resolver,
+                                      output_dir=output_dir)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(repeat):
+                for spec in agents:
+                    category, name = spec.split('/')
+                    await _time_agent(builder, cached_builder, category, name, framework, optimization, timings)
+    finally:
+        FrameworkRegistry.AGENTS_REPO_PATH = saved_repo_path
+        FrameworkRegistry._catalogs.pop(repo_path, None)
+        agent_catalog.DEFAULT_INDEX_DIR, text_store.DEFAULT_TEXT_DIR = saved_dirs
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'version': RESULTS_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'environment': _environment(framework),
+        'parameters': {
+            'categories': categories,
+            'agents_per_category': agents_per_category,
+            'repeat': repeat,
+            'framework': framework,
+            'optimization': optimization,
+            'seed': seed
+        },
+        'catalog': catalog_stats,
+        'stages': {stage: dict(summarize(samples), count=len(samples))
+                   for stage, samples in timings.items() if samples}
+    }
+
+
+def compare(baseline: Dict[str, Any],
+            current: Dict[str, Any],
+            threshold: float = 0.15,
+            metric: str = 'p50',
+            min_delta_ms: float = 0.5) -> Dict[str, Any]:
+    """
+    Compare two benchmark results stage by stage.
+
+    A stage regresses when its metric grew by more than threshold (a
+    fraction) and by more than min_delta_ms, so sub-millisecond noise on
+    fast stages does not fail a comparison.
+
+    Returns:
+        {'stages': {stage: {'baseline', 'current', 'change'}},
+         'regressions': [stage, ...], 'warnings': [...]}
+    """
+    report = {'metric': metric, 'threshold': threshold, 'stages': {}, 'regressions': [], 'warnings': []}
+
+    if baseline.get('parameters') != current.get('parameters'):
+        report['warnings'].append(
+            f"Parameters differ: {baseline.get('parameters')} vs {current.get('parameters')}"
+        )
+    if baseline.get('environment', {}).get('python') != current.get('environment', {}).get('python'):
+        report['warnings'].append('Results come from different Python versions')
+
+    for stage, before in baseline.get('stages', {}).items():
+        after = current.get('stages', {}).get(stage)
+        if after is None or metric not in before or metric not in after:
+            report['warnings'].append(f"Stage {stage} missing from current results")
+            continue
+
+        change = (after[metric] - before[metric]) / before[metric] if before[metric] else 0.0
+        report['stages'][stage] = {
+            'baseline': before[metric],
+            'current': after[metric],
+            'change': round(change, 4)
+        }
+        if change > threshold and after[metric] - before[metric] > min_delta_ms:
+            report['regressions'].append(stage)
+
+    return report
+
+
+# Private helper functions
+
+async def _time_agent(builder: AgentBuilder, cached_builder: AgentBuilder, category: str, name: str,
+                      framework: str, optimization: str, timings: Dict[str, List[float]]):
+    """Time each stage of building one agent"""
+    registry = FrameworkRegistry
+    build_config = {
+        'agent_id': f"{category}-{name}",
+        'name': name.replace('_', ' ').title(),
+        'category': category,
+        'optimization': optimization
+    }
+
+    started = time.perf_counter()
+    agent_data = registry.get_agent_from_repo(category, name)
+    timings['get_agent_from_repo'].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    adapter = registry.get_adapter(framework)
+    timings['get_adapter'].append(time.perf_counter() - started)
+
+    components.clear_memo()
+    started = time.perf_counter()
+    agent = adapter.build_agent(agent_data['source'], build_config)
+    timings['build_agent'].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    adapter.optimize_agent(agent, optimization)
+    timings['optimize_agent'].append(time.perf_counter() - started)
+
+    # Package a fully compiled agent into a fresh directory
+    agent = builder._compile_agent(adapter, agent_data['source'], build_config, optimization,
+                                   agent_data['requirements'])
+    package_dir = os.path.join(builder.output_dir, f"agent-package-{agent.id}")
+    shutil.rmtree(package_dir, ignore_errors=True)
+    started = time.perf_counter()
+    await builder.package_agent(agent, agent_data)
+    timings['package_agent'].append(time.perf_counter() - started)
+
+    shutil.rmtree(package_dir, ignore_errors=True)
+    components.clear_memo()
+    started = time.perf_counter()
+    await builder.build_from_repo(category, name, framework, optimization)
+    timings['build_from_repo'].append(time.perf_counter() - started)
+
+    # The first cached build of an agent fills the cache; later ones hit it
+    await cached_builder.build_from_repo(category, name, framework, optimization)
+    started = time.perf_counter()
+    await cached_builder.build_from_repo(category, name, framework, optimization)
+    timings['build_from_repo_cached'].append(time.perf_counter() - started)
+
+
+def _time(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def _synthetic_source(rng: random.Random, name: str, target_bytes: int) -> str:
+    """LangChain-style agent code padded with tools and helpers to about target_bytes"""
+    class_name = ''.join(part.title() for part in name.split('_'))
+    parts = [
+        'from langchain.chat_models import ChatOpenAI\n'
+        'from langchain.memory import ConversationBufferMemory\n'
+        'from langchain.tools import tool, Tool\n'
+        'from langchain.chains import LLMChain\n'
+        'from langchain.prompts import PromptTemplate\n\n\n'
+        f'class {class_name}Chain(LLMChain):\n'
+        '    pass\n\n\n'
+        f'class {class_name}:\n'
+        '    def __init__(self):\n'
+        f'        self.llm = ChatOpenAI(model="gpt-4", temperature={rng.choice([0, 0.2, 0.7])})\n'
+        '        self.memory = ConversationBufferMemory()\n'
+        '        self.prompt = PromptTemplate.from_template("Answer: {question}")\n'
+    ]
+    size = sum(len(part) for part in parts)
+    index = 0
+
+    while size < target_bytes:
+        if rng.random() < 0.3:
+            part = (
+                f'\n\n@tool\ndef tool_{index}(query: str) -> str:\n'
+                f'    """Look up {rng.choice(["orders", "accounts", "invoices", "tickets"])} matching the query"""\n'
+                f'    return query.upper()[:{rng.randint(10, 200)}]\n'
+            )
+        else:
+            body = ''.join(f'    value = value * {rng.randint(2, 9)} + {rng.randint(0, 99)}\n'
+                           for _ in range(rng.randint(3, 30)))
+            part = f'\n\ndef helper_{index}(value: int) -> int:\n{body}    return value\n'
+        parts.append(part)
+        size += len(part)
+        index += 1
+
+    return ''.join(parts)
+
+
+def _write(path: str, content: str):
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def _catalog_stats(repo_path: str, agents: List[str]) -> Dict[str, Any]:
+    files = 0
+    total_bytes = 0
+    for root, _, names in os.walk(repo_path):
+        for name in names:
+            files += 1
+            total_bytes += os.path.getsize(os.path.join(root, name))
+    return {'agents': len(agents), 'files': files, 'bytes': total_bytes}
+
+
+def _environment(framework: str) -> Dict[str, Any]:
+    adapter = FrameworkRegistry.get_adapter(framework)
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'adapter_version': getattr(adapter, 'version', None)
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Benchmark the AgentForge build pipeline')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run the benchmark and write results as JSON')
+    run.add_argument('--categories', type=int, default=4)
+    run.add_argument('--agents', type=int, default=10, help='Agents per category')
+    run.add_argument('--repeat', type=int, default=3)
+    run.add_argument('--framework', default='langchain')
+    run.add_argument('--optimization', default='production')
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--repo', default=None, help='Benchmark an existing agents repository instead')
+    run.add_argument('--output', default=None, help='Results file (default: stdout)')
+
+    check = commands.add_parser('compare', help='Compare results; exits 1 on a regression')
+    check.add_argument('baseline')
+    check.add_argument('current')
+    check.add_argument('--threshold', type=float, default=0.15, help='Allowed slowdown as a fraction')
+    check.add_argument('--metric', default='p50', choices=['p50', 'p95', 'p99', 'mean', 'max'])
+    check.add_argument('--min-delta-ms', type=float, default=0.5)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = asyncio.run(run_benchmark(
+            args.categories, args.agents, args.repeat, args.framework, args.optimization, args.seed, args.repo
+        ))
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+        else:
+            json.dump(results, sys.stdout, indent=2)
+            print()
+        return
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r') as f:
+        current = json.load(f)
+
+    report = compare(baseline, current, args.threshold, args.metric, args.min_delta_ms)
+    for warning in report['warnings']:
+        print(f"Warning: {warning}")
+    for stage, row in report['stages'].items():
+        flag = '  REGRESSION' if stage in report['regressions'] else ''
+        print(f"{stage:28} {row['baseline']:10.2f} -> {row['current']:10.2f} ms  {row['change']:+7.1%}{flag}")
+
+    if report['regressions']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
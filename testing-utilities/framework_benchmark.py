@@ -0,0 +1,158 @@
+"""
+Framework Benchmark for AgentForge
+Builds one agent through every available adapter and compares them under load
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+from typing import Dict, Any, Optional, List
+
+from framework_registry import FrameworkRegistry
+from build_system.builder import AgentBuilder
+from testing_utilities.profile_agent import measure_package
+
+
+REPORT_VERSION = 1
+
+# Report rankings: (name, result key path, best first is highest)
+RANKINGS = [
+    ('throughput', ('rps',), True),
+    ('p95_latency', ('latency_ms', 'p95'), False),
+    ('memory', ('peak_rss_bytes',), False),
+    ('cold_start', ('cold_start_seconds',), False)
+]
+
+
+async def compare_frameworks(agent: str,
+                             frameworks: Optional[List[str]] = None,
+                             concurrency: int = 16,
+                             duration: float = 20.0,
+                             warmup: float = 3.0,
+                             llm_latency: float = 0.5,
+                             tokens_per_second: float = 50.0,
+                             optimization: str = 'production') -> Dict[str, Any]:
+    """
+    Build agent ('category/agent_name' in inferloop-agents) with each
+    framework, serve every package as one worker against the same mock LLM
+    and load test it with the same settings.
+
+    Frameworks without an adapter are reported as 'unavailable', and
+    builds or runs that fail as 'failed' with the error, so one broken
+    adapter does not hide the others.
+
+    Returns:
+        Report with per-framework 'rps', 'latency_ms' percentiles,
+        'peak_rss_bytes', 'cold_start_seconds' and 'build_seconds', and
+        framework names ranked by each measure
+    """
+    category, agent_name = agent.split('/')
+    builder = AgentBuilder(use_cache=False)
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for framework in frameworks or FrameworkRegistry.list_frameworks():
+        adapter = FrameworkRegistry.get_adapter(framework)
+        if adapter is None:
+            results[framework] = {'status': 'unavailable'}
+            continue
+
+        result = {'status': 'failed', 'adapter_version': getattr(adapter, 'version', None)}
+        results[framework] = result
+        try:
+            started = time.perf_counter()
+            package = await builder.build_from_repo(category, agent_name, framework, optimization)
+            result['build_seconds'] = round(time.perf_counter() - started, 3)
+
+            # Measured right away: every framework's package of this agent
+            # goes to the same directory
+            load = await asyncio.get_running_loop().run_in_executor(
+                None, measure_package, package['package_path'], concurrency, duration, warmup,
+                llm_latency, tokens_per_second
+            )
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+            continue
+
+        result.update(
+            status='ok',
+            rps=load['rps'],
+            latency_ms=load['latency_ms'],
+            peak_rss_bytes=load.get('peak_rss_bytes'),
+            cpu_seconds=load.get('cpu_seconds'),
+            cold_start_seconds=load['cold_start_seconds'],
+            requests=load['requests'],
+            errors=load['errors'],
+            shed=load['shed']
+        )
+
+    return {
+        'version': REPORT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'agent': agent,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'parameters': {
+            'concurrency': concurrency,
+            'duration': duration,
+            'warmup': warmup,
+            'llm_latency': llm_latency,
+            'tokens_per_second': tokens_per_second,
+            'optimization': optimization
+        },
+        'frameworks': results,
+        'rankings': _rankings(results)
+    }
+
+
+# Private helper functions
+
+def _rankings(results: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Measured frameworks ordered best first by each measure"""
+    rankings = {}
+    for name, path, highest_first in RANKINGS:
+        measured = {}
+        for framework, result in results.items():
+            value = result
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if result['status'] == 'ok' and value is not None:
+                measured[framework] = value
+        rankings[name] = sorted(measured, key=measured.get, reverse=highest_first)
+    return rankings
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Compare agent frameworks on one agent against a mock LLM')
+    parser.add_argument('agent', help="Agent in inferloop-agents, e.g. 'finance/fraud_detection'")
+    parser.add_argument('--frameworks', nargs='+', default=None, help='Default: every registered framework')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--warmup', type=float, default=3.0)
+    parser.add_argument('--llm-latency', type=float, default=0.5, help='Mock LLM seconds to the first token')
+    parser.add_argument('--tokens-per-second', type=float, default=50.0)
+    parser.add_argument('--optimization', default='production')
+    parser.add_argument('--output', default=None, help='Report file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(compare_frameworks(
+        args.agent, args.frameworks, args.concurrency, args.duration, args.warmup, args.llm_latency,
+        args.tokens_per_second, args.optimization
+    ))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Load Test for AgentForge
+Drives a served agent at fixed concurrency and reports throughput and latency
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+from typing import Dict, Any, Optional, List
+from urllib.parse import urlsplit
+
+
+async def run_load(url: str,
+                   concurrency: int = 16,
+                   duration: float = 10.0,
+                   total_requests: Optional[int] = None,
+                   input_text: str = 'Summarize the status of my account.',
+                   timeout: float = 30.0,
+                   pid: Optional[int] = None,
+                   sessions: int = 0,
+                   unique_inputs: bool = False) -> Dict[str, Any]:
+    """
+    Send POST {"input": input_text, "session_id": ...} requests to url from concurrency
+    keep-alive connections, for duration seconds or total_requests requests.
+
+    Args:
+        url: Endpoint, e.g. http://127.0.0.1:8000/run (or /stream, for which
+            time to first byte is reported too)
+        concurrency: Simultaneous connections, each sending one request at a time
+        duration: Seconds to run (ignored if total_requests is given)
+        total_requests: Stop after this many requests
+        input_text: Agent input
+        timeout: Per-request timeout in seconds
+        pid: Server process to sample peak RSS and CPU time from (with its
+            child workers)
+        sessions: Spread requests over this many conversation session_ids
+            (0 sends none)
+        unique_inputs: Number each input, so response caches never hit
+
+    Returns:
+        Counts of 'ok', 'errors' and 'shed' (503) responses, requests per
+        second ('rps'), 'latency_ms' and 'ttfb_ms' percentiles, and with pid
+        'peak_rss_bytes' and 'cpu_seconds' used during the run
+    """
+    target = urlsplit(url)
+    stats = {'ok': 0, 'errors': 0, 'shed': 0, 'latencies': [], 'ttfbs': [], 'sent': 0, 'peak_rss': 0}
+    deadline = time.monotonic() + duration
+
+    def more() -> bool:
+        if total_requests is not None:
+            return stats['sent'] < total_requests
+        return time.monotonic() < deadline
+
+    async def worker():
+        connection = None
+        while more():
+            stats['sent'] += 1
+            request = {'input': f"{input_text} ({stats['sent']})" if unique_inputs else input_text}
+            if sessions:
+                request['session_id'] = f"load-{stats['sent'] % sessions}"
+            body = json.dumps(request).encode('utf-8')
+            start = time.monotonic()
+            try:
+                if connection is None:
+                    connection = await asyncio.open_connection(target.hostname, target.port or 80)
+                status, ttfb, keep_alive = await asyncio.wait_for(
+                    _request(connection, target, body), timeout
+                )
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                stats['errors'] += 1
+                connection = _close(connection)
+                continue
+
+            if status == 200:
+                stats['ok'] += 1
+                stats['latencies'].append(time.monotonic() - start)
+                stats['ttfbs'].append(ttfb - start)
+            elif status == 503:
+                stats['shed'] += 1
+            else:
+                stats['errors'] += 1
+
+            if not keep_alive:
+                connection = _close(connection)
+        _close(connection)
+
+    async def sample_rss():
+        while True:
+            stats['peak_rss'] = max(stats['peak_rss'], _rss_bytes(pid))
+            await asyncio.sleep(0.1)
+
+    sampler = asyncio.ensure_future(sample_rss()) if pid else None
+    cpu_start = _cpu_seconds(pid) if pid else 0.0
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+    if sampler:
+        sampler.cancel()
+
+    result = {
+        'url': url,
+        'concurrency': concurrency,
+        'duration': round(elapsed, 3),
+        'requests': stats['ok'] + stats['errors'] + stats['shed'],
+        'ok': stats['ok'],
+        'errors': stats['errors'],
+        'shed': stats['shed'],
+        'rps': round(stats['ok'] / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': summarize(stats['latencies']),
+        'ttfb_ms': summarize(stats['ttfbs'])
+    }
+    if pid:
+        result['peak_rss_bytes'] = stats['peak_rss']
+        result['cpu_seconds'] = round(_cpu_seconds(pid) - cpu_start, 3)
+    return result
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max of samples in seconds, as milliseconds"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def percentile(p):
+        # Nearest rank
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] * 1000
+
+    return {
+        'p50': round(percentile(50), 2),
+        'p95': round(percentile(95), 2),
+        'p99': round(percentile(99), 2),
+        'mean': round(sum(ordered) / len(ordered) * 1000, 2),
+        'max': round(ordered[-1] * 1000, 2)
+    }
+
+
+# Private helper functions
+
+async def _request(connection, target, body: bytes):
+    """Send one request; returns status, time of first body byte, keep-alive"""
+    reader, writer = connection
+    writer.write(
+        f"POST {target.path or '/'} HTTP/1.1\r\n"
+        f"Host: {target.netloc}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split(b' ', 2)[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+
+    ttfb = None
+    if headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';', 1)[0], 16)
+            await reader.readexactly(size + 2)
+            ttfb = ttfb or time.monotonic()
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get('content-length', 0)))
+        ttfb = time.monotonic()
+
+    return status, ttfb, headers.get('connection') != 'close'
+
+
+def _close(connection):
+    if connection is not None:
+        connection[1].close()
+    return None
+
+
+def _rss_bytes(pid: int) -> int:
+    """Resident memory of a process and its children (Linux)"""
+    total = 0
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", 'r') as f:
+            pids += [int(child) for child in f.read().split()]
+    except OSError:
+        pass
+
+    for process in pids:
+        try:
+            with open(f"/proc/{process}/status", 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            continue
+    return total
+
+
+def _cpu_seconds(pid: int) -> float:
+    """User plus system CPU time of a process and its children (Linux)"""
+    ticks = 0
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", 'r') as f:
+            pids += [int(child) for child in f.read().split()]
+    except OSError:
+        pass
+
+    for process in pids:
+        try:
+            with open(f"/proc/{process}/stat", 'r') as f:
+                # Fields after the parenthesised command name; utime and stime are 14 and 15
+                fields = f.read().rsplit(')', 1)[1].split()
+            ticks += int(fields[11]) + int(fields[12])
+        except (OSError, IndexError, ValueError):
+            continue
+    return ticks / os.sysconf('SC_CLK_TCK')
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Load test a served agent')
+    parser.add_argument('url', help='Endpoint, e.g. http://127.0.0.1:8000/run')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--requests', type=int, default=None, help='Stop after this many requests')
+    parser.add_argument('--input', default='Summarize the status of my account.')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--pid', type=int, default=None, help='Server process to sample RSS and CPU from')
+    parser.add_argument('--sessions', type=int, default=0, help='Number of conversation sessions to simulate')
+    parser.add_argument('--unique-inputs', action='store_true', help='Number each input to defeat response caches')
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run_load(
+        args.url, args.concurrency, args.duration, args.requests, args.input, args.timeout, args.pid,
+        args.sessions, args.unique_inputs
+    ))
+    json.dump(result, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+Mock LLM Server for AgentForge
+OpenAI-compatible stub endpoint for load testing agents without a real model
+"""
+
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import threading
+from typing import Dict, Any, Optional, List
+
+
+# A final answer in the format LangChain's conversational chat agents expect,
+# so agents finish in a single LLM call
+DEFAULT_REPLY = (
+    '```json\n{"action": "Final Answer", "action_input": '
+    '"This is a response from the AgentForge mock LLM used for load testing. '
+    'It streams a fixed number of tokens at a configurable rate."}\n```'
+)
+
+
+class MockLLMServer:
+    """
+    Serves the OpenAI chat and completions APIs (streaming and not) with a
+    fixed reply and simulated timing: latency seconds to the first token,
+    then tokens_per_second. Point agents at base_url (e.g. with
+    OPENAI_API_BASE) and any API key.
+
+    Example:
+        server = MockLLMServer(latency=0.2, tokens_per_second=50)
+        server.start_in_thread()
+        os.environ['OPENAI_API_BASE'] = server.base_url
+    """
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 latency: float = 0.05,
+                 tokens_per_second: float = 200.0,
+                 reply: str = DEFAULT_REPLY):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.reply = reply
+        self.requests = 0
+        self.tokens = 0
+        self._server = None
+        self._loop = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self) -> 'MockLLMServer':
+        """Start serving on the running event loop"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def start_in_thread(self) -> 'MockLLMServer':
+        """Serve from a background thread (for synchronous callers)"""
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=run, name='mock-llm', daemon=True).start()
+        started.wait()
+        return self
+
+    def stop_thread(self):
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {'requests': self.requests, 'tokens': self.tokens}
+
+    # Private helper methods
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve HTTP/1.1 requests on one keep-alive connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                await self._respond(method, path.split('?', 1)[0], body, writer)
+
+                if headers.get('connection', '').lower() == 'close':
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            return
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter):
+        if method == 'GET' and path == '/v1/models':
+            self._send_json(writer, 200, {'object': 'list', 'data': [{'id': 'mock', 'object': 'model'}]})
+        elif method == 'POST' and path in ('/v1/chat/completions', '/v1/completions'):
+            try:
+                request = json.loads(body or b'{}')
+            except ValueError:
+                self._send_json(writer, 400, {'error': {'message': 'Invalid JSON'}})
+                return
+            self.requests += 1
+            chat = path == '/v1/chat/completions'
+            if request.get('stream'):
+                await self._stream_completion(writer, request, chat)
+            else:
+                await self._completion(writer, request, chat)
+        else:
+            self._send_json(writer, 404, {'error': {'message': f"No route {method} {path}"}})
+        await writer.drain()
+
+    async def _completion(self, writer: asyncio.StreamWriter, request: Dict[str, Any], chat: bool):
+        tokens = self._tokens()
+        await asyncio.sleep(self.latency + len(tokens) / self.tokens_per_second)
+        self.tokens += len(tokens)
+
+        text = ''.join(tokens)
+        choice = {'index': 0, 'finish_reason': 'stop'}
+        if chat:
+            choice['message'] = {'role': 'assistant', 'content': text}
+        else:
+            choice['text'] = text
+
+        self._send_json(writer, 200, dict(
+            self._envelope(request, chat),
+            choices=[choice],
+            usage={
+                'prompt_tokens': len(json.dumps(request.get('messages', request.get('prompt', ''))).split()),
+                'completion_tokens': len(tokens),
+                'total_tokens': len(tokens)
+            }
+        ))
+
+    async def _stream_completion(self, writer: asyncio.StreamWriter, request: Dict[str, Any], chat: bool):
+        writer.write(
+            b'HTTP/1.1 200 OK\r\n'
+            b'Content-Type: text/event-stream\r\n'
+            b'Cache-Control: no-cache\r\n'
+            b'Transfer-Encoding: chunked\r\n\r\n'
+        )
+        await asyncio.sleep(self.latency)
+
+        envelope = self._envelope(request, chat, chunk=True)
+        for token in self._tokens():
+            delta = {'delta': {'content': token}} if chat else {'text': token}
+            self._send_chunk(writer, dict(envelope, choices=[dict(delta, index=0, finish_reason=None)]))
+            self.tokens += 1
+            await writer.drain()
+            await asyncio.sleep(1 / self.tokens_per_second)
+
+        final = {'delta': {}} if chat else {'text': ''}
+        self._send_chunk(writer, dict(envelope, choices=[dict(final, index=0, finish_reason='stop')]))
+        writer.write(self._chunk(b'data: [DONE]\n\n') + b'0\r\n\r\n')
+
+    def _tokens(self) -> List[str]:
+        """The reply split into word tokens, keeping whitespace"""
+        words = self.reply.split(' ')
+        return [word + ' ' for word in words[:-1]] + words[-1:]
+
+    def _envelope(self, request: Dict[str, Any], chat: bool, chunk: bool = False) -> Dict[str, Any]:
+        kind = 'chat.completion' if chat else 'text_completion'
+        return {
+            'id': f"mock-{uuid.uuid4().hex}",
+            'object': f"{kind}.chunk" if chunk and chat else kind,
+            'created': int(time.time()),
+            'model': request.get('model', 'mock')
+        }
+
+    def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+        )
+
+    def _send_chunk(self, writer: asyncio.StreamWriter, payload: Dict[str, Any]):
+        writer.write(self._chunk(f"data: {json.dumps(payload)}\n\n".encode('utf-8')))
+
+    def _chunk(self, data: bytes) -> bytes:
+        return f"{len(data):x}\r\n".encode('latin-1') + data + b'\r\n'
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Run an OpenAI-compatible mock LLM for load testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds to the first token')
+    parser.add_argument('--tokens-per-second', type=float, default=200.0)
+    parser.add_argument('--reply', default=DEFAULT_REPLY, help='Text of every completion')
+    args = parser.parse_args(argv)
+
+    server = MockLLMServer(args.host, args.port, args.latency, args.tokens_per_second, args.reply)
+
+    async def serve():
+        await server.start()
+        print(f"Mock LLM serving at {server.base_url}", file=sys.stderr)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
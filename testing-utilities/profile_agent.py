@@ -0,0 +1,161 @@
+"""
+Agent Profiler for AgentForge
+Measures one replica of a packaged agent against the mock LLM for deployment sizing
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+import subprocess
+import urllib.request
+from typing import Dict, Any, Optional, List
+
+from framework_abstractions.sizing import PerformanceProfile
+from testing_utilities.mock_llm import MockLLMServer
+from testing_utilities.load_test import run_load
+
+
+PROFILE_FILE = 'profile.json'
+
+
+def profile_package(package_path: str,
+                    concurrency: int = 16,
+                    duration: float = 20.0,
+                    warmup: float = 3.0,
+                    llm_latency: float = 0.5,
+                    tokens_per_second: float = 50.0,
+                    startup_timeout: float = 60.0,
+                    output: Optional[str] = None) -> PerformanceProfile:
+    """
+    Serve a package's src/server.py as a single worker pointed at a mock
+    LLM, drive it at concurrency after a warm-up with distinct inputs (so
+    the LLM cache does not flatter it), and save the measured profile
+    (profile.json in the package by default).
+
+    The mock LLM's latency and tokens_per_second should resemble the
+    production model's, since they dominate agent latency.
+
+    Pass the profile to generate_deployment(agent, platform, profile).
+    """
+    result = measure_package(
+        package_path, concurrency, duration, warmup, llm_latency, tokens_per_second, startup_timeout
+    )
+
+    profile = PerformanceProfile.from_load_result(
+        result, source=f"{package_path} (mock LLM {llm_latency}s, {tokens_per_second} tok/s)"
+    )
+    profile.save(output or os.path.join(package_path, PROFILE_FILE))
+    return profile
+
+
+def measure_package(package_path: str,
+                    concurrency: int = 16,
+                    duration: float = 20.0,
+                    warmup: float = 3.0,
+                    llm_latency: float = 0.5,
+                    tokens_per_second: float = 50.0,
+                    startup_timeout: float = 60.0) -> Dict[str, Any]:
+    """
+    Serve a package against a mock LLM and load test it (see
+    profile_package).
+
+    Returns:
+        The load_test.run_load result of the measured run, plus
+        'cold_start_seconds' from launching the server to its first
+        ready response
+    """
+    server_script = os.path.join(package_path, 'src', 'server.py')
+    if not os.path.exists(server_script):
+        raise FileNotFoundError(f"{server_script} not found; profile a package built with streaming enabled")
+
+    mock = MockLLMServer(latency=llm_latency, tokens_per_second=tokens_per_second).start_in_thread()
+    port = _free_port()
+    env = dict(
+        os.environ,
+        OPENAI_API_BASE=mock.base_url,
+        OPENAI_API_KEY=os.environ.get('OPENAI_API_KEY', 'mock'),
+        HOST='127.0.0.1',
+        PORT=str(port),
+        AGENT_WORKERS='1',
+        # Admit everything the load sends, so the profile measures capacity
+        # rather than the admission limits
+        AGENT_MAX_CONCURRENCY=str(concurrency),
+        AGENT_MAX_QUEUE=str(concurrency),
+        AGENT_DRAIN_SECONDS='0'
+    )
+    launched = time.monotonic()
+    server = subprocess.Popen([sys.executable, 'src/server.py'], cwd=package_path, env=env)
+
+    try:
+        url = f"http://127.0.0.1:{port}"
+        _wait_ready(f"{url}/readyz", server, startup_timeout)
+        cold_start = time.monotonic() - launched
+        if warmup:
+            asyncio.run(run_load(f"{url}/run", concurrency, warmup, unique_inputs=True))
+        result = asyncio.run(run_load(f"{url}/run", concurrency, duration, pid=server.pid, unique_inputs=True))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        mock.stop_thread()
+
+    if not result['ok']:
+        raise RuntimeError(f"No successful requests while profiling {package_path}: {result}")
+    if result['errors']:
+        print(f"Warning: {result['errors']} of {result['requests']} requests failed while profiling")
+
+    result['cold_start_seconds'] = round(cold_start, 3)
+    return result
+
+
+# Private helper functions
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, server: subprocess.Popen, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Agent server exited with code {server.returncode} before becoming ready")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Agent server not ready after {timeout}s")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Measure a packaged agent for deployment sizing')
+    parser.add_argument('package', help='Package directory (with src/server.py)')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--warmup', type=float, default=3.0)
+    parser.add_argument('--llm-latency', type=float, default=0.5, help='Mock LLM seconds to the first token')
+    parser.add_argument('--tokens-per-second', type=float, default=50.0)
+    parser.add_argument('--output', default=None, help=f"Profile path (default: <package>/{PROFILE_FILE})")
+    args = parser.parse_args(argv)
+
+    profile = profile_package(
+        args.package, args.concurrency, args.duration, args.warmup, args.llm_latency, args.tokens_per_second,
+        output=args.output
+    )
+    json.dump(profile.to_dict(), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
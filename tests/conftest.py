@@ -0,0 +1,106 @@
+"""
+Test configuration for AgentForge
+Makes the hyphenated source directories importable under their package names
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import types
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import name -> directory, as laid out in a deployed checkout
+PACKAGES = {
+    'build_system': 'build-system',
+    'framework_abstractions': 'framework-abstractions',
+    'framework_adapters': 'framework-adapters',
+    'testing_utilities': 'testing-utilities'
+}
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Default caches go to a private directory of the test run, not the user's
+CACHE_ROOT = os.environ.setdefault('AGENTFORGE_CACHE_DIR', tempfile.mkdtemp(prefix='agentforge-test-cache-'))
+
+for name, directory in PACKAGES.items():
+    if name not in sys.modules:
+        package = types.ModuleType(name)
+        package.__path__ = [os.path.join(ROOT, directory)]
+        sys.modules[name] = package
+
+
+def pytest_unconfigure(config):
+    if os.path.basename(CACHE_ROOT).startswith('agentforge-test-cache-'):
+        shutil.rmtree(CACHE_ROOT, ignore_errors=True)
+
+
+@pytest.fixture
+def package_dir(tmp_path):
+    """A minimal built package: package.json and one file"""
+    path = tmp_path / 'agent-package-finance-fraud_detection'
+    path.mkdir()
+    (path / 'package.json').write_text('{"agent_id": "finance-fraud_detection"}')
+    (path / 'agent.py').write_text('print("agent")\n')
+    return str(path)
+
+
+AGENT_SOURCE = '''from langchain.chat_models import ChatOpenAI
+from langchain.memory import ConversationBufferMemory
+from langchain.tools import tool
+
+
+class FraudAgent:
+    def __init__(self):
+        self.llm = ChatOpenAI(model="gpt-4")
+        self.memory = ConversationBufferMemory()
+
+
+@tool
+def score(tx: str) -> str:
+    """Score a transaction"""
+    return "0"
+'''
+
+
+@pytest.fixture
+def agents_repo(tmp_path, monkeypatch):
+    """An inferloop-agents checkout with finance/fraud_detection, used by the registry"""
+    import agent_catalog
+    from framework_registry import FrameworkRegistry
+
+    agent_dir = tmp_path / 'agents' / 'agentic-frameworks' / 'agents-catalog' / 'finance' / 'fraud_detection'
+    (agent_dir / 'src').mkdir(parents=True)
+    (agent_dir / 'src' / 'agent.py').write_text(AGENT_SOURCE)
+    (agent_dir / 'requirements.txt').write_text('requests>=2.0\nlangchain>=0.1.5\n')
+    (agent_dir / 'agent.yaml').write_text('name: fraud\nmodel: gpt-4\n')
+
+    monkeypatch.setattr(agent_catalog, 'DEFAULT_INDEX_DIR', str(tmp_path / 'index'))
+    monkeypatch.setattr(FrameworkRegistry, 'AGENTS_REPO_PATH', str(tmp_path / 'agents'))
+    monkeypatch.setattr(FrameworkRegistry, '_catalogs', {})
+    return agent_dir
+
+
+@pytest.fixture
+def builder(tmp_path):
+    """An AgentBuilder with its own build cache and resolver cache"""
+    from build_system.builder import AgentBuilder
+    from build_system.dependency_resolver import DependencyResolver
+
+    return AgentBuilder(cache_dir=str(tmp_path / 'builds'),
+                        resolver=DependencyResolver(cache_dir=str(tmp_path / 'resolutions')))
+
+
+@pytest.fixture
+def agent_id(tmp_path):
+    """A unique agent id, so test packages (/tmp/agent-package-<id>) never collide; removed afterwards"""
+    import shutil
+
+    agent_id = f"test-{os.getpid()}-{tmp_path.name}"
+    yield agent_id
+    shutil.rmtree(f"/tmp/agent-package-{agent_id}", ignore_errors=True)
@@ -0,0 +1,94 @@
+import os
+
+from agent_catalog import AgentCatalog
+
+
+def touch_later(path, text):
+    """Rewrite path with a newer mtime than the index saw"""
+    with open(path, 'w') as f:
+        f.write(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def make_catalog(agents_repo, tmp_path):
+    repo = str(agents_repo.parents[3])
+    return AgentCatalog(repo, index_path=str(tmp_path / 'catalog.json'))
+
+
+def test_get_returns_indexed_agent(agents_repo, tmp_path):
+    entry = make_catalog(agents_repo, tmp_path).get('finance', 'fraud_detection')
+
+    assert entry.source_files == ['agent.py']
+    assert entry.requirements == ['requests>=2.0', 'langchain>=0.1.5']
+    assert entry.config == {'name': 'fraud', 'model': 'gpt-4'}
+
+
+def test_get_picks_up_changed_requirements_and_config(agents_repo, tmp_path):
+    catalog = make_catalog(agents_repo, tmp_path)
+    catalog.get('finance', 'fraud_detection')
+
+    touch_later(str(agents_repo / 'requirements.txt'), 'pydantic<2\n')
+    touch_later(str(agents_repo / 'agent.yaml'), 'name: renamed\n')
+
+    entry = catalog.get('finance', 'fraud_detection')
+    assert entry.requirements == ['pydantic<2']
+    assert entry.config == {'name': 'renamed'}
+
+
+def test_get_picks_up_removed_source_files(agents_repo, tmp_path):
+    catalog = make_catalog(agents_repo, tmp_path)
+    (agents_repo / 'src' / 'tools.py').write_text('TOOLS = []\n')
+    catalog.refresh()
+    assert catalog.get('finance', 'fraud_detection').source_files == ['agent.py', 'tools.py']
+
+    os.remove(agents_repo / 'src' / 'tools.py')
+    src = str(agents_repo / 'src')
+    stat = os.stat(src)
+    os.utime(src, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert catalog.get('finance', 'fraud_detection').source_files == ['agent.py']
+
+
+def test_get_forgets_removed_agent(agents_repo, tmp_path):
+    import shutil
+
+    catalog = make_catalog(agents_repo, tmp_path)
+    catalog.get('finance', 'fraud_detection')
+    shutil.rmtree(agents_repo)
+
+    assert catalog.get('finance', 'fraud_detection') is None
+
+
+def add_broken_agent(agents_repo):
+    broken = agents_repo.parent / 'broken'
+    (broken / 'src').mkdir(parents=True)
+    (broken / 'src' / 'agent.py').write_text('x = 1\n')
+    (broken / 'agent.yaml').write_text('name: [unclosed\n')
+    return broken
+
+
+def test_broken_agent_yaml_only_fails_that_agent(agents_repo, tmp_path):
+    import pytest
+    from framework_registry import FrameworkRegistry
+
+    add_broken_agent(agents_repo)
+    catalog = make_catalog(agents_repo, tmp_path)
+
+    assert catalog.get('finance', 'fraud_detection').error is None
+    assert 'agent.yaml' in catalog.get('finance', 'broken').error
+    assert FrameworkRegistry.get_agent_from_repo('finance', 'fraud_detection')['config']['model'] == 'gpt-4'
+    with pytest.raises(ValueError, match='finance/broken is invalid'):
+        FrameworkRegistry.get_agent_from_repo('finance', 'broken')
+
+
+def test_fixed_agent_yaml_clears_error(agents_repo, tmp_path):
+    broken = add_broken_agent(agents_repo)
+    catalog = make_catalog(agents_repo, tmp_path)
+    assert catalog.get('finance', 'broken').error
+
+    touch_later(broken / 'agent.yaml', 'name: fixed\n')
+
+    entry = catalog.get('finance', 'broken')
+    assert entry.error is None
+    assert entry.config == {'name': 'fixed'}
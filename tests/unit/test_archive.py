@@ -0,0 +1,47 @@
+import io
+import sys
+import tarfile
+import importlib.util
+
+import pytest
+
+from build_system import archive
+from build_system.package_writer import PackageFile
+
+
+FILES = [PackageFile('b.txt', data=b'b'), PackageFile('dir/a.txt', data=b'a')]
+
+
+def test_default_format_needs_no_optional_dependency(monkeypatch):
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name: None)
+
+    assert archive.default_archive_format() == 'tar.gz'
+
+
+def test_default_format_is_zst_when_available(monkeypatch):
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name: object())
+
+    assert archive.default_archive_format() == 'tar.zst'
+
+
+def test_tar_gz_is_deterministic_and_sorted():
+    first, second = io.BytesIO(), io.BytesIO()
+    archive.write_archive(FILES, [], first, 'tar.gz')
+    archive.write_archive(list(reversed(FILES)), [], second, 'tar.gz')
+
+    assert first.getvalue() == second.getvalue()
+    with tarfile.open(fileobj=io.BytesIO(first.getvalue()), mode='r:gz') as tar:
+        assert sorted(tar.getnames()) == ['b.txt', 'dir', 'dir/a.txt']
+        assert tar.extractfile('dir/a.txt').read() == b'a'
+
+
+def test_zst_without_zstandard_explains_the_dependency(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'zstandard', None)
+
+    with pytest.raises(ImportError, match='zstandard'):
+        archive.write_archive(FILES, [], io.BytesIO(), 'tar.zst')
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        archive.write_archive(FILES, [], io.BytesIO(), 'rar')
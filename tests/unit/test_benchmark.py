@@ -0,0 +1,33 @@
+import asyncio
+import os
+
+from testing_utilities import benchmark
+
+
+def test_repo_benchmark_leaves_user_packages_and_caches_alone(agents_repo, tmp_path, monkeypatch):
+    import agent_catalog
+    from framework_abstractions import text_store
+
+    # Stand-ins for the user's own index, text store and package directory
+    monkeypatch.setattr(agent_catalog, 'DEFAULT_INDEX_DIR', str(tmp_path / 'user-index'))
+    monkeypatch.setattr(text_store, 'DEFAULT_TEXT_DIR', str(tmp_path / 'user-texts'))
+    user_package = '/tmp/agent-package-finance-fraud_detection'
+    existed = os.path.exists(user_package)
+    removed = []
+    rmtree = benchmark.shutil.rmtree
+
+    def recording_rmtree(path, **kwargs):
+        removed.append(path)
+        rmtree(path, **kwargs)
+    monkeypatch.setattr(benchmark.shutil, 'rmtree', recording_rmtree)
+
+    results = asyncio.run(benchmark.run_benchmark(repeat=1, repo_path=str(tmp_path / 'agents')))
+
+    assert results['catalog']['agents'] == 1
+    assert results['stages']['build_from_repo_cached']['count'] == 1
+    assert os.path.exists(user_package) == existed
+    assert removed and all('agentforge-bench-' in path for path in removed)
+    assert not (tmp_path / 'user-index').exists()
+    assert not (tmp_path / 'user-texts').exists()
+    assert agent_catalog.DEFAULT_INDEX_DIR == str(tmp_path / 'user-index')
+    assert text_store.DEFAULT_TEXT_DIR == str(tmp_path / 'user-texts')
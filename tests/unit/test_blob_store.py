@@ -0,0 +1,139 @@
+import os
+import threading
+
+import pytest
+
+from build_system.blob_store import BlobStore
+from build_system.package_writer import PackageWriter
+
+
+def write_package(store, package_dir, files):
+    writer = PackageWriter(str(package_dir), blob_store=store)
+    for path, text in files.items():
+        writer.add_text(path, text)
+    return writer.write()
+
+
+def disk_usage(*roots):
+    """Bytes allocated to the files under roots, counting each inode once"""
+    inodes = {}
+    for root in roots:
+        for directory, _, names in os.walk(root):
+            for name in names:
+                stat = os.stat(os.path.join(directory, name))
+                inodes[(stat.st_dev, stat.st_ino)] = stat.st_blocks * 512
+    return len(inodes), sum(inodes.values())
+
+
+@pytest.fixture
+def reflinks(monkeypatch):
+    """Pretend the filesystem clones files copy-on-write (btrfs, XFS)"""
+    import shutil
+    from build_system import blob_store
+    monkeypatch.setattr(blob_store, '_reflink', shutil.copyfile)
+
+
+SHARED = {'tests/test_agent.py': 'x' * 64 * 1024, 'README.md': 'y' * 64 * 1024}
+
+
+def test_shared_content_is_stored_once(tmp_path, reflinks):
+    store = BlobStore(str(tmp_path / 'blobs'))
+    write_package(store, tmp_path / 'one', {'README.md': 'shared'})
+    write_package(store, tmp_path / 'two', {'README.md': 'shared'})
+
+    assert store.stats() == {'blobs': 1, 'bytes': 6, 'packages': 2}
+
+
+def test_hardlinked_packages_save_inodes_and_disk(tmp_path):
+    write_package(None, tmp_path / 'plain-one', SHARED)
+    write_package(None, tmp_path / 'plain-two', SHARED)
+    store = BlobStore(str(tmp_path / 'blobs'), read_only_packages=True)
+    write_package(store, tmp_path / 'one', SHARED)
+    write_package(store, tmp_path / 'two', SHARED)
+
+    plain_inodes, plain_bytes = disk_usage(tmp_path / 'plain-one', tmp_path / 'plain-two')
+    inodes, used = disk_usage(tmp_path / 'one', tmp_path / 'two', tmp_path / 'blobs' / 'objects')
+
+    # One inode and one set of blocks per shared file, instead of one per package
+    assert plain_inodes - inodes == len(SHARED)
+    assert plain_bytes - used >= sum(len(text) for text in SHARED.values())
+
+
+def test_store_is_bypassed_where_it_cannot_share_storage(tmp_path, monkeypatch, capsys):
+    from build_system import blob_store
+
+    def unsupported(source, target):
+        raise OSError(95, 'Operation not supported')
+    monkeypatch.setattr(blob_store, '_reflink', unsupported)
+
+    write_package(None, tmp_path / 'plain-one', SHARED)
+    write_package(None, tmp_path / 'plain-two', SHARED)
+    store = BlobStore(str(tmp_path / 'blobs'))
+    write_package(store, tmp_path / 'one', SHARED)
+    write_package(store, tmp_path / 'two', SHARED)
+
+    assert store.shares_storage(str(tmp_path)) is False
+    assert capsys.readouterr().out.count('cannot reflink or hardlink') == 1
+    assert store.stats() == {'blobs': 0, 'bytes': 0, 'packages': 0}
+    assert disk_usage(tmp_path / 'one', tmp_path / 'two', tmp_path / 'blobs') == \
+        disk_usage(tmp_path / 'plain-one', tmp_path / 'plain-two')
+    assert (tmp_path / 'two' / 'README.md').read_text() == SHARED['README.md']
+
+
+def test_editing_a_package_file_leaves_blob_and_other_packages_alone(tmp_path, reflinks):
+    store = BlobStore(str(tmp_path / 'blobs'))
+    write_package(store, tmp_path / 'one', {'README.md': 'shared'})
+    write_package(store, tmp_path / 'two', {'README.md': 'shared'})
+
+    with open(tmp_path / 'one' / 'README.md', 'w') as f:
+        f.write('edited in place')
+
+    assert (tmp_path / 'two' / 'README.md').read_text() == 'shared'
+    digest = next(iter(os.listdir(tmp_path / 'blobs' / 'objects')))
+    blob_dir = tmp_path / 'blobs' / 'objects' / digest
+    assert [p.read_text() for p in blob_dir.iterdir()] == ['shared']
+
+
+def test_hardlinks_require_read_only_packages(tmp_path):
+    with pytest.raises(ValueError):
+        BlobStore(str(tmp_path / 'blobs'), link_methods=['hardlink'])
+
+    store = BlobStore(str(tmp_path / 'blobs'), read_only_packages=True)
+    write_package(store, tmp_path / 'one', {'README.md': 'shared'})
+
+    stat = os.stat(tmp_path / 'one' / 'README.md')
+    assert stat.st_nlink == 2
+    assert stat.st_mode & 0o777 == 0o444
+
+
+def test_gc_removes_only_unreferenced_blobs(tmp_path, reflinks):
+    import shutil
+
+    store = BlobStore(str(tmp_path / 'blobs'))
+    write_package(store, tmp_path / 'one', {'a.txt': 'a'})
+    write_package(store, tmp_path / 'two', {'b.txt': 'b'})
+    shutil.rmtree(tmp_path / 'two')
+
+    result = store.gc(min_age=0)
+
+    assert (result['removed'], result['kept'], result['stale_refs']) == (1, 1, 1)
+
+
+def test_gc_waits_for_writers_between_put_and_link(tmp_path):
+    store = BlobStore(str(tmp_path / 'blobs'))
+    digest = store.put_bytes(b'old blob')
+    results = {}
+
+    with store.writing():
+        # gc runs in another thread (or process) while a writer holds the lock
+        collector = threading.Thread(target=lambda: results.update(store.gc(min_age=0)))
+        collector.start()
+        collector.join(0.2)
+        assert collector.is_alive()
+
+        store.put_bytes(b'old blob', digest)
+        store.link(digest, str(tmp_path / 'linked'))
+
+    collector.join(5)
+    assert (tmp_path / 'linked').read_bytes() == b'old blob'
+    assert results['removed'] == 1
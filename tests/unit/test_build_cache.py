@@ -0,0 +1,151 @@
+import os
+import json
+import time
+
+import pytest
+
+from build_system.build_cache import BuildCache, MemoryBuildCache
+
+
+def make_package(package_dir):
+    return {'success': True, 'package_path': package_dir, 'metadata': {'agent_id': 'finance-fraud_detection'}}
+
+
+def read_index(cache_dir):
+    with open(os.path.join(cache_dir, BuildCache.INDEX_FILE)) as f:
+        return json.load(f)
+
+
+def test_put_then_get_returns_cached_package(tmp_path, package_dir):
+    cache = BuildCache(str(tmp_path / 'cache'))
+    cache.put('key', make_package(package_dir))
+
+    package = cache.get('key')
+
+    assert package['package_path'] == package_dir
+    assert package['cached'] is True
+    assert cache.stats()['hits'] == 1
+
+
+def test_miss_is_counted(tmp_path):
+    cache = BuildCache(str(tmp_path / 'cache'))
+
+    assert cache.get('missing') is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_changed_package_invalidates_entry_but_keeps_package(tmp_path, package_dir):
+    cache = BuildCache(str(tmp_path / 'cache'))
+    cache.put('key', make_package(package_dir))
+
+    # An uncached build rewrote the package with a different config
+    with open(os.path.join(package_dir, 'package.json'), 'w') as f:
+        f.write('{"agent_id": "rebuilt"}')
+
+    assert cache.get('key') is None
+    assert os.path.exists(os.path.join(package_dir, 'agent.py'))
+    assert not os.path.exists(cache._entry_path('key'))
+
+
+def test_expired_entry_keeps_package(tmp_path, package_dir):
+    cache = BuildCache(str(tmp_path / 'cache'), max_age=0.0)
+    cache.put('key', make_package(package_dir))
+    time.sleep(0.01)
+
+    assert cache.get('key') is None
+    assert os.path.isdir(package_dir)
+
+
+def test_eviction_is_least_recently_used_and_keeps_packages(tmp_path, package_dir):
+    cache = BuildCache(str(tmp_path / 'cache'), max_entries=2)
+    for key in ('a', 'b'):
+        cache.put(key, make_package(package_dir))
+    cache.get('a')
+    cache.put('c', make_package(package_dir))
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert os.path.isdir(package_dir)
+
+
+def test_lookups_do_not_rewrite_index_every_time(tmp_path, package_dir):
+    cache_dir = str(tmp_path / 'cache')
+    cache = BuildCache(cache_dir)
+    cache.put('key', make_package(package_dir))
+    before = read_index(cache_dir)['stats']
+
+    cache.get('key')
+    cache.get('missing')
+    assert read_index(cache_dir)['stats'] == before
+
+    cache.flush()
+    stats = read_index(cache_dir)['stats']
+    assert (stats['hits'], stats['misses']) == (before['hits'] + 1, before['misses'] + 1)
+
+
+def test_concurrent_caches_keep_each_others_entries(tmp_path, package_dir):
+    cache_dir = str(tmp_path / 'cache')
+    first = BuildCache(cache_dir)
+    second = BuildCache(cache_dir)
+
+    first.put('a', make_package(package_dir))
+    second.put('b', make_package(package_dir))
+    first.get('a')
+    first.flush()
+
+    assert set(read_index(cache_dir)['entries']) == {'a', 'b'}
+    assert BuildCache(cache_dir).get('b') is not None
+
+
+def test_clear_removes_entries_from_every_process(tmp_path, package_dir):
+    cache_dir = str(tmp_path / 'cache')
+    first = BuildCache(cache_dir)
+    second = BuildCache(cache_dir)
+    first.put('a', make_package(package_dir))
+    second.put('b', make_package(package_dir))
+
+    first.clear()
+
+    assert read_index(cache_dir)['entries'] == {}
+    assert os.path.isdir(package_dir)
+
+
+def test_key_covers_builder_version():
+    key = BuildCache.compute_key('digest', {'name': 'x'}, 'langchain', '0.1.6', 'production', builder_version='1')
+
+    assert key == BuildCache.compute_key('digest', {'name': 'x'}, 'langchain', '0.1.6', 'production',
+                                         builder_version='1')
+    assert key != BuildCache.compute_key('digest', {'name': 'x'}, 'langchain', '0.1.6', 'production',
+                                         builder_version='2')
+
+
+def test_memory_cache_answers_from_memory_until_package_changes(tmp_path, package_dir):
+    cache = MemoryBuildCache(str(tmp_path / 'cache'))
+    cache.put('key', make_package(package_dir))
+
+    assert cache.get('key')['cached'] is True
+    assert cache.stats()['memory_hits'] == 1
+
+    with open(os.path.join(package_dir, 'package.json'), 'w') as f:
+        f.write('{}')
+    assert cache.get('key') is None
+
+
+def test_refuses_cache_dir_others_can_write(tmp_path):
+    cache_dir = tmp_path / 'builds'
+    cache_dir.mkdir()
+    cache_dir.chmod(0o777)
+
+    with pytest.raises(PermissionError):
+        BuildCache(str(cache_dir))
+
+
+def test_default_cache_dir_is_private():
+    import stat
+    from build_system import build_cache
+    from framework_abstractions import user_dirs
+
+    assert build_cache.DEFAULT_CACHE_DIR.startswith(user_dirs.CACHE_ROOT)
+    cache = BuildCache()
+    assert stat.S_IMODE(os.stat(cache.cache_dir).st_mode) == 0o700
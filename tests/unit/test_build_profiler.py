@@ -0,0 +1,86 @@
+import json
+import os
+import pstats
+
+import pytest
+
+from build_system import build_profiler
+from build_system.build_profiler import BuildProfiler
+
+
+def busy_work():
+    total = 0
+    for i in range(20000):
+        total += i * i
+    return total
+
+
+def allocate():
+    return [bytearray(1024) for _ in range(256)]
+
+
+def test_profiles_cpu_and_allocations():
+    with BuildProfiler(top=50) as profiler:
+        assert build_profiler.is_profiling()
+        busy_work()
+        kept = allocate()
+
+    assert not build_profiler.is_profiling()
+    summary = profiler.summary()
+    assert summary['wall_seconds'] > 0
+    assert summary['peak_traced_bytes'] >= 256 * 1024
+    assert any('(busy_work)' in hotspot['function'] for hotspot in summary['hotspots'])
+    assert summary['allocations'][0]['location'].startswith(__file__)
+    assert summary['allocations'][0]['size_diff_bytes'] >= 256 * 1024
+    del kept
+
+
+def test_write_produces_pstats_and_summary_files(tmp_path):
+    with BuildProfiler() as profiler:
+        busy_work()
+
+    directory = str(tmp_path / 'package')
+    summary = profiler.write(directory)
+
+    assert sorted(os.listdir(directory)) == [build_profiler.SUMMARY_FILE, build_profiler.PROFILE_FILE]
+    assert summary['profile_path'] == os.path.join(directory, build_profiler.PROFILE_FILE)
+    assert summary['summary_path'] == os.path.join(directory, build_profiler.SUMMARY_FILE)
+    stats = pstats.Stats(summary['profile_path'])
+    assert any(name == 'busy_work' for _, _, name in stats.stats)
+    with open(summary['summary_path']) as f:
+        written = json.load(f)
+    assert set(written) == {'wall_seconds', 'peak_traced_bytes', 'hotspots', 'cumulative', 'allocations'}
+    assert len(written['hotspots']) <= build_profiler.DEFAULT_TOP
+
+
+def test_concurrent_profiler_falls_back_to_unprofiled():
+    with BuildProfiler() as outer:
+        with pytest.warns(RuntimeWarning, match='already being profiled'):
+            with BuildProfiler() as inner:
+                busy_work()
+        assert build_profiler.is_profiling()
+
+    assert outer.active and not inner.active
+    with pytest.raises(RuntimeError):
+        inner.write('unused')
+
+    # The lock is released once the first profiler exits
+    with BuildProfiler() as again:
+        pass
+    assert again.active
+
+
+def test_profile_directory(tmp_path):
+    package_dir = tmp_path / 'agent-package-x'
+    package_dir.mkdir()
+    archive = str(tmp_path / 'agent.tar.zst')
+
+    assert build_profiler.profile_directory({'package_path': str(package_dir)}) == str(package_dir)
+    assert build_profiler.profile_directory({'package_path': archive}) == f"{archive}.profile"
+
+    streamed = build_profiler.profile_directory({'package_path': None})
+    try:
+        assert os.path.isdir(streamed)
+        assert os.path.basename(streamed).startswith('agentforge-profile-')
+    finally:
+        os.rmdir(streamed)
@@ -0,0 +1,190 @@
+import asyncio
+import os
+
+import pytest
+
+
+def build(builder, agent_id, **kwargs):
+    return asyncio.run(builder.build_from_repo('finance', 'fraud_detection', 'langchain', 'production',
+                                               {'agent_id': agent_id}, **kwargs))
+
+
+def test_agent_with_upper_bound_pin_builds(agents_repo, builder, agent_id):
+    (agents_repo / 'requirements.txt').write_text('pydantic<2\nnumpy<2.0\n')
+
+    package = build(builder, agent_id)
+
+    assert package['success'] is True
+    assert 'pydantic<2' in package['agent'].dependencies
+
+
+def test_compose_builds_base_image_before_agent(agents_repo, builder, agent_id):
+    import os
+    import yaml
+    from framework_abstractions import dockerfile
+
+    package = build(builder, agent_id)
+    with open(os.path.join(package['package_path'], 'deployment', 'docker-compose.yml')) as f:
+        services = yaml.safe_load(f)['services']
+
+    base = services[dockerfile.BASE_SERVICE]
+    agent = services[agent_id]
+    assert base['build']['dockerfile'] == 'deployment/Dockerfile.base'
+    assert base['image'] == agent['build']['args']['BASE_IMAGE']
+    assert agent['depends_on'][dockerfile.BASE_SERVICE]['condition'] == 'service_completed_successfully'
+
+
+def test_package_readme_documents_two_step_build(agents_repo, builder, agent_id):
+    import os
+
+    package = build(builder, agent_id)
+    with open(os.path.join(package['package_path'], 'README.md')) as f:
+        readme = f.read()
+
+    assert 'docker build -f deployment/Dockerfile.base -t agentforge/langchain-base:' in readme
+    assert f"docker build -f deployment/Dockerfile -t {agent_id} ." in readme
+
+
+def test_cache_hit_returns_same_agent_type_as_fresh_build(agents_repo, builder, agent_id):
+    from framework_abstractions.base import Agent
+
+    fresh = build(builder, agent_id)
+    hit = build(builder, agent_id)
+
+    assert hit.get('cached') is True
+    assert type(hit['agent']) is type(fresh['agent']) is Agent
+    assert hit['agent'].dependencies == fresh['agent'].dependencies
+    assert isinstance(hit['agent'].dependencies, list)
+    assert hit['agent'].compiled_code == fresh['agent'].compiled_code
+
+
+def test_cache_key_covers_adapter_templates(agents_repo, builder, agent_id, tmp_path, monkeypatch):
+    import shutil
+    import sys
+    from build_system import builder as builder_module
+
+    adapter = builder.registry.get_adapter('langchain')
+    module = type(adapter).__module__
+    agent_data = builder.registry.get_agent_from_repo('finance', 'fraud_detection')
+    key = builder._cache_key(agent_data, 'langchain', adapter, {'agent_id': agent_id}, 'production')
+
+    # The same adapter package with an edited runtime template
+    edited = tmp_path / 'adapter'
+    shutil.copytree(os.path.dirname(sys.modules[module].__file__), edited,
+                    ignore=shutil.ignore_patterns('__pycache__'))
+    with open(edited / 'runtime_templates.py', 'a') as f:
+        f.write('\n# changed\n')
+    monkeypatch.setattr(sys.modules[module], '__file__', str(edited / 'adapter.py'))
+    builder_module.adapter_code_version.cache_clear()
+
+    try:
+        assert builder._cache_key(agent_data, 'langchain', adapter, {'agent_id': agent_id}, 'production') != key
+    finally:
+        builder_module.adapter_code_version.cache_clear()
+
+
+class StubBuilds:
+    """Stands in for AgentBuilder.build, recording how many builds overlap"""
+
+    def __init__(self, delay=0.01, failing=(), slow=()):
+        self.delay = delay
+        self.failing = failing
+        self.slow = slow
+        self.running = 0
+        self.peak = 0
+        self.calls = []
+        self.cancelled = []
+        self.finished = []
+
+    async def __call__(self, agent_source, framework, optimization, config):
+        self.calls.append((agent_source, framework, optimization, config))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(5 if agent_source in self.slow else self.delay)
+            if agent_source in self.failing:
+                raise ValueError(f"Agent {agent_source} not found")
+            self.finished.append(agent_source)
+            return {'success': True, 'agent_id': agent_source}
+        except asyncio.CancelledError:
+            self.cancelled.append(agent_source)
+            raise
+        finally:
+            self.running -= 1
+
+
+def build_all(builder, specs, **kwargs):
+    async def main():
+        return [result async for result in builder.build_many(specs, **kwargs)]
+    return asyncio.run(main())
+
+
+def test_build_many_limits_concurrency(builder, monkeypatch):
+    stub = StubBuilds()
+    monkeypatch.setattr(builder, 'build', stub)
+    specs = [f"finance/agent_{i}" for i in range(10)]
+
+    results = build_all(builder, specs, framework='langchain', max_concurrency=3)
+
+    assert stub.peak == 3
+    assert sorted(result['spec'] for result in results) == sorted(specs)
+    assert all(result['success'] for result in results)
+
+
+def test_build_many_reports_errors_per_spec(builder, monkeypatch):
+    stub = StubBuilds(failing=('hr/missing',))
+    monkeypatch.setattr(builder, 'build', stub)
+    override = {'agent_source': 'finance/fraud_detection', 'framework': 'crewai', 'config': {'id': 'x'}}
+
+    results = build_all(builder, ['hr/missing', override, 'hr/resume_screener'], framework='langchain')
+
+    by_spec = {str(result['spec']): result for result in results}
+    assert by_spec['hr/missing'] == {
+        'success': False, 'error': 'ValueError: Agent hr/missing not found', 'spec': 'hr/missing'
+    }
+    assert by_spec[str(override)]['success'] is True
+    assert by_spec['hr/resume_screener']['success'] is True
+    assert ('finance/fraud_detection', 'crewai', 'production', {'id': 'x'}) in stub.calls
+    assert ('hr/resume_screener', 'langchain', 'production', None) in stub.calls
+
+
+def test_build_many_cancels_builds_when_consumer_stops(builder, monkeypatch):
+    stub = StubBuilds(slow=('b/slow', 'c/slow', 'd/queued'))
+    monkeypatch.setattr(builder, 'build', stub)
+
+    async def main():
+        results = builder.build_many(['a/fast', 'b/slow', 'c/slow', 'd/queued'], max_concurrency=3)
+        first = await results.__anext__()
+        await results.aclose()
+        await asyncio.sleep(0)
+        # Checked before asyncio.run cancels whatever is left
+        return first, stub.running, list(stub.cancelled)
+
+    first, running, cancelled = asyncio.run(asyncio.wait_for(main(), 2))
+
+    assert first['spec'] == 'a/fast'
+    assert running == 0
+    assert {'b/slow', 'c/slow'} <= set(cancelled)
+    assert stub.finished == ['a/fast']
+
+
+def test_pip_options_and_vcs_requirements_reach_the_package(agents_repo, builder, agent_id):
+    vcs = 'git+https://github.com/example/scorer.git@v1#egg=scorer'
+    (agents_repo / 'requirements.txt').write_text(f"--extra-index-url https://mirror.example.com/simple\n{vcs}\n")
+
+    package = build(builder, agent_id)
+
+    with open(os.path.join(package['package_path'], 'requirements.txt')) as f:
+        requirements = f.read().splitlines()
+    assert requirements[0] == '--extra-index-url https://mirror.example.com/simple'
+    assert vcs in requirements
+    assert package['agent'].metadata['dependencies']['unresolved'] == [vcs]
+
+
+def test_included_requirements_file_fails_the_build(agents_repo, builder, agent_id):
+    from build_system.dependency_resolver import DependencyConflictError
+
+    (agents_repo / 'requirements.txt').write_text('-r base.txt\n')
+
+    with pytest.raises(DependencyConflictError, match='base.txt'):
+        build(builder, agent_id)
@@ -0,0 +1,74 @@
+from framework_abstractions.source import AgentSource, SourceFile
+from framework_adapters.langchain import components
+
+
+SOURCE = '''from langchain.chat_models import ChatOpenAI
+from langchain.memory import ConversationBufferMemory
+from langchain.tools import tool
+
+
+class FraudChain(LLMChain):
+    pass
+
+
+llm = ChatOpenAI(model="gpt-4")
+memory = ConversationBufferMemory()
+
+
+@tool
+def score(tx: str) -> str:
+    """Score a transaction"""
+    return "0"
+'''
+
+
+def names(found, kind):
+    return [item['name'] for item in found[kind]]
+
+
+def setup_function():
+    components.clear_memo()
+
+
+def test_extracts_components_by_kind():
+    found = components.extract_components(AgentSource.from_string(SOURCE))
+
+    assert names(found, 'chains') == ['FraudChain']
+    assert names(found, 'llm') == ['llm']
+    assert names(found, 'memory') == ['memory']
+    assert names(found, 'tools') == ['score']
+    assert found['errors'] == []
+
+
+def test_unparseable_files_are_errors_not_failures(tmp_path):
+    (tmp_path / 'nul.py').write_bytes(b'x = 1\0\n')
+    (tmp_path / 'latin1.py').write_bytes('name = "caf\xe9"\n'.encode('latin-1'))
+    (tmp_path / 'syntax.py').write_text('def broken(:\n')
+    (tmp_path / 'agent.py').write_text(SOURCE)
+
+    found = components.extract_components(AgentSource.from_directory(str(tmp_path)))
+
+    assert sorted(error['file'] for error in found['errors']) == ['latin1.py', 'nul.py', 'syntax.py']
+    assert names(found, 'tools') == ['score']
+
+
+def test_each_file_is_read_once(tmp_path, monkeypatch):
+    (tmp_path / 'agent.py').write_text(SOURCE)
+    reads = []
+    original = SourceFile.read_bytes
+    monkeypatch.setattr(SourceFile, 'read_bytes', lambda self: reads.append(self.name) or original(self))
+    monkeypatch.setattr(SourceFile, 'read', lambda self: (_ for _ in ()).throw(AssertionError('read twice')))
+    monkeypatch.setattr(SourceFile, 'digest', lambda self: (_ for _ in ()).throw(AssertionError('read twice')))
+
+    components.extract_components(AgentSource.from_directory(str(tmp_path)))
+
+    assert reads == ['agent.py']
+
+
+def test_identical_content_is_memoized(tmp_path):
+    first = components.extract_components(AgentSource.from_string(SOURCE, 'a.py'))
+    second = components.extract_components(AgentSource.from_string(SOURCE, 'b.py'))
+
+    assert names(first, 'tools') == names(second, 'tools')
+    assert second['tools'][0]['file'] == 'b.py'
+    assert len(components._memo) == 1
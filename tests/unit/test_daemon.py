@@ -0,0 +1,63 @@
+import asyncio
+import os
+import stat
+
+import pytest
+
+from build_system import daemon
+from build_system.daemon import BuildClient, BuildDaemon
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_default_socket_is_per_user(monkeypatch, tmp_path):
+    monkeypatch.delenv('AGENTFORGE_SOCKET', raising=False)
+
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    assert daemon.default_socket() == str(tmp_path / 'agentforge' / 'daemon.sock')
+
+    monkeypatch.delenv('XDG_RUNTIME_DIR')
+    assert f"agentforge-{os.getuid()}" in daemon.default_socket()
+
+    monkeypatch.setenv('AGENTFORGE_SOCKET', '/run/custom.sock')
+    assert daemon.default_socket() == '/run/custom.sock'
+
+
+def test_socket_is_private_from_bind(agents_repo, tmp_path):
+    socket_path = str(tmp_path / 'run' / 'daemon.sock')
+    modes = []
+    start_unix_server = asyncio.start_unix_server
+
+    async def recording_start(*args, **kwargs):
+        server = await start_unix_server(*args, **kwargs)
+        modes.append(mode(socket_path))
+        return server
+
+    async def main():
+        server = BuildDaemon(socket_path, frameworks=['langchain'], cache_dir=str(tmp_path / 'builds'))
+        daemon.asyncio.start_unix_server = recording_start
+        try:
+            await server.start()
+        finally:
+            daemon.asyncio.start_unix_server = start_unix_server
+        try:
+            return await BuildClient(socket_path).ping()
+        finally:
+            await server.close()
+
+    assert asyncio.run(main()) is True
+    assert modes == [0o600]
+    assert mode(tmp_path / 'run') == 0o700
+
+
+def test_client_refuses_socket_of_another_user(tmp_path, monkeypatch):
+    socket_path = tmp_path / 'daemon.sock'
+    socket_path.touch()
+    monkeypatch.setattr(os, 'getuid', lambda: os.stat(socket_path).st_uid + 1)
+
+    assert asyncio.run(BuildClient(str(socket_path)).ping()) is False
+    with pytest.raises(PermissionError):
+        asyncio.run(BuildClient(str(socket_path), fallback=False)._connect())
+    assert asyncio.run(BuildClient(str(socket_path))._connect()) is None
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from build_system.dependency_resolver import DependencyResolver, DependencyConflictError
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    return DependencyResolver(cache_dir=str(tmp_path / 'resolutions'))
+
+
+@pytest.mark.parametrize('requirements', [
+    ['pydantic<2'],
+    ['numpy<2.0'],
+    ['legacy<1.0'],
+    ['pydantic>=1.10,<2'],
+    ['pydantic>=1.10', 'pydantic<2'],
+    ['requests==2.31.0', 'requests!=2.30.0'],
+    ['langchain~=0.1.5', 'langchain<0.2'],
+    ['tiny>0.1,<0.1.1']
+])
+def test_satisfiable_requirements_resolve(resolver, requirements):
+    resolution = resolver.resolve(requirements, strict=True)
+
+    assert resolution.conflicts == []
+
+
+@pytest.mark.parametrize('requirements', [
+    ['requests==2.31.0', 'requests!=2.31.0'],
+    ['pydantic>=2', 'pydantic<2'],
+    ['numpy<0'],
+    ['langchain==0.1.5', 'langchain==0.1.6']
+])
+def test_real_conflicts_are_reported(resolver, requirements):
+    with pytest.raises(DependencyConflictError):
+        resolver.resolve(requirements, strict=True)
+
+
+def test_requirement_sets_are_merged(resolver):
+    resolution = resolver.resolve(['requests>=2.0', 'langchain>=0.1.5'], ['langchain<0.2', '# comment', ''])
+
+    assert resolution.requirements == ['langchain<0.2,>=0.1.5', 'requests>=2.0']
+
+
+def test_snapshot_pins_newest_allowed_version(tmp_path):
+    snapshot = tmp_path / 'index.json'
+    snapshot.write_text(json.dumps({'pydantic': ['1.10.13', '2.5.0'], 'requests': ['2.31.0']}))
+    resolver = DependencyResolver(index_snapshot=str(snapshot), cache_dir=None)
+
+    resolution = resolver.resolve(['pydantic<2', 'requests', 'unknown-package'])
+
+    assert resolution.pins == {'pydantic': '1.10.13', 'requests': '2.31.0'}
+    assert resolution.unresolved == ['unknown-package']
+
+
+def test_snapshot_without_allowed_version_conflicts(tmp_path):
+    snapshot = tmp_path / 'index.json'
+    snapshot.write_text(json.dumps({'pydantic': ['2.5.0']}))
+    resolver = DependencyResolver(index_snapshot=str(snapshot), cache_dir=None)
+
+    assert resolver.resolve(['pydantic<2']).conflicts
+
+
+def test_pip_options_and_unparsed_requirements_are_kept(resolver):
+    vcs = 'git+https://github.com/example/scorer.git@v1#egg=scorer'
+    editable = '-e git+https://github.com/example/tools.git#egg=tools'
+
+    resolution = resolver.resolve([
+        '--index-url https://pypi.example.com/simple',
+        'requests>=2.0',
+        editable,
+        vcs,
+        '--extra-index-url=https://mirror.example.com/simple  # mirror'
+    ], strict=True)
+
+    assert resolution.requirements == [
+        '--extra-index-url=https://mirror.example.com/simple',
+        '--index-url https://pypi.example.com/simple',
+        editable,
+        'requests>=2.0',
+        vcs
+    ]
+    assert resolution.unresolved == [editable, vcs]
+    assert any(vcs in warning for warning in resolution.warnings)
+
+
+@pytest.mark.parametrize('line', ['-r base.txt', '-rbase.txt', '--requirement=base.txt', '-c constraints.txt'])
+def test_included_requirement_files_fail_the_build(resolver, line):
+    with pytest.raises(DependencyConflictError, match='not packaged'):
+        resolver.resolve(['requests', line], strict=True)
+
+
+def test_option_lines_change_the_digest(resolver):
+    plain = resolver.resolve(['requests'])
+    indexed = resolver.resolve(['requests', '--index-url https://pypi.example.com/simple'])
+
+    assert plain.digest != indexed.digest
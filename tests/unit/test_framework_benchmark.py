@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+from testing_utilities import framework_benchmark
+
+
+# Stubbed measurements per framework, as profile_agent.measure_package returns them
+LOADS = {
+    'fast': {'rps': 40.0, 'latency_ms': {'p50': 300.0, 'p95': 600.0}, 'peak_rss_bytes': 300,
+             'cpu_seconds': 4.0, 'cold_start_seconds': 2.0, 'requests': 800, 'errors': 0, 'shed': 0},
+    'lean': {'rps': 25.0, 'latency_ms': {'p50': 250.0, 'p95': 400.0}, 'peak_rss_bytes': 100,
+             'cpu_seconds': 2.0, 'cold_start_seconds': 1.0, 'requests': 500, 'errors': 1, 'shed': 0}
+}
+
+
+class StubAdapter:
+    version = '1.2.3'
+
+
+class StubBuilder:
+    def __init__(self, use_cache=True):
+        assert use_cache is False
+
+    async def build_from_repo(self, category, agent_name, framework, optimization):
+        if framework == 'broken':
+            raise RuntimeError('adapter crashed')
+        return {'package_path': f"/packages/{framework}/{category}/{agent_name}"}
+
+
+def stub_measure(package_path, concurrency, duration, warmup, llm_latency, tokens_per_second):
+    return LOADS[package_path.split('/')[2]]
+
+
+def compare(monkeypatch, frameworks, **kwargs):
+    monkeypatch.setattr(framework_benchmark, 'AgentBuilder', StubBuilder)
+    monkeypatch.setattr(framework_benchmark, 'measure_package', stub_measure)
+    monkeypatch.setattr(framework_benchmark.FrameworkRegistry, 'get_adapter',
+                        classmethod(lambda cls, name: None if name == 'missing' else StubAdapter()))
+    return asyncio.run(framework_benchmark.compare_frameworks('finance/fraud_detection', frameworks, **kwargs))
+
+
+def test_report_shape_and_per_framework_results(monkeypatch):
+    report = compare(monkeypatch, ['fast', 'lean', 'broken', 'missing'], concurrency=8, duration=5.0)
+
+    assert report['version'] == framework_benchmark.REPORT_VERSION
+    assert report['agent'] == 'finance/fraud_detection'
+    assert set(report['environment']) == {'python', 'platform', 'cpu_count'}
+    assert report['parameters']['concurrency'] == 8
+    assert report['parameters']['duration'] == 5.0
+    assert report['parameters']['optimization'] == 'production'
+
+    frameworks = report['frameworks']
+    assert frameworks['missing'] == {'status': 'unavailable'}
+    assert frameworks['broken'] == {
+        'status': 'failed', 'adapter_version': '1.2.3', 'error': 'RuntimeError: adapter crashed'
+    }
+    fast = frameworks['fast']
+    assert fast['status'] == 'ok'
+    assert fast['adapter_version'] == '1.2.3'
+    assert fast['build_seconds'] >= 0
+    assert {key: fast[key] for key in LOADS['fast']} == LOADS['fast']
+    json.dumps(report)
+
+
+def test_rankings_order_measured_frameworks_best_first(monkeypatch):
+    report = compare(monkeypatch, ['lean', 'broken', 'fast', 'missing'])
+
+    assert report['rankings'] == {
+        'throughput': ['fast', 'lean'],
+        'p95_latency': ['lean', 'fast'],
+        'memory': ['lean', 'fast'],
+        'cold_start': ['lean', 'fast']
+    }
+
+
+def test_rankings_skip_frameworks_without_a_measure():
+    results = {
+        'a': {'status': 'ok', 'rps': 10.0, 'latency_ms': {}, 'peak_rss_bytes': None, 'cold_start_seconds': 1.0},
+        'b': {'status': 'ok', 'rps': 20.0, 'latency_ms': {'p95': 5.0}, 'peak_rss_bytes': 10,
+              'cold_start_seconds': 2.0},
+        'c': {'status': 'failed', 'rps': 99.0}
+    }
+
+    assert framework_benchmark._rankings(results) == {
+        'throughput': ['b', 'a'],
+        'p95_latency': ['b'],
+        'memory': ['b'],
+        'cold_start': ['a', 'b']
+    }
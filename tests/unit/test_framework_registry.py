@@ -0,0 +1,79 @@
+import pytest
+
+from framework_registry import FrameworkRegistry
+
+
+def test_malformed_spec_fails_alone(agents_repo):
+    results = FrameworkRegistry.build_agents_parallel(
+        ['finance/fraud_detection', 'not-a-spec', 'finance/'], 'langchain', max_workers=1
+    )
+
+    assert [r['success'] for r in results] == [True, False, False]
+    assert results[0]['agent'].framework == 'langchain'
+    assert "'not-a-spec'" in results[1]['error']
+    assert results[2]['agent_category'] == 'finance/'
+
+
+def test_missing_agent_fails_alone(agents_repo):
+    results = FrameworkRegistry.build_agents_parallel(
+        ['finance/missing', 'finance/fraud_detection'], 'langchain', max_workers=1
+    )
+
+    assert [r['success'] for r in results] == [False, True]
+    assert 'not found' in results[0]['error']
+
+
+@pytest.fixture
+def adapter_loads(monkeypatch):
+    """Empty adapter cache, counting how often each adapter is loaded"""
+    monkeypatch.setattr(FrameworkRegistry, '_adapters', {})
+    loads = []
+    load_adapter = FrameworkRegistry._load_adapter.__func__
+
+    def counting(cls, framework):
+        loads.append(framework.name)
+        return load_adapter(cls, framework)
+    monkeypatch.setattr(FrameworkRegistry, '_load_adapter', classmethod(counting))
+    return loads
+
+
+def test_get_adapter_reuses_one_instance_across_threads(adapter_loads):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        adapters = list(pool.map(FrameworkRegistry.get_adapter, ['langchain'] * 32))
+
+    assert all(adapter is adapters[0] for adapter in adapters)
+    assert type(adapters[0]).__name__ == 'LangChainAdapter'
+    assert adapter_loads == ['langchain']
+
+
+def test_missing_adapter_is_cached_as_none(adapter_loads):
+    assert FrameworkRegistry.get_adapter('crewai') is None
+    assert FrameworkRegistry.get_adapter('crewai') is None
+    assert adapter_loads == ['crewai']
+
+
+def test_unknown_framework_is_rejected(adapter_loads):
+    with pytest.raises(ValueError, match='not supported'):
+        FrameworkRegistry.get_adapter('nope')
+    assert adapter_loads == []
+
+
+def test_warmup_loads_adapters_once(adapter_loads):
+    assert FrameworkRegistry.warmup(['langchain', 'crewai']) == {'langchain': True, 'crewai': False}
+    adapter = FrameworkRegistry.get_adapter('langchain')
+
+    assert FrameworkRegistry.warmup() == {name: name == 'langchain' for name in FrameworkRegistry.list_frameworks()}
+    assert FrameworkRegistry.get_adapter('langchain') is adapter
+    assert sorted(adapter_loads) == sorted(FrameworkRegistry.list_frameworks())
+
+
+def test_clear_adapter_cache_loads_a_new_instance(adapter_loads):
+    adapter = FrameworkRegistry.get_adapter('langchain')
+
+    FrameworkRegistry.clear_adapter_cache()
+
+    assert FrameworkRegistry._adapters == {}
+    assert FrameworkRegistry.get_adapter('langchain') is not adapter
+    assert adapter_loads == ['langchain', 'langchain']
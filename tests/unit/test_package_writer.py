@@ -0,0 +1,74 @@
+import os
+import json
+
+from build_system.package_writer import PackageWriter, MANIFEST_FILE
+
+
+def write(package_dir, files, incremental=True):
+    writer = PackageWriter(package_dir, incremental=incremental)
+    for path, text in files.items():
+        writer.add_text(path, text)
+    return writer.write()
+
+
+def read_manifest(package_dir):
+    with open(os.path.join(package_dir, MANIFEST_FILE)) as f:
+        return json.load(f)['files']
+
+
+def test_incremental_write_skips_unchanged_files(tmp_path):
+    package_dir = str(tmp_path / 'package')
+    write(package_dir, {'agent.py': 'a', 'README.md': 'r'})
+    mtime = os.stat(os.path.join(package_dir, 'README.md')).st_mtime_ns
+
+    changes = write(package_dir, {'agent.py': 'b', 'README.md': 'r'})
+
+    assert changes['written'] == ['agent.py']
+    assert changes['unchanged'] == ['README.md']
+    assert os.stat(os.path.join(package_dir, 'README.md')).st_mtime_ns == mtime
+
+
+def test_dropped_files_are_removed(tmp_path):
+    package_dir = str(tmp_path / 'package')
+    write(package_dir, {'agent.py': 'a', 'tools/extra.py': 'x'})
+
+    changes = write(package_dir, {'agent.py': 'a'})
+
+    assert changes['removed'] == ['tools/extra.py']
+    assert not os.path.exists(os.path.join(package_dir, 'tools'))
+
+
+def test_file_edited_in_package_is_rewritten(tmp_path):
+    package_dir = str(tmp_path / 'package')
+    write(package_dir, {'agent.py': 'a'})
+    with open(os.path.join(package_dir, 'agent.py'), 'w') as f:
+        f.write('edited by hand')
+
+    changes = write(package_dir, {'agent.py': 'a'})
+
+    assert changes['written'] == ['agent.py']
+    with open(os.path.join(package_dir, 'agent.py')) as f:
+        assert f.read() == 'a'
+
+
+def test_non_incremental_write_rewrites_manifest(tmp_path):
+    package_dir = str(tmp_path / 'package')
+    write(package_dir, {'agent.py': 'a', 'old.py': 'o'})
+
+    write(package_dir, {'agent.py': 'b'}, incremental=False)
+
+    assert set(read_manifest(package_dir)) == {'agent.py'}
+    assert not os.path.exists(os.path.join(package_dir, 'old.py'))
+
+
+def test_incremental_write_after_non_incremental_trusts_only_real_hashes(tmp_path):
+    package_dir = str(tmp_path / 'package')
+    write(package_dir, {'agent.py': 'a'})
+    write(package_dir, {'agent.py': 'b'}, incremental=False)
+
+    # The stale manifest said 'a'; writing 'a' again must not be skipped
+    changes = write(package_dir, {'agent.py': 'a'})
+
+    assert changes['written'] == ['agent.py']
+    with open(os.path.join(package_dir, 'agent.py')) as f:
+        assert f.read() == 'a'
@@ -0,0 +1,428 @@
+import asyncio
+
+import pytest
+
+
+def generated(**optimizations):
+    """Namespace of the LangChain agent module built with the given optimizations"""
+    from framework_adapters.langchain.adapter import LangChainAdapter
+
+    adapter = LangChainAdapter()
+    code = adapter._apply_optimizations(adapter._generate_langchain_code({}, {}), optimizations)
+    namespace = {'__name__': 'generated_agent'}
+    exec(compile(code, 'agent.py', 'exec'), namespace)
+    return namespace
+
+
+@pytest.fixture
+def make_agent(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test')
+
+    def make(config=None, **optimizations):
+        namespace = generated(**optimizations)
+        return namespace, namespace['LangChainAgent'](dict(config or {}))
+    return make
+
+
+class EventsOnlyAgent:
+    """astream_events without any LLM token events, like an LLM cache hit"""
+
+    async def astream_events(self, inputs, version):
+        yield {'event': 'on_chain_start', 'run_id': 'root', 'data': {}}
+        yield {'event': 'on_chain_end', 'run_id': 'root', 'data': {'output': {'output': 'cached answer'}}}
+
+
+class InvokeOnlyAgent:
+    """ainvoke that never calls back with tokens"""
+
+    async def ainvoke(self, inputs, config=None):
+        return {'output': 'cached answer'}
+
+
+async def collect(stream):
+    return [token async for token in stream]
+
+
+@pytest.mark.parametrize('fake', [EventsOnlyAgent, InvokeOnlyAgent])
+def test_stream_yields_output_when_no_tokens_streamed(make_agent, fake):
+    _, agent = make_agent(streaming=True, **{'async': True})
+    agent.agent = fake()
+
+    assert asyncio.run(collect(agent.stream('hi'))) == ['cached answer']
+
+
+def test_lifespan_reports_startup_failure():
+    namespace = generated(streaming=True, **{'async': True})
+
+    def broken():
+        raise RuntimeError('no model configured')
+
+    app = namespace['AgentApp'](factory=broken)
+    sent = []
+
+    async def receive():
+        return {'type': 'lifespan.startup'}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({'type': 'lifespan'}, receive, send))
+
+    assert sent == [{'type': 'lifespan.startup.failed', 'message': 'no model configured'}]
+
+
+def run_concurrently(agent, count):
+    async def main():
+        return await asyncio.gather(*(agent.run(f"q{i}") for i in range(count)))
+    return asyncio.run(main())
+
+
+def test_runs_stay_within_concurrency(make_agent):
+    _, agent = make_agent({'max_concurrency': 3}, **{'async': True})
+
+    running, peak = 0, 0
+
+    class SlowAgent:
+        async def ainvoke(self, inputs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {'output': inputs['input']}
+
+    agent.agent = SlowAgent()
+    outputs = run_concurrently(agent, 12)
+
+    assert outputs == [f"q{i}" for i in range(12)]
+    assert peak == 3
+
+
+class SlowStreamingAgent:
+    """astream_events that counts how many streams run at once"""
+
+    def __init__(self):
+        self.running, self.peak = 0, 0
+
+    async def astream_events(self, inputs, version):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            yield {'event': 'on_chain_start', 'run_id': 'root', 'data': {}}
+            for token in ('a', 'b'):
+                await asyncio.sleep(0.01)
+                yield {'event': 'on_chat_model_stream', 'run_id': 'llm', 'data': {'chunk': token}}
+            yield {'event': 'on_chain_end', 'run_id': 'root', 'data': {'output': {'output': 'ab'}}}
+        finally:
+            self.running -= 1
+
+
+def test_streams_stay_within_concurrency(make_agent):
+    _, agent = make_agent({'max_concurrency': 2}, streaming=True, **{'async': True})
+    agent.agent = SlowStreamingAgent()
+
+    async def main():
+        return await asyncio.gather(*(collect(agent.stream(f"q{i}")) for i in range(6)))
+
+    assert asyncio.run(main()) == [['a', 'b']] * 6
+    assert agent.agent.peak == 2
+
+
+def test_abandoned_stream_releases_its_permit(make_agent):
+    _, agent = make_agent({'max_concurrency': 1}, streaming=True, **{'async': True})
+    agent.agent = SlowStreamingAgent()
+
+    async def main():
+        stream = agent.stream('q')
+        first = await stream.__anext__()
+        await stream.aclose()
+        return first, await asyncio.wait_for(collect(agent.stream('q')), 1)
+
+    assert asyncio.run(main()) == ('a', ['a', 'b'])
+    assert agent.agent.running == 0
+
+
+def test_stream_without_streaming_path_does_not_wait_on_its_own_permit(make_agent):
+    _, agent = make_agent({'max_concurrency': 1}, streaming=True, **{'async': True})
+
+    class BlockingAgent:
+        def run(self, input, chat_history):
+            return f"echo {input}"
+
+    agent.agent = BlockingAgent()
+
+    assert asyncio.run(asyncio.wait_for(collect(agent.stream('hi')), 1)) == ['echo hi']
+
+
+@pytest.fixture
+def caches():
+    return generated(cache=True)
+
+
+def test_lru_cache_evicts_least_recently_used(caches):
+    cache = caches['LRUCache'](max_entries=2)
+    cache.update('a', 'llm', ['A'])
+    cache.update('b', 'llm', ['B'])
+    assert cache.lookup('a', 'llm') == ['A']
+
+    cache.update('c', 'llm', ['C'])
+
+    assert cache.lookup('b', 'llm') is None
+    assert cache.lookup('a', 'llm') == ['A']
+    assert cache.lookup('c', 'llm') == ['C']
+    assert cache.lookup('a', 'other llm') is None
+    assert (cache.hits, cache.misses) == (3, 2)
+    assert cache.stats() == {'entries': 2}
+
+
+def test_sqlite_cache_expires_entries_after_ttl(caches, tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / 'cache' / 'llm.sqlite')
+    cache = caches['SQLiteCache'](path, ttl_seconds=60)
+    cache.update('fresh', 'llm', ['F'])
+    cache.update('stale', 'llm', ['S'])
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE llm_cache SET created = created - 120 WHERE key = ?", (cache._key('stale', 'llm'),))
+
+    assert cache.lookup('fresh', 'llm') == ['F']
+    assert cache.lookup('stale', 'llm') is None
+
+    cache._evict(cache._connect())
+    assert cache.stats()['entries'] == 1
+
+
+def test_sqlite_cache_evicts_least_recently_used_past_max_bytes(caches, tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / 'llm.sqlite')
+    cache = caches['SQLiteCache'](path, max_bytes=4096)
+    cache.EVICT_EVERY = 1
+    for i in range(4):
+        cache.update(f"p{i}", 'llm', ['x' * 1000])
+        with sqlite3.connect(path) as conn:
+            conn.execute('UPDATE llm_cache SET accessed = ? WHERE key = ?', (i, cache._key(f"p{i}", 'llm')))
+
+    cache.update('p4', 'llm', ['x' * 1000])
+
+    assert cache.stats()['bytes'] <= 4096 * 0.9
+    assert cache.lookup('p0', 'llm') is None
+    assert cache.lookup('p4', 'llm') == ['x' * 1000]
+
+
+def test_sqlite_cache_is_shared_across_processes(tmp_path):
+    import subprocess
+    import sys
+    from framework_adapters.langchain.adapter import LangChainAdapter
+
+    adapter = LangChainAdapter()
+    (tmp_path / 'agent.py').write_text(
+        adapter._apply_optimizations(adapter._generate_langchain_code({}, {}), {'cache': True})
+    )
+    path = str(tmp_path / 'llm.sqlite')
+    writer = (
+        "import agent\n"
+        "from langchain_core.outputs import Generation\n"
+        f"agent.SQLiteCache({path!r}).update('prompt', 'llm', [Generation(text='from another worker')])\n"
+    )
+    subprocess.run([sys.executable, '-c', writer], cwd=str(tmp_path), check=True)
+
+    cache = generated(cache=True)['SQLiteCache'](path)
+
+    assert [generation.text for generation in cache.lookup('prompt', 'llm')] == ['from another worker']
+
+
+def test_sqlite_cache_defaults_to_private_user_directory(caches, tmp_path, monkeypatch):
+    import os
+    import stat
+
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+
+    cache = caches['create_llm_cache']({'cache_backend': 'sqlite'})
+
+    assert cache.path == str(tmp_path / 'xdg' / 'agentforge' / 'llm-cache.sqlite')
+    assert stat.S_IMODE(os.stat(os.path.dirname(cache.path)).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+
+
+def test_sqlite_cache_refuses_directory_others_can_write(caches, tmp_path):
+    import os
+
+    shared = tmp_path / 'shared'
+    shared.mkdir()
+    os.chmod(str(shared), 0o777)
+
+    with pytest.raises(PermissionError):
+        caches['SQLiteCache'](str(shared / 'llm.sqlite'))
+
+
+class WordLLM:
+    """Counts words as tokens and summarizes by joining what it is asked to fold"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def get_num_tokens(self, text):
+        return len(text.split())
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return f"summary {len(self.prompts)}"
+
+    async def ainvoke(self, prompt):
+        return self.invoke(prompt)
+
+
+@pytest.fixture
+def memory():
+    namespace = generated()
+
+    def make(llm=None, **config):
+        return namespace['SessionMemory'](config, llm=llm)
+    make.namespace = namespace
+    return make
+
+
+def contents(messages):
+    return [message.content for message in messages]
+
+
+def test_window_memory_keeps_last_turns_per_session(memory):
+    sessions = memory(window_turns=2)
+    for i in range(3):
+        sessions.record('a', f"q{i}", f"a{i}")
+    sessions.record('b', 'other', 'answer')
+
+    assert contents(sessions.history('a')) == ['q1', 'a1', 'q2', 'a2']
+    assert contents(sessions.history('b')) == ['other', 'answer']
+    assert sessions.history(None) == []
+    assert sessions.history('unknown') == []
+
+
+def test_token_memory_keeps_newest_turns_within_max_tokens(memory):
+    sessions = memory(WordLLM(), strategy='token', max_tokens=6)
+    sessions.record('a', 'one two', 'three four')
+    sessions.record('a', 'five six', 'seven eight')
+
+    assert contents(sessions.history('a')) == ['five six', 'seven eight']
+
+    # A single turn over the limit is still kept
+    sessions.record('a', 'a b c d', 'e f g h')
+    assert contents(sessions.history('a')) == ['a b c d', 'e f g h']
+
+
+def test_summary_memory_folds_old_turns_into_summary(memory):
+    llm = WordLLM()
+    sessions = memory(llm, strategy='summary', max_tokens=4)
+    sessions.record('a', 'one two', 'three four')
+    sessions.record('a', 'five six', 'seven eight')
+    asyncio.run(sessions.arecord('a', 'nine ten', 'eleven twelve'))
+
+    history = sessions.history('a')
+
+    assert contents(history) == ['Summary of the conversation so far: summary 2', 'nine ten', 'eleven twelve']
+    assert type(history[0]).__name__ == 'SystemMessage'
+    assert 'Human: one two\nAI: three four' in llm.prompts[0]
+    assert 'Previous summary: summary 1' in llm.prompts[1]
+    assert 'Human: five six\nAI: seven eight' in llm.prompts[1]
+
+
+def test_no_memory_strategy_stores_nothing(memory):
+    sessions = memory(strategy='none')
+    sessions.record('a', 'q', 'a')
+
+    assert sessions.history('a') == []
+    assert sessions.stats() == {'sessions': 0, 'bytes': 0, 'evicted': 0}
+
+
+def test_least_recently_used_sessions_are_evicted_past_max_sessions(memory):
+    sessions = memory(max_sessions=2)
+    sessions.record('a', 'q', 'a')
+    sessions.record('b', 'q', 'a')
+    sessions.history('a')
+
+    sessions.record('c', 'q', 'a')
+
+    assert sessions.history('b') == []
+    assert contents(sessions.history('a')) == ['q', 'a']
+    assert sessions.stats() == {'sessions': 2, 'bytes': 4, 'evicted': 1}
+
+
+def test_sessions_are_evicted_past_max_bytes(memory):
+    sessions = memory(max_bytes=100)
+    sessions.record('a', 'x' * 40, 'y' * 40)
+    sessions.record('b', 'x' * 30, 'y' * 30)
+
+    assert sessions.history('a') == []
+    assert sessions.stats() == {'sessions': 1, 'bytes': 60, 'evicted': 1}
+
+
+def test_idle_sessions_expire(memory, monkeypatch):
+    import time
+
+    clock = [1000.0]
+    monkeypatch.setitem(memory.namespace, 'time', type('Clock', (), {
+        'monotonic': staticmethod(lambda: clock[0]), 'time': staticmethod(time.time)
+    }))
+    sessions = memory(idle_ttl_seconds=60)
+    sessions.record('a', 'q', 'a')
+    clock[0] += 30
+    sessions.record('b', 'q', 'a')
+
+    clock[0] += 45
+    assert sessions.history('a') == []
+    assert contents(sessions.history('b')) == ['q', 'a']
+    assert sessions.stats()['evicted'] == 1
+
+
+def test_async_run_is_a_coroutine(make_agent):
+    import inspect
+
+    _, sync_agent = make_agent()
+    _, async_agent = make_agent(**{'async': True})
+
+    assert not inspect.iscoroutinefunction(sync_agent.run)
+    assert inspect.iscoroutinefunction(async_agent.run)
+
+
+@pytest.mark.parametrize('blocking', [False, True])
+def test_async_run_does_not_block_the_event_loop(make_agent, blocking):
+    import time
+
+    _, agent = make_agent({'max_concurrency': 4}, **{'async': True})
+
+    class NativeAgent:
+        async def ainvoke(self, inputs):
+            await asyncio.sleep(0.2)
+            return {'output': inputs['input']}
+
+    class BlockingAgent:
+        def run(self, input, chat_history):
+            # Without ainvoke/arun run() goes to the executor
+            time.sleep(0.2)
+            return input
+
+    agent.agent = BlockingAgent() if blocking else NativeAgent()
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.ensure_future(ticker())
+        started = time.monotonic()
+        outputs = await asyncio.gather(*(agent.run(f"q{i}") for i in range(4)))
+        elapsed = time.monotonic() - started
+        ticking.cancel()
+        return outputs, elapsed, ticks
+
+    outputs, elapsed, ticks = asyncio.run(main())
+
+    assert outputs == ['q0', 'q1', 'q2', 'q3']
+    # The four calls overlap, and the loop keeps serving other tasks meanwhile
+    assert elapsed < 0.6
+    assert ticks >= 5
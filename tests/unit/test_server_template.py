@@ -0,0 +1,89 @@
+import asyncio
+import importlib.util
+import json
+import sys
+
+import pytest
+
+from build_system.server_template import generate_server
+
+
+AGENT_APP = '''import asyncio
+
+release = None
+
+
+async def app(scope, receive, send):
+    await release.wait()
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b'ok'})
+'''
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """The generated src/server.py, serving a test app that waits for server.agent.release"""
+    (tmp_path / 'held_agent_app.py').write_text(AGENT_APP)
+    (tmp_path / 'server.py').write_text(generate_server('test-agent', 'held_agent_app:app'))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'held_agent_app', raising=False)
+
+    spec = importlib.util.spec_from_file_location('generated_server', tmp_path / 'server.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.agent = sys.modules['held_agent_app']
+    yield module
+    sys.modules.pop('held_agent_app', None)
+
+
+async def request(app, path='/run'):
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({'type': 'http', 'method': 'POST', 'path': path}, receive, send)
+    body = sent[-1]['body']
+    return sent[0]['status'], json.loads(body) if path == '/readyz' else body
+
+
+def test_burst_is_bounded_by_max_queue(server):
+    app = server.AdmissionControl(server.agent_app, max_concurrency=1, max_queue=1, queue_timeout=5)
+
+    async def main():
+        server.agent.release = asyncio.Event()
+        burst = [asyncio.ensure_future(request(app)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        _, stats = await request(app, '/readyz')
+        server.agent.release.set()
+        return stats, [status for status, _ in await asyncio.gather(*burst)]
+
+    stats, statuses = asyncio.run(main())
+
+    assert stats['in_flight'] == 1
+    assert stats['queued'] == 1
+    assert sorted(statuses) == [200, 200, 503, 503, 503]
+    assert app.shed == 3
+    assert app.admitted == 0
+
+
+def test_queue_timeout_frees_its_place(server):
+    app = server.AdmissionControl(server.agent_app, max_concurrency=1, max_queue=1, queue_timeout=0.05)
+
+    async def main():
+        server.agent.release = asyncio.Event()
+        running = asyncio.ensure_future(request(app))
+        await asyncio.sleep(0.01)
+        timed_out = await request(app)
+        queued = app.queued
+        server.agent.release.set()
+        return timed_out, queued, await running
+
+    timed_out, queued, running = asyncio.run(main())
+
+    assert timed_out == (503, b'{"error": "Timed out waiting in queue"}')
+    assert queued == 0
+    assert running == (200, b'ok')
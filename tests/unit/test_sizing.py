@@ -0,0 +1,126 @@
+import json
+
+import pytest
+
+from framework_abstractions import sizing
+from framework_abstractions.sizing import PerformanceProfile
+
+MIB = sizing.MIB
+
+
+def profile(**overrides):
+    values = dict(rss_bytes=100 * MIB, p95_latency_ms=250.0, rps_per_replica=20.0, concurrency=8)
+    values.update(overrides)
+    return PerformanceProfile(**values)
+
+
+def load_result(**overrides):
+    result = {
+        'url': 'http://localhost:8000/run',
+        'concurrency': 8,
+        'duration': 10.0,
+        'rps': 20.0,
+        'latency_ms': {'p50': 200.0, 'p95': 250.0},
+        'peak_rss_bytes': 100 * MIB,
+        'cpu_seconds': 5.0
+    }
+    result.update(overrides)
+    return result
+
+
+@pytest.mark.parametrize('rss_bytes', [0, None, -1])
+def test_profile_without_memory_measurement_is_rejected(rss_bytes):
+    with pytest.raises(ValueError, match='rss_bytes'):
+        profile(rss_bytes=rss_bytes)
+
+
+def test_load_result_without_pid_sampling_is_rejected():
+    result = load_result()
+    del result['peak_rss_bytes'], result['cpu_seconds']
+
+    with pytest.raises(ValueError, match='rss_bytes'):
+        PerformanceProfile.from_load_result(result)
+
+
+def test_profile_from_load_result_and_file(tmp_path):
+    measured = PerformanceProfile.from_load_result(load_result())
+
+    assert measured.cpu_cores == 0.5
+    assert measured.p50_latency_ms == 200.0
+    assert measured.source == 'http://localhost:8000/run'
+
+    path = str(tmp_path / 'profile.json')
+    measured.save(path)
+    assert json.load(open(path))['rss_bytes'] == 100 * MIB
+    assert PerformanceProfile.coerce(path) == measured
+
+
+@pytest.mark.parametrize('rps, p95_ms, expected', [
+    (20.0, 250.0, 5),   # 20 requests/s x 0.25 s in flight
+    (20.0, 260.0, 6),   # rounded up
+    (0.5, 100.0, 1)     # never below one
+])
+def test_container_concurrency_follows_littles_law(rps, p95_ms, expected):
+    assert sizing.container_concurrency(profile(rps_per_replica=rps, p95_latency_ms=p95_ms)) == expected
+
+
+def test_kubernetes_resources_round_up_measured_memory():
+    resources = sizing.kubernetes_resources(profile(cpu_cores=0.5))
+
+    assert resources['requests'] == {'cpu': '550m', 'memory': '128Mi'}
+    assert resources['limits'] == {'cpu': '1100m', 'memory': '160Mi'}
+
+
+def test_replicas_carry_target_rps_at_target_utilization():
+    scaling = {'target_rps': 100, 'target_utilization': 0.7}
+
+    assert sizing.replica_range(profile(rps_per_replica=10.0), scaling) == {'min': 15, 'max': 60}
+    assert sizing.replica_range(profile(), {'max_replicas': 5}) == {'min': 2, 'max': 5}
+
+
+def test_hpa_scales_on_cpu_utilization():
+    spec = sizing.hpa_spec('agent', profile(rps_per_replica=10.0), {'target_rps': 100, 'target_utilization': 0.5})
+
+    assert spec['kind'] == 'HorizontalPodAutoscaler'
+    assert spec['spec']['scaleTargetRef']['name'] == 'agent'
+    assert (spec['spec']['minReplicas'], spec['spec']['maxReplicas']) == (20, 80)
+    metric = spec['spec']['metrics'][0]['resource']
+    assert metric['name'] == 'cpu'
+    assert metric['target'] == {'type': 'Utilization', 'averageUtilization': 50}
+
+
+def test_keda_scales_on_measured_request_rate():
+    spec = sizing.keda_spec('agent', profile(rps_per_replica=10.0), {'prometheus_address': 'http://prom:9090'})
+
+    assert spec['kind'] == 'ScaledObject'
+    assert (spec['spec']['minReplicaCount'], spec['spec']['maxReplicaCount']) == (2, 8)
+    trigger = spec['spec']['triggers'][0]
+    assert trigger['type'] == 'prometheus'
+    assert trigger['metadata']['serverAddress'] == 'http://prom:9090'
+    assert trigger['metadata']['threshold'] == '7.00'
+    assert 'service="agent"' in trigger['metadata']['query']
+
+
+def test_lambda_memory_covers_rss_and_timeout_p95():
+    settings = sizing.lambda_settings(profile(rss_bytes=200 * MIB, p95_latency_ms=5000.0))
+
+    # 1.5 x RSS rounded up to 64 MB; 4 x p95
+    assert settings == {'memory': 320, 'timeout': 20}
+
+
+def test_lambda_memory_buys_measured_cpu():
+    measured = profile(rss_bytes=200 * MIB, p95_latency_ms=1000.0, p50_latency_ms=200.0,
+                       rps_per_replica=10.0, cpu_cores=1.0)
+
+    settings = sizing.lambda_settings(measured, {'target_rps': 50})
+
+    # 0.1 CPU seconds over 0.2 s is half a vCPU; timeouts stay at least 10 s
+    assert settings['memory'] == 896
+    assert settings['timeout'] == 10
+    assert settings['reserved_concurrency'] == 60
+
+
+def test_lambda_limits():
+    settings = sizing.lambda_settings(profile(rss_bytes=20 * 1024 * MIB, p95_latency_ms=600000.0))
+
+    assert settings == {'memory': 10240, 'timeout': 900}
@@ -0,0 +1,51 @@
+import json
+import pickle
+
+from framework_abstractions.source import AgentSource, SourceFile
+
+
+def test_source_file_behaves_like_the_old_dict(tmp_path):
+    path = tmp_path / 'agent.py'
+    path.write_text('x = 1\n')
+    source_file = SourceFile('agent.py', path=str(path))
+
+    assert source_file['content'] == 'x = 1\n'
+    assert source_file.get('name') == 'agent.py'
+    assert source_file.get('missing', 'default') == 'default'
+    assert 'content' in source_file
+    assert dict(source_file) == {'name': 'agent.py', 'content': 'x = 1\n'}
+    assert source_file == {'name': 'agent.py', 'content': 'x = 1\n'}
+    assert json.loads(json.dumps(source_file.to_dict()))['content'] == 'x = 1\n'
+
+
+def test_source_file_reads_lazily(tmp_path):
+    path = tmp_path / 'agent.py'
+    path.write_text('old')
+    source_file = SourceFile('agent.py', path=str(path))
+
+    path.write_text('new')
+
+    assert source_file['content'] == 'new'
+
+
+def test_source_file_pickles(tmp_path):
+    source_file = SourceFile('agent.py', content='x = 1')
+
+    assert dict(pickle.loads(pickle.dumps(source_file))) == {'name': 'agent.py', 'content': 'x = 1'}
+
+
+def test_agent_source_digest_tracks_content():
+    first = AgentSource.from_string('x = 1')
+
+    assert first.digest() == AgentSource.from_string('x = 1').digest()
+    assert first.digest() != AgentSource.from_string('x = 2').digest()
+    assert first.read() == 'x = 1'
+
+
+def test_get_agent_from_repo_source_files_are_dict_compatible(agents_repo):
+    from framework_registry import FrameworkRegistry
+
+    agent_data = FrameworkRegistry.get_agent_from_repo('finance', 'fraud_detection')
+
+    assert [dict(f)['name'] for f in agent_data['source_files']] == ['agent.py']
+    assert agent_data['source_files'][0].get('content').startswith('from langchain')
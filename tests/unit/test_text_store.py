@@ -0,0 +1,135 @@
+import os
+import time
+
+import pytest
+
+from framework_abstractions import text_store
+from framework_abstractions.text_store import TextRef
+
+
+def large(tag):
+    return f"# {tag}\n" + 'x = 1\n' * text_store.INLINE_LIMIT
+
+
+def age(path, seconds):
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_intern_shares_equal_texts_without_pinning_them():
+    first = ''.join(['agent ', 'code'])
+    second = ''.join(['agent ', 'code'])
+    assert first is not second
+
+    assert text_store.intern(first) is text_store.intern(second)
+
+    for i in range(text_store._MEMO_SIZE):
+        text_store.intern(f"other {i}")
+    assert 'agent code' not in text_store._shared
+
+
+def test_share_and_resolve_round_trip(tmp_path):
+    text = large('round trip')
+
+    ref = text_store.share(text, str(tmp_path))
+
+    assert isinstance(ref, TextRef)
+    assert text_store.resolve(ref, str(tmp_path)) == text
+    assert text_store.share('small', str(tmp_path)) == 'small'
+
+
+def test_gc_removes_only_unused_texts(tmp_path):
+    old, fresh = TextRef('a' * 64), text_store.share(large('fresh'), str(tmp_path))
+    old_path = tmp_path / 'aa' / old.digest
+    old_path.parent.mkdir()
+    old_path.write_text('old')
+    age(old_path, text_store.MAX_AGE + 60)
+
+    result = text_store.gc(str(tmp_path))
+
+    assert result['removed'] == 1 and result['kept'] == 1
+    assert not old_path.exists()
+    with pytest.raises(OSError):
+        text_store.resolve(old, str(tmp_path))
+    assert text_store.resolve(fresh, str(tmp_path)) == large('fresh')
+
+
+def test_sharing_again_keeps_text_from_gc(tmp_path, monkeypatch):
+    text = large('reused')
+    ref = text_store.share(text, str(tmp_path))
+    path = tmp_path / ref.digest[:2] / ref.digest
+    age(path, text_store.MAX_AGE + 60)
+
+    # Another process (nothing remembered) shares the same text
+    monkeypatch.setattr(text_store, '_stored', {})
+    text_store.share(text, str(tmp_path))
+
+    assert text_store.gc(str(tmp_path))['removed'] == 0
+
+
+def test_share_runs_gc_at_most_every_interval(tmp_path):
+    stale = tmp_path / 'bb' / ('b' * 64)
+    stale.parent.mkdir()
+    stale.write_text('stale')
+    age(stale, text_store.MAX_AGE + 60)
+    (tmp_path / text_store.GC_STAMP).touch()
+
+    text_store.share(large('first'), str(tmp_path))
+    assert stale.exists()
+
+    age(tmp_path / text_store.GC_STAMP, text_store.GC_INTERVAL + 60)
+    text_store.share(large('second'), str(tmp_path))
+    assert not stale.exists()
+
+
+def test_resolve_rejects_text_not_matching_its_hash(tmp_path):
+    ref = text_store.share(large('genuine'), str(tmp_path))
+    path = tmp_path / ref.digest[:2] / ref.digest
+    path.write_text(large('planted'))
+    text_store._loaded.clear()
+
+    with pytest.raises(OSError, match='does not match'):
+        text_store.resolve(ref, str(tmp_path))
+
+
+def test_share_replaces_a_planted_text(tmp_path, monkeypatch):
+    text = large('genuine')
+    ref = text_store.share(text, str(tmp_path))
+    path = tmp_path / ref.digest[:2] / ref.digest
+    path.write_text(large('planted'))
+
+    monkeypatch.setattr(text_store, '_stored', {})
+    text_store.share(text, str(tmp_path))
+
+    assert path.read_text() == text
+
+
+def test_share_refuses_store_others_can_write(tmp_path):
+    tmp_path.chmod(0o777)
+    text = large('shared dir')
+
+    assert text_store.share(text, str(tmp_path)) == text
+
+
+def test_pickles_are_self_contained_outside_sharing(tmp_path, monkeypatch):
+    import pickle
+    from framework_abstractions.base import Agent, CompactAgent
+
+    monkeypatch.setattr(text_store, 'DEFAULT_TEXT_DIR', str(tmp_path / 'texts'))
+    agent = CompactAgent.from_agent(Agent(id='a', name='A', framework='langchain', source_code='x = 1\n',
+                                          compiled_code=large('compiled')))
+
+    data = pickle.dumps(agent)
+    assert not (tmp_path / 'texts').exists()
+    assert pickle.loads(data).compiled_code == large('compiled')
+
+    with text_store.sharing():
+        shared = pickle.dumps(agent)
+    assert len(shared) < len(data) // 10
+    assert pickle.loads(shared).compiled_code == large('compiled')
+
+
+def test_default_text_dir_is_per_user():
+    from framework_abstractions import user_dirs
+
+    assert text_store.DEFAULT_TEXT_DIR.startswith(user_dirs.CACHE_ROOT)
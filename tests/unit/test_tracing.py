@@ -0,0 +1,138 @@
+import asyncio
+import json
+
+import pytest
+
+from framework_abstractions import tracing
+
+
+@pytest.fixture
+def tracer():
+    tracer = tracing.RecordingTracer(service_name='test')
+    previous = tracing.set_tracer(tracer)
+    yield tracer
+    tracing.set_tracer(previous)
+
+
+def by_name(tracer):
+    return {span.name: span for span in tracer.finished()}
+
+
+def test_tracing_is_off_by_default():
+    assert not tracing.get_tracer().enabled
+    with tracing.span('stage') as span:
+        span.add('bytes_written', 10)
+        assert tracing.current_span() is tracing.NOOP_SPAN
+
+
+def test_spans_in_tasks_are_children_of_the_span_that_started_them(tracer):
+    async def stage(name):
+        with tracing.span(name):
+            await asyncio.sleep(0.01)
+            with tracing.span(f"{name}.inner"):
+                pass
+
+    async def build():
+        with tracing.span('build'):
+            await asyncio.gather(stage('a'), stage('b'))
+
+    asyncio.run(build())
+    spans = by_name(tracer)
+
+    assert spans['build'].parent_id is None
+    assert spans['a'].parent_id == spans['build'].span_id
+    assert spans['b'].parent_id == spans['build'].span_id
+    assert spans['a.inner'].parent_id == spans['a'].span_id
+    assert spans['b.inner'].parent_id == spans['b'].span_id
+    assert {span.trace_id for span in spans.values()} == {spans['build'].trace_id}
+    assert tracing.current_span() is tracing.NOOP_SPAN
+
+
+def test_separate_roots_start_separate_traces(tracer):
+    with tracing.span('first'):
+        pass
+    with tracing.span('second'):
+        pass
+
+    spans = by_name(tracer)
+    assert spans['first'].trace_id != spans['second'].trace_id
+
+
+def test_exception_marks_span_as_error(tracer):
+    with pytest.raises(RuntimeError):
+        with tracing.span('build'):
+            with tracing.span('resolve'):
+                raise RuntimeError('no wheel')
+
+    spans = by_name(tracer)
+    assert spans['resolve'].status == 'error'
+    assert spans['resolve'].error == 'RuntimeError: no wheel'
+    assert spans['build'].status == 'error'
+    assert tracer.summary()['resolve']['errors'] == 1
+
+
+def test_summary_sums_counters_per_stage(tracer):
+    for size in (100, 250):
+        with tracing.span('write', files_written=1) as span:
+            span.add('bytes_written', size)
+    with tracing.span('read'):
+        tracing.current_span().add('bytes_read', 7)
+        tracing.current_span().set_attribute('path', 'agent.yaml')
+
+    summary = tracer.summary()
+
+    assert summary['write']['count'] == 2
+    assert summary['write']['bytes_written'] == 350
+    assert summary['write']['files_written'] == 2
+    assert summary['write']['errors'] == 0
+    assert summary['write']['max_ms'] <= summary['write']['total_ms']
+    assert summary['read']['bytes_read'] == 7
+    assert 'path' not in summary['read']
+
+
+def test_otlp_export(tracer, tmp_path):
+    with tracing.span('build', agent='finance/fraud_detection', cached=False, files=3, ratio=0.5):
+        with pytest.raises(ValueError):
+            with tracing.span('resolve'):
+                raise ValueError('bad pin')
+
+    path = tmp_path / 'trace.json'
+    tracer.export(str(path), format='otlp')
+    exported = json.loads(path.read_text())
+
+    resource_spans = exported['resourceSpans'][0]
+    assert resource_spans['resource']['attributes'] == [{'key': 'service.name', 'value': {'stringValue': 'test'}}]
+    scope_spans = resource_spans['scopeSpans'][0]
+    assert scope_spans['scope'] == {'name': 'agentforge.build'}
+    spans = {span['name']: span for span in scope_spans['spans']}
+
+    build, resolve = spans['build'], spans['resolve']
+    assert len(build['traceId']) == 32 and len(build['spanId']) == 16
+    assert 'parentSpanId' not in build
+    assert resolve['parentSpanId'] == build['spanId']
+    assert resolve['traceId'] == build['traceId']
+    assert build['kind'] == 1
+    assert int(build['endTimeUnixNano']) >= int(build['startTimeUnixNano'])
+    assert build['status'] == {'code': 1}
+    assert resolve['status'] == {'code': 2, 'message': 'ValueError: bad pin'}
+    assert build['attributes'] == [
+        {'key': 'agent', 'value': {'stringValue': 'finance/fraud_detection'}},
+        {'key': 'cached', 'value': {'boolValue': False}},
+        {'key': 'files', 'value': {'intValue': '3'}},
+        {'key': 'ratio', 'value': {'doubleValue': 0.5}}
+    ]
+
+
+def test_json_export_and_unknown_format(tracer, tmp_path):
+    with tracing.span('build'):
+        pass
+
+    path = tmp_path / 'trace.json'
+    tracer.export(str(path))
+    exported = json.loads(path.read_text())
+
+    assert exported['service'] == 'test'
+    assert exported['spans'][0]['name'] == 'build'
+    assert exported['spans'][0]['status'] == 'ok'
+    with pytest.raises(ValueError):
+        tracer.export(str(path), format='zipkin')
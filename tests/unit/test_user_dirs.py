@@ -0,0 +1,69 @@
+import os
+import stat
+
+import pytest
+
+from framework_abstractions import user_dirs
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_cache_root_is_per_user(monkeypatch, tmp_path):
+    monkeypatch.delenv('AGENTFORGE_CACHE_DIR', raising=False)
+
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert user_dirs.cache_root() == str(tmp_path / 'agentforge')
+
+    monkeypatch.delenv('XDG_CACHE_HOME')
+    monkeypatch.setenv('HOME', '/')
+    assert user_dirs.cache_root().endswith(f"agentforge-cache-{os.getuid()}")
+
+    monkeypatch.setenv('AGENTFORGE_CACHE_DIR', '/srv/cache')
+    assert user_dirs.cache_root() == '/srv/cache'
+
+
+def test_private_dir_is_created_0700(tmp_path):
+    path = tmp_path / 'cache' / 'builds'
+
+    user_dirs.private_dir(str(path))
+
+    assert mode(path) == 0o700
+
+
+@pytest.mark.parametrize('permissions', [0o777, 0o1777, 0o720])
+def test_private_dir_rejects_directories_others_can_write(tmp_path, permissions):
+    path = tmp_path / 'shared'
+    path.mkdir()
+    path.chmod(permissions)
+
+    with pytest.raises(PermissionError, match='writable by other users'):
+        user_dirs.private_dir(str(path))
+
+
+def test_private_dir_rejects_directories_of_other_users(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, 'getuid', lambda: os.stat(tmp_path).st_uid + 1)
+
+    with pytest.raises(PermissionError, match='belongs to uid'):
+        user_dirs.private_dir(str(tmp_path))
+
+
+def test_private_dir_rejects_parent_others_can_replace(tmp_path):
+    parent = tmp_path / 'shared'
+    parent.mkdir()
+    parent.chmod(0o777)
+
+    with pytest.raises(PermissionError, match='writable by other users'):
+        user_dirs.private_dir(str(parent / 'cache'))
+
+    parent.chmod(0o1777)
+    user_dirs.private_dir(str(parent / 'cache'))
+
+
+def test_private_dir_rejects_symlinks(tmp_path):
+    (tmp_path / 'target').mkdir(mode=0o700)
+    (tmp_path / 'link').symlink_to(tmp_path / 'target')
+
+    with pytest.raises(PermissionError, match='not a directory'):
+        user_dirs.private_dir(str(tmp_path / 'link'))